@@ -0,0 +1,75 @@
+"""Compare lowercasing every clipboard entry per query with the trigram index
+
+Builds a temporary journal with 100k synthetic entries (commands, URLs,
+code and prose), then times typing a few queries one keystroke at a time.
+Run from the repository root:
+    python benchmarks/bench_clipboard_search.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.clipboard_journal import ClipboardJournal
+from core.clipboard_search import TrigramIndex, rank_entries
+
+ENTRIES = 100_000
+QUERIES = ('git checkout', 'https://github.com/nerd', 'def parse_', 'xqzv', 'gco')
+WORDS = ('build', 'release', 'config', 'server', 'deploy', 'cache', 'token', 'widget',
+         'parser', 'stream', 'window', 'branch', 'commit', 'feature', 'python', 'docker')
+
+def make_entry(rng, i):
+    """Get one synthetic clipboard entry"""
+    kind = i % 4
+    words = rng.sample(WORDS, 4)
+    if kind == 0:
+        return f"git {rng.choice(('checkout', 'commit -m', 'push origin', 'rebase'))} {words[0]}-{i}"
+    if kind == 1:
+        return f"https://github.com/{words[0]}/{words[1]}/issues/{i}"
+    if kind == 2:
+        return f"def {words[0]}_{words[1]}(self, {words[2]}):\n    return self.{words[3]}[{i}]"
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 30))).capitalize() + '.'
+
+def naive_search(journal, query):
+    """The old search: lowercase every entry for every query"""
+    query = query.lower()
+    return [entry_id for entry_id in reversed(journal.ids())
+            if query in journal.read(entry_id).lower()]
+
+def main():
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as directory:
+        journal = ClipboardJournal(os.path.join(directory, 'clipboard.journal'))
+        for i in range(ENTRIES):
+            journal.append(make_entry(rng, i).encode('utf-8'))
+
+        start = time.perf_counter()
+        index = TrigramIndex()
+        for entry_id in journal.ids():
+            index.add(entry_id, journal.read(entry_id))
+        print(f"index build: {(time.perf_counter() - start) * 1000:.0f} ms for {ENTRIES} entries")
+
+        ids_newest_first = lambda: reversed(journal.ids())
+        read = lambda entry_id: journal.read(entry_id)
+        print(f"{'query':<26} {'naive ms':>9} {'final ms':>9} {'worst key ms':>13} {'results':>8}")
+        for query in QUERIES:
+            start = time.perf_counter()
+            naive_search(journal, query)
+            naive = (time.perf_counter() - start) * 1000
+
+            # Every prefix, as if typed one keystroke at a time
+            worst = final = 0.0
+            for end in range(1, len(query) + 1):
+                start = time.perf_counter()
+                results = rank_entries(query[:end], index, ids_newest_first, read)
+                elapsed = (time.perf_counter() - start) * 1000
+                worst = max(worst, elapsed)
+                final = elapsed
+            print(f"{query:<26} {naive:>9.1f} {final:>9.1f} {worst:>13.1f} {len(results):>8}")
+        journal.close()
+
+if __name__ == '__main__':
+    main()
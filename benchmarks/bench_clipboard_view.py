@@ -0,0 +1,113 @@
+"""Compare the QListWidget clipboard list with the model-backed QListView
+
+Loads a temporary history of 100k synthetic entries, then times filling
+the list, adding one copy at the top, jumping the scroll bar across it
+and filtering it for a few queries, processing events after each step
+so layout and paint are counted. Run from the repository root (no
+display needed):
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_clipboard_view.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QListWidget, QListWidgetItem, QListView
+from core.clipboard_journal import content_digest
+from core.clipboard_manager import ClipboardManager
+from ui.clipboard_history_model import ClipboardHistoryModel
+from ui.widgets.clipboard_widget import LAYOUT_BATCH_SIZE
+from bench_clipboard_search import make_entry
+
+ENTRIES = 100_000
+QUERIES = ('git checkout', 'https://github.com/nerd', 'xqzv')
+SCROLL_STEPS = 20
+
+def timed(app, step):
+    """Run `step` and the event processing it causes, in milliseconds"""
+    start = time.perf_counter()
+    step()
+    app.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+def scroll(app, view):
+    """Get the worst time for a scroll bar jump across the list"""
+    bar = view.verticalScrollBar()
+    worst = 0.0
+    for step in range(SCROLL_STEPS):
+        value = bar.maximum() * step // (SCROLL_STEPS - 1)
+        worst = max(worst, timed(app, lambda: (bar.setValue(value), view.viewport().repaint())))
+    return worst
+
+def bench_list_widget(app, manager):
+    """The previous list: one QListWidgetItem per entry, filtered with setHidden"""
+    view = QListWidget()
+    view.resize(300, 400)
+    view.show()
+
+    def load():
+        for text in manager.get_history():
+            display_text = text[:100] + "..." if len(text) > 100 else text
+            item = QListWidgetItem(display_text.replace("\n", " "))
+            item.setData(Qt.UserRole, text)
+            view.insertItem(0, item)
+
+    def filter_for(query):
+        for i in range(view.count()):
+            item = view.item(i)
+            item.setHidden(query.lower() not in item.data(Qt.UserRole).lower())
+
+    def insert():
+        item = QListWidgetItem("new copy")
+        item.setData(Qt.UserRole, "new copy")
+        view.insertItem(0, item)
+
+    results = {'load': timed(app, load), 'insert': timed(app, insert), 'scroll': scroll(app, view)}
+    results['filter'] = max(timed(app, lambda: filter_for(query)) for query in QUERIES)
+    view.close()
+    return results
+
+def bench_list_view(app, manager):
+    """The model-backed view, filtered with the search index's results"""
+    view = QListView()
+    view.setUniformItemSizes(True)
+    view.setLayoutMode(QListView.Batched)
+    view.setBatchSize(LAYOUT_BATCH_SIZE)
+    view.resize(300, 400)
+    view.show()
+    model = ClipboardHistoryModel(manager)
+    results = {'load': timed(app, lambda: view.setModel(model)),
+               # Recorded in place, as the record thread would, to time the model's share
+               'insert': timed(app, lambda: manager._record("new copy")),
+               'scroll': scroll(app, view)}
+    manager._search('warm up the index')
+    results['filter'] = max(timed(app, lambda: model.set_filter(manager._search(query)))
+                            for query in QUERIES)
+    view.close()
+    return results
+
+def main():
+    app = QApplication(sys.argv)
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as directory:
+        manager = ClipboardManager(max_history=ENTRIES,
+                                   journal_path=os.path.join(directory, 'clipboard.journal'))
+        for i in range(ENTRIES):
+            payload = make_entry(rng, i).encode('utf-8')
+            manager.history.add(payload, content_digest(payload))
+
+        print(f"{'list':<12} {'load ms':>9} {'insert ms':>10} {'worst scroll ms':>16} {'worst filter ms':>16}")
+        for name, bench in (('QListWidget', bench_list_widget), ('QListView', bench_list_view)):
+            results = bench(app, manager)
+            print(f"{name:<12} {results['load']:>9.1f} {results['insert']:>10.1f} "
+                  f"{results['scroll']:>16.1f} {results['filter']:>16.1f}")
+        # Searching started the background index build; let it finish before closing
+        manager.index_thread.join()
+        manager.history.close()
+
+if __name__ == '__main__':
+    main()
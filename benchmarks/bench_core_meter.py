@@ -0,0 +1,117 @@
+"""Compare per-core QProgressBar rows with the painted CoreMeterWidget
+
+Each frame pushes new per-core values and then processes events until the
+layout and paint work is done, like one stats tick in the CPU tab. The
+core meter reads its sparklines from a MetricHistory, which is recorded
+before each frame as SystemStats does off the GUI thread. Half of
+the simulated cores stay idle, as on a typical desktop. Run from the
+repository root (no display needed):
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_core_meter.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
+                             QLabel, QProgressBar, QScrollArea, QFrame)
+from core.metric_history import MetricHistory
+from core.stats_snapshot import CpuStats, StatsSnapshot
+from ui.widgets.core_meter_widget import CoreMeterWidget
+
+CORE_COUNTS = (8, 64, 256)
+FRAMES = 60
+# Untimed frames first, so idle cores have flat sparklines as in steady state
+WARMUP = 60
+STYLE = """
+    QWidget { background: #1e1e1e; color: #dddddd; font-size: 12px; }
+    QProgressBar { border: 1px solid #555555; border-radius: 2px; background: #1e1e1e; }
+    QProgressBar::chunk { background: #00aaff; }
+"""
+
+def build_progress_bars(cores):
+    """Build the previous CPU tab: a label, bar and layout per core"""
+    tab = QWidget()
+    layout = QVBoxLayout(tab)
+    layout.setContentsMargins(10, 10, 10, 10)
+    layout.setSpacing(5)
+    bars = []
+    for i in range(cores + 1):
+        row = QHBoxLayout()
+        label = QLabel(f"Core {i}" if i < cores else "Total")
+        label.setFixedWidth(50)
+        bar = QProgressBar()
+        bar.setFixedHeight(8)
+        bar.setTextVisible(False)
+        row.addWidget(label)
+        row.addWidget(bar)
+        layout.addLayout(row)
+        bars.append(bar)
+
+    def push(values, total):
+        for bar, value in zip(bars, values):
+            bar.setValue(int(value))
+        bars[-1].setValue(int(total))
+    return tab, push, None
+
+def build_core_meter(cores):
+    """Build the current CPU tab: one painted meter in a scroll area"""
+    tab = QWidget()
+    layout = QVBoxLayout(tab)
+    layout.setContentsMargins(10, 10, 10, 10)
+    history = MetricHistory()
+    meter = CoreMeterWidget(cores, history)
+    meter.set_colors('#1e1e1e', '#dddddd', '#00aaff', '#555555')
+    scroll_area = QScrollArea()
+    scroll_area.setFrameShape(QFrame.NoFrame)
+    scroll_area.setWidgetResizable(True)
+    scroll_area.setWidget(meter)
+    layout.addWidget(scroll_area)
+    ticks = [0]
+
+    def record(values, total):
+        # Seconds apart, as SystemStats samples, so each tick adds a sparkline point
+        ticks[0] += 1
+        history.record(StatsSnapshot(float(ticks[0]), CpuStats(values, total), None))
+    return tab, meter.set_values, record
+
+def frame_times(app, build, cores):
+    """Get per-frame times in milliseconds for one widget tree"""
+    tab, push, record = build(cores)
+    tab.setStyleSheet(STYLE)
+    tab.resize(400, 500)
+    tab.show()
+    app.processEvents()
+
+    rng = random.Random(cores)
+    times = []
+    for frame in range(WARMUP + FRAMES):
+        values = [rng.uniform(0, 100) if i % 2 else 1.0 for i in range(cores)]
+        if record:
+            # Happens on the sampling thread in the app, so it is not timed
+            record(values, sum(values) / cores)
+        start = time.perf_counter()
+        push(values, sum(values) / cores)
+        app.processEvents()
+        if frame >= WARMUP:
+            times.append((time.perf_counter() - start) * 1000)
+    tab.close()
+    tab.deleteLater()
+    app.processEvents()
+    return sorted(times)
+
+def main():
+    app = QApplication(sys.argv)
+    print(f"{'cores':>6} {'widget':<14} {'median ms':>10} {'p95 ms':>8}")
+    for cores in CORE_COUNTS:
+        for name, build in (('progress bars', build_progress_bars),
+                            ('core meter', build_core_meter)):
+            times = frame_times(app, build, cores)
+            median = times[len(times) // 2]
+            p95 = times[int(len(times) * 0.95)]
+            print(f"{cores:>6} {name:<14} {median:>10.3f} {p95:>8.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""Measure what GitHub polling costs against the rate limit
+
+Serves a fake GitHub API from a local HTTP server: a user profile, their
+events, open issues and a PR search spread over several pages, each with
+an ETag, honouring If-None-Match and counting rate-limited requests the
+way GitHub does (a 304 is free). Then polls it as GitHubManager does:
+once with an empty cache, several times with nothing changed, once after
+a PR changes, and once more from a new client that loads the saved
+cache, as after a restart. Also shows how the poll interval stretches as
+the remaining rate limit runs down. Run from the repository root (no
+display or network needed):
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_github_polling.py [polls]
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from PyQt5.QtCore import QCoreApplication
+from core.github_client import GitHubClient
+from core.github_manager import GitHubManager
+
+POLLS = 10
+LOGIN = 'octocat'
+PR_COUNT = 250
+PER_PAGE = 100
+RATE_LIMIT = 5000
+
+class FakeGitHub:
+    """The data served and the rate-limit accounting"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.prs = [{
+            'number': n, 'title': f"Change {n}", 'state': 'open',
+            'pull_request': {'url': f"https://api.github.com/repos/{LOGIN}/project-{n % 7}/pulls/{n}"},
+            'repository_url': f"https://api.github.com/repos/{LOGIN}/project-{n % 7}",
+            'created_at': '2024-01-01T00:00:00Z', 'updated_at': '2024-01-02T00:00:00Z',
+        } for n in range(1, PR_COUNT + 1)]
+        self.charged = {'core': 0, 'search': 0}
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self.reset = int(time.time()) + 3600
+
+    def resource(self, path, query):
+        """Get the JSON body for a path, or None"""
+        if path == f'/users/{LOGIN}':
+            return {'login': LOGIN, 'public_repos': 42}
+        if path == f'/users/{LOGIN}/events':
+            return [{'type': 'PushEvent', 'repo': {'name': f'{LOGIN}/project-1'},
+                     'created_at': '2024-01-01T00:00:00Z', 'payload': {}}]
+        if path == '/issues':
+            return [{'number': 1, 'title': 'Bug', 'repository': {'name': 'project-1'},
+                     'created_at': '2024-01-01T00:00:00Z', 'labels': [{'name': 'bug'}],
+                     'comments': 3}]
+        if path == '/search/issues':
+            page = int(query.get('page', ['1'])[0])
+            return {'total_count': len(self.prs),
+                    'items': self.prs[(page - 1) * PER_PAGE:page * PER_PAGE]}
+        return None
+
+def make_handler(github):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            resource = 'search' if url.path.startswith('/search/') else 'core'
+            with github.lock:
+                body = github.resource(url.path, query)
+                if body is None:
+                    self.send_error(404)
+                    return
+                data = json.dumps(body).encode('utf-8')
+                etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+                fresh = self.headers.get('If-None-Match') != etag
+                if fresh:
+                    github.charged[resource] += 1
+                    github.bytes_sent += len(data)
+                else:
+                    github.not_modified += 1
+                remaining = RATE_LIMIT - github.charged[resource]
+            self.send_response(200 if fresh else 304)
+            self.send_header('ETag', etag)
+            self.send_header('X-RateLimit-Limit', str(RATE_LIMIT))
+            self.send_header('X-RateLimit-Remaining', str(remaining))
+            self.send_header('X-RateLimit-Reset', str(github.reset))
+            self.send_header('X-RateLimit-Resource', resource)
+            page = int(query.get('page', ['1'])[0])
+            if url.path == '/search/issues' and page * PER_PAGE < len(github.prs):
+                next_query = dict((key, values[0]) for key, values in query.items())
+                next_query['page'] = page + 1
+                next_url = f"http://{self.headers['Host']}{url.path}?{urlencode(next_query)}"
+                self.send_header('Link', f'<{next_url}>; rel="next"')
+            if fresh:
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            if fresh:
+                self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+class Settings:
+    def __init__(self):
+        self.values = {'github_token': 'placeholder-token', 'github_username': LOGIN}
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+def make_manager(api_url, cache_path):
+    """Get a GitHubManager talking to the fake API, as a watched widget would see it"""
+    manager = GitHubManager(Settings())
+    manager.client = GitHubClient('placeholder-token', cache_path=cache_path, api_url=api_url)
+    manager.user = manager._get_user(LOGIN)
+    results = {}
+    manager.prs_updated.connect(lambda prs: results.__setitem__('prs', prs))
+    manager.repos_updated.connect(lambda count: results.__setitem__('repos', count))
+    manager.activity_updated.connect(lambda events: results.__setitem__('activity', events))
+    manager.issues_updated.connect(lambda issues: results.__setitem__('issues', issues))
+    manager.watchers.set_watched('bench', True)
+    return manager, results
+
+def poll(manager, github):
+    """Run one refresh; get the requests charged, 304s and milliseconds it took"""
+    charged = sum(github.charged.values())
+    not_modified = github.not_modified
+    manager.last_update = None
+    start = time.perf_counter()
+    manager._refresh()
+    elapsed = (time.perf_counter() - start) * 1000
+    return sum(github.charged.values()) - charged, github.not_modified - not_modified, elapsed
+
+def main():
+    polls = int(sys.argv[1]) if len(sys.argv) > 1 else POLLS
+    app = QCoreApplication(sys.argv)
+    github = FakeGitHub()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(github))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with tempfile.TemporaryDirectory() as home:
+            cache_path = os.path.join(home, 'github_cache.json')
+            manager, results = make_manager(api_url, cache_path)
+
+            charged, not_modified, elapsed = poll(manager, github)
+            assert len(results['prs']) == PR_COUNT and results['repos'] == 42
+            print(f"first poll:      {charged:>3} charged, {not_modified:>3} not modified, {elapsed:6.1f} ms")
+
+            unchanged = [poll(manager, github) for _ in range(polls)]
+            assert len(results['prs']) == PR_COUNT
+            print(f"unchanged polls: {sum(r[0] for r in unchanged) / polls:>5.1f} charged, "
+                  f"{sum(r[1] for r in unchanged) / polls:>5.1f} not modified, "
+                  f"{sum(r[2] for r in unchanged) / polls:6.1f} ms on average over {polls}")
+
+            with github.lock:
+                github.prs[150]['title'] = 'Renamed'
+            charged, not_modified, elapsed = poll(manager, github)
+            assert results['prs'][150]['title'] == 'Renamed'
+            print(f"one PR changed:  {charged:>3} charged, {not_modified:>3} not modified, {elapsed:6.1f} ms")
+
+            restarted, results = make_manager(api_url, cache_path)
+            charged, not_modified, elapsed = poll(restarted, github)
+            assert results['prs'][150]['title'] == 'Renamed'
+            print(f"after restart:   {charged:>3} charged, {not_modified:>3} not modified, {elapsed:6.1f} ms")
+            print(f"bytes of JSON served: {github.bytes_sent}")
+
+            print("\nnext poll in, for a 300 s interval with the window resetting in an hour:")
+            client = manager.client
+            client.poll_charged = {'core': 3}
+            for remaining in (5000, 100, 80, 60, 52):
+                client.rate_limits = {'core': (remaining, RATE_LIMIT, time.time() + 3600)}
+                print(f"  {remaining:>5} requests left: {client.next_delay(300):6.0f} s")
+    finally:
+        server.shutdown()
+        app.quit()
+
+if __name__ == '__main__':
+    main()
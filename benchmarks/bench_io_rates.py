@@ -0,0 +1,70 @@
+"""Measure per-tick cost of the disk and network rate collectors
+
+Uses synthetic counters for a machine with many disks and interfaces, plus
+the real psutil counters when psutil is installed. Run from the repository
+root:
+    python benchmarks/bench_io_rates.py
+"""
+import os
+import sys
+import time
+from collections import namedtuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.io_rates import DiskIoCollector, NetIoCollector, DEFER_AFTER
+
+TICKS = 2000
+DEVICES = 128
+
+DiskCounters = namedtuple('DiskCounters', 'read_bytes write_bytes read_count write_count')
+NetCounters = namedtuple('NetCounters', 'bytes_recv bytes_sent')
+
+class SyntheticCounters:
+    """Counters that grow every call and occasionally wrap at 32 bits"""
+
+    def __init__(self):
+        self.tick = 0
+
+    def disks(self):
+        self.tick += 1
+        base = (self.tick * 4096) % (2 ** 32)
+        return {f'sd{i}': DiskCounters(base + i, base + 2 * i, self.tick, self.tick)
+                for i in range(DEVICES)}
+
+    def nics(self):
+        self.tick += 1
+        base = (self.tick * 1500) % (2 ** 32)
+        return {f'eth{i}': NetCounters(base + i, base + 2 * i) for i in range(DEVICES)}
+
+def measure(collector):
+    """Return (mean, worst) seconds per sample"""
+    collector.sample(0.0)
+    worst = 0.0
+    start = time.perf_counter()
+    for tick in range(1, TICKS + 1):
+        before = time.perf_counter()
+        collector.sample(float(tick))
+        worst = max(worst, time.perf_counter() - before)
+    return (time.perf_counter() - start) / TICKS, worst
+
+def report(name, collector):
+    mean, worst = measure(collector)
+    status = 'ok' if worst < DEFER_AFTER else 'SLOWER THAN THE TICK CUTOFF'
+    print(f"{name:>16}: mean {mean * 1e6:8.1f} us  worst {worst * 1e6:8.1f} us  "
+          f"(cutoff {DEFER_AFTER * 1e6:.0f} us, {status})")
+
+def main():
+    synthetic = SyntheticCounters()
+    report(f'disk x{DEVICES}', DiskIoCollector(synthetic.disks))
+    report(f'net x{DEVICES}', NetIoCollector(synthetic.nics))
+    try:
+        import psutil  # noqa: F401
+    except ImportError:
+        print("psutil not installed, skipping real counters")
+        return
+    report('disk (psutil)', DiskIoCollector())
+    report('net (psutil)', NetIoCollector())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Compare a naive full process scan with the incremental ProcessCollector
+
+Uses synthetic processes whose reads cost a fixed amount of work, so the
+result does not depend on how many processes the benchmark machine runs.
+Reports the mean and worst tick (the first one includes the initial scan)
+and how many ticks a process can go without being refreshed. On Linux it
+also times the psutil and /proc readers against the machine's real
+processes. Run from the repository root:
+    python benchmarks/bench_process_table.py
+"""
+import heapq
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.process_table import ProcessCollector
+
+PROCESSES = 5000
+TICKS = 20
+READ_COST = 200  # loop iterations standing in for a /proc read
+
+class MemoryInfo:
+    __slots__ = ('rss',)
+
+    def __init__(self, rss):
+        self.rss = rss
+
+class FakeProcess:
+    """Stand-in for psutil.Process with a fixed cost per /proc read"""
+    created = 0
+
+    def __init__(self, pid):
+        FakeProcess.created += 1
+        self.pid = pid
+        self.reads = 0
+        self._work()
+
+    def _work(self):
+        for _ in range(READ_COST):
+            pass
+
+    @contextmanager
+    def oneshot(self):
+        self._work()
+        self.reads += 1
+        yield
+
+    def name(self):
+        return f'proc-{self.pid}'
+
+    def cpu_percent(self, interval=None):
+        return float(self.pid % 100)
+
+    def memory_info(self):
+        return MemoryInfo(self.pid * 4096)
+
+def list_pids():
+    return range(1, PROCESSES + 1)
+
+def naive_tick():
+    """What a process_iter() per tick does: new objects, every process read"""
+    rows = []
+    for pid in list_pids():
+        process = FakeProcess(pid)
+        with process.oneshot():
+            rows.append((process.cpu_percent(None), process.memory_info().rss, process.name()))
+    heapq.nlargest(5, rows, key=lambda row: row[0])
+    heapq.nlargest(5, rows, key=lambda row: row[1])
+
+def measure(tick):
+    """Get (mean, worst) seconds per tick and the Process objects created"""
+    FakeProcess.created = 0
+    worst = 0.0
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        before = time.perf_counter()
+        tick()
+        worst = max(worst, time.perf_counter() - before)
+    return (time.perf_counter() - start) / TICKS, worst, FakeProcess.created
+
+def max_refresh_gap(collector):
+    """Get the most ticks any tracked process went between two refreshes, once all are tracked"""
+    last_reads = {}
+    gaps = {}
+    for tick in range(TICKS):
+        collector.sample()
+        for pid, process in collector.processes.items():
+            if process.reads != last_reads.get(pid, (None, tick))[0]:
+                if pid in last_reads:
+                    gaps[pid] = max(gaps.get(pid, 0), tick - last_reads[pid][1])
+                last_reads[pid] = (process.reads, tick)
+    return max(gaps.values()) if gaps else None
+
+def real_readers():
+    """Time a full pass of each real reader over this machine's processes"""
+    from core.process_table import ProcessCollector as Collector
+    for backend in ('psutil', 'procfs'):
+        try:
+            collector = Collector(backend=backend, batch_size=10 ** 6)
+        except Exception as e:
+            print(f"{backend:>12}: unavailable ({e})")
+            continue
+        collector.sample()
+        start = time.perf_counter()
+        collector.sample()
+        elapsed = time.perf_counter() - start
+        count = len(collector.processes)
+        print(f"{backend:>12}: {elapsed / max(count, 1) * 1e6:7.1f} us/process "
+              f"({count} real processes)")
+
+def main():
+    make = lambda: ProcessCollector(list_pids=list_pids, make_process=FakeProcess,
+                                    errors=(LookupError,), batch_size=512)
+    collector = make()
+    for name, tick in (('naive', naive_tick), ('incremental', collector.sample)):
+        mean, worst, created = measure(tick)
+        print(f"{name:>12}: mean {mean * 1e3:7.2f} ms/tick  worst {worst * 1e3:7.2f} ms  "
+              f"{created:6d} Process objects over {TICKS} ticks ({PROCESSES} processes)")
+    print(f"most ticks between refreshes of one process: {max_refresh_gap(make())}")
+    if sys.platform.startswith('linux'):
+        real_readers()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Measure startup time: process start to the first HUD widget painted
+
+Starts `src/main.py` in a fresh interpreter with an empty home directory
+(default settings, no GitHub token) and times from launching the process
+to the first paint of a widget other than the main window. Repeats a few
+times and prints the median. With --github the settings carry a
+placeholder GitHub token, so the time includes whatever connecting to
+GitHub costs before the first paint. Run from the repository root (no
+display needed):
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py [runs] [--github]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+RUNS = 5
+TIMEOUT = 60
+
+# Runs in the child: start NerdHUD as main.py does and report the first widget paint
+PROBE = """
+import os, sys
+sys.path.insert(0, {src!r})
+from PyQt5.QtCore import QObject, QEvent
+from main import NerdHUD
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if (event.type() == QEvent.Paint and obj.isWidgetType() and obj.isWindow()
+                and obj is not nerdhud.main_window):
+            print('painted', type(obj).__name__, flush=True)
+            os._exit(0)
+        return False
+
+nerdhud = NerdHUD()
+first_paint = FirstPaint()
+nerdhud.app.installEventFilter(first_paint)
+nerdhud.run()
+"""
+
+def write_github_settings(home):
+    """Save settings that make the app connect to GitHub at startup"""
+    os.makedirs(os.path.join(home, '.nerdhud'))
+    with open(os.path.join(home, '.nerdhud', 'settings.json'), 'w') as f:
+        json.dump({'github_token': 'placeholder-token', 'github_username': 'octocat'}, f)
+
+def measure(home):
+    """Start the app once and get the milliseconds to its first widget paint"""
+    env = dict(os.environ, HOME=home, USERPROFILE=home)
+    start = time.perf_counter()
+    child = subprocess.Popen([sys.executable, '-c', PROBE.format(src=SRC)], cwd=SRC, env=env,
+                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        for line in child.stdout:
+            if line.startswith('painted'):
+                return (time.perf_counter() - start) * 1000, line.split()[1]
+        raise RuntimeError("the app exited without painting a widget")
+    finally:
+        child.kill()
+        child.wait(TIMEOUT)
+
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != '--github']
+    github = len(args) < len(sys.argv) - 1
+    runs = int(args[0]) if args else RUNS
+    times = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as home:
+            if github:
+                write_github_settings(home)
+            elapsed, widget = measure(home)
+        times.append(elapsed)
+    print(f"first widget: {widget}")
+    print(f"process start to first paint over {runs} runs: "
+          f"median {statistics.median(times):.0f} ms, best {min(times):.0f} ms, worst {max(times):.0f} ms")
+
+if __name__ == '__main__':
+    main()
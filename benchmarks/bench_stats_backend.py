@@ -0,0 +1,45 @@
+"""Compare per-tick cost of the procfs and psutil stats backends
+
+Run from the repository root on Linux:
+    python benchmarks/bench_stats_backend.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.stats_backend import ProcfsBackend, PsutilBackend
+
+TICKS = 5000
+
+def measure(backend):
+    """Return microseconds per tick (one cpu_stats() and one memory_stats())"""
+    backend.cpu_stats()
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        backend.cpu_stats()
+        backend.memory_stats()
+    return (time.perf_counter() - start) / TICKS * 1e6
+
+def main():
+    backends = []
+    if sys.platform.startswith('linux'):
+        backends.append(ProcfsBackend)
+    else:
+        print("procfs backend needs Linux, skipping")
+    try:
+        import psutil  # noqa: F401
+        backends.append(PsutilBackend)
+    except ImportError:
+        print("psutil not installed, skipping")
+
+    for backend_class in backends:
+        backend = backend_class()
+        try:
+            print(f"{backend.name:>8}: {measure(backend):7.1f} us/tick")
+        finally:
+            backend.close()
+
+if __name__ == '__main__':
+    main()
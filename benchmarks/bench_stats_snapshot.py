@@ -0,0 +1,66 @@
+"""Compare per-tick allocations of the legacy stats dict and StatsSnapshot
+
+Run from the repository root:
+    python benchmarks/bench_stats_snapshot.py
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.stats_snapshot import StatsSnapshot, CpuStats, MemoryStats, GpuStats
+
+TICKS = 10000
+CORES = 16
+PERCENTS = [12.5] * CORES
+
+def build_dict():
+    """Build one tick the way SystemStats did before snapshots"""
+    return {
+        'cpu': {
+            'percent_per_core': PERCENTS,
+            'total_percent': sum(PERCENTS) / len(PERCENTS),
+            'frequency': {'current': 3600.0, 'min': 800.0, 'max': 4800.0},
+            'cores': CORES
+        },
+        'memory': {
+            'total': 32 << 30, 'available': 16 << 30, 'used': 16 << 30, 'percent': 50.0,
+            'swap': {'total': 8 << 30, 'used': 1 << 30, 'free': 7 << 30, 'percent': 12.5}
+        },
+        'gpu': [{
+            'id': 0, 'name': 'GPU', 'load': 40.0,
+            'memory': {'total': 8192.0, 'used': 2048.0, 'free': 6144.0},
+            'temperature': 60.0
+        }]
+    }
+
+def build_snapshot():
+    """Build one tick as a StatsSnapshot"""
+    return StatsSnapshot(
+        0.0,
+        CpuStats(PERCENTS, sum(PERCENTS) / len(PERCENTS), 3600.0, 800.0, 4800.0, CORES),
+        MemoryStats(32 << 30, 16 << 30, 16 << 30, 50.0, 8 << 30, 1 << 30, 7 << 30, 12.5),
+        [GpuStats(0, 'GPU', 40.0, 8192.0, 2048.0, 6144.0, 60.0)]
+    )
+
+def measure(builder):
+    """Return (bytes allocated per tick, microseconds per tick)"""
+    kept = []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(TICKS):
+        kept.append(builder())
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    seconds = timeit.timeit(builder, number=TICKS)
+    return (after - before) / TICKS, seconds / TICKS * 1e6
+
+def main():
+    for name, builder in (('dict', build_dict), ('snapshot', build_snapshot)):
+        size, micros = measure(builder)
+        print(f"{name:>8}: {size:7.0f} bytes/tick  {micros:6.2f} us/tick")
+
+if __name__ == '__main__':
+    main()
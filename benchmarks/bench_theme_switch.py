@@ -0,0 +1,103 @@
+"""Compare theme-switch latency of the ways the widgets can get their stylesheets
+
+Builds the clipboard, focus timer, system stats and settings widgets and
+cycles through the themes, then re-applies the current theme (as happens
+when both the settings widget and the main window react to one change).
+Events are processed after each step so the re-polish is counted.
+
+- previous: each widget formats its QSS on every apply and sets it on
+  itself; the clipboard and focus timer widgets set a base sheet first
+- application: every widget's QSS compiled into one sheet set on the
+  QApplication, which re-polishes every widget against every rule
+- compiled: ThemeEngine's cached per-widget sheets, set only when changed
+
+Run from the repository root (no display needed):
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_theme_switch.py
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PyQt5.QtWidgets import QApplication
+from core.clipboard_manager import ClipboardManager
+from core.focus_timer import FocusTimer
+from core.settings import Settings
+from core.system_stats import SystemStats
+from core.theme_engine import ThemeEngine
+from core.theme_styles import SCOPE_PROPERTY, WIDGET_STYLES
+from ui.widgets.clipboard_widget import ClipboardWidget
+from ui.widgets.focus_timer_widget import FocusTimerWidget
+from ui.widgets.settings_widget import SettingsWidget
+from ui.widgets.system_stats_widget import SystemStatsWidget
+
+SWITCHES = 30
+
+def timed(app, step):
+    """Run `step` and the event processing it causes, in milliseconds"""
+    start = time.perf_counter()
+    step()
+    app.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+def format_sheet(theme_engine, scope):
+    """Format a widget's QSS from scratch"""
+    return WIDGET_STYLES[scope].format(scope=f'*[{SCOPE_PROPERTY}="{scope}"]',
+                                       **theme_engine._style_values())
+
+def apply_previous(app, theme_engine, widgets):
+    """Each widget formats and sets its own stylesheet"""
+    for widget in widgets:
+        scope = widget.property(SCOPE_PROPERTY)
+        if scope in ('clipboard', 'focus_timer'):
+            widget.setStyleSheet(theme_engine.get_style_sheet("QWidget"))
+        widget.setStyleSheet(format_sheet(theme_engine, scope))
+
+def apply_application(app, theme_engine, widgets):
+    """One sheet with every widget's rules, set on the application"""
+    app.setStyleSheet(''.join(format_sheet(theme_engine, scope) for scope in WIDGET_STYLES))
+
+def apply_compiled(app, theme_engine, widgets):
+    """The widgets' own apply_theme, backed by ThemeEngine's cache"""
+    for widget in widgets:
+        widget.apply_theme()
+
+def main():
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as directory:
+        # Keep the benchmark's settings away from the real ones
+        os.environ['HOME'] = directory
+        settings = Settings()
+        theme_engine = ThemeEngine(settings)
+        clipboard_manager = ClipboardManager(journal_path=os.path.join(directory, 'clipboard.journal'))
+        widgets = [
+            ClipboardWidget(clipboard_manager, theme_engine, settings),
+            FocusTimerWidget(FocusTimer(), theme_engine, settings),
+            SystemStatsWidget(SystemStats(), theme_engine, settings),
+            SettingsWidget(settings, theme_engine, None),
+        ]
+        for widget in widgets:
+            widget.show()
+        themes = theme_engine.get_theme_names()
+
+        print(f"{'stylesheets':<12} {'switch median ms':>17} {'switch worst ms':>16} {'re-apply median ms':>19}")
+        for name, apply in (('previous', apply_previous), ('application', apply_application),
+                            ('compiled', apply_compiled)):
+            for widget in widgets:
+                widget.setStyleSheet('')
+            app.setStyleSheet('')
+            app.processEvents()
+            switches, repeats = [], []
+            for i in range(SWITCHES):
+                theme_engine.current_theme = themes[i % len(themes)]
+                switches.append(timed(app, lambda: apply(app, theme_engine, widgets)))
+                repeats.append(timed(app, lambda: apply(app, theme_engine, widgets)))
+            print(f"{name:<12} {statistics.median(switches):>17.2f} {max(switches):>16.2f} "
+                  f"{statistics.median(repeats):>19.2f}")
+        clipboard_manager.history.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Report what NerdHUD imports on a cold start
+
+Starts the app in a fresh interpreter under `python -X importtime` with a
+throwaway home directory, lets it finish starting up (every startup
+widget shown and the background services started), then exits and turns
+the import log into a report: how many modules were imported and how
+long they took, the slowest top-level imports, time per package, and
+which of the heavy optional dependencies were loaded.
+
+`--only` limits the enabled widgets, e.g. `--only system_stats` for a
+HUD that only shows system stats. Run from the repository root (no
+display needed):
+    QT_QPA_PLATFORM=offscreen python benchmarks/profile_imports.py [--only a,b] [--top N]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+WIDGETS = ('system_stats', 'clipboard', 'focus_timer', 'github', 'spotify')
+# Third-party packages worth keeping off the startup path, and the feature that needs each
+HEAVY = {
+    'github': 'github', 'requests': 'github', 'cryptography': 'github', 'jwt': 'github',
+    'nacl': 'github', 'urllib3': 'github',
+    'psutil': 'system_stats / spotify', 'GPUtil': 'system_stats',
+    'pyperclip': 'clipboard', 'keyboard': 'hotkeys',
+    'win32gui': 'spotify', 'win32process': 'spotify', 'pycaw': 'spotify',
+    'comtypes': 'spotify', 'pyautogui': 'spotify',
+}
+TIMEOUT = 120
+
+# Runs in the child: start NerdHUD as main.py does and exit once startup is done
+PROBE = """
+import os, sys
+sys.path.insert(0, {src!r})
+from PyQt5.QtCore import QTimer
+from main import NerdHUD
+
+nerdhud = NerdHUD()
+start_background_services = nerdhud.main_window.start_background_services
+
+def finish_startup():
+    start_background_services()
+    QTimer.singleShot(0, lambda: os._exit(0))
+
+nerdhud.main_window.start_background_services = finish_startup
+nerdhud.run()
+"""
+
+def write_settings(home, only):
+    """Save settings that enable only the widgets in `only`"""
+    os.makedirs(os.path.join(home, '.nerdhud'))
+    enabled = {name: name in only for name in WIDGETS}
+    with open(os.path.join(home, '.nerdhud', 'settings.json'), 'w') as f:
+        json.dump({'enabled_widgets': enabled}, f)
+
+def run_probe(home):
+    """Start the app under -X importtime and get its import log lines"""
+    env = dict(os.environ, HOME=home, USERPROFILE=home)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', PROBE.format(src=SRC)],
+                            cwd=SRC, env=env, capture_output=True, text=True, timeout=TIMEOUT)
+    return [line for line in result.stderr.splitlines() if line.startswith('import time:')]
+
+def parse(lines):
+    """Turn -X importtime lines into (module, depth, self us, cumulative us) tuples"""
+    imports = []
+    for line in lines:
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), depth, int(fields[0]), int(fields[1])))
+    return imports
+
+def report(imports, top):
+    """Print the import report"""
+    total_self = sum(entry[2] for entry in imports)
+    print(f"{len(imports)} modules imported, {total_self / 1000:.1f} ms in total")
+
+    print(f"\nSlowest top-level imports (cumulative):")
+    roots = sorted((entry for entry in imports if entry[1] <= 1), key=lambda entry: -entry[3])
+    for name, depth, self_us, cumulative_us in roots[:top]:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    packages = defaultdict(lambda: [0, 0])
+    for name, depth, self_us, cumulative_us in imports:
+        package = packages[name.split('.')[0]]
+        package[0] += 1
+        package[1] += self_us
+    print(f"\nTime per package (self):")
+    for name, (count, self_us) in sorted(packages.items(), key=lambda item: -item[1][1])[:top]:
+        print(f"  {self_us / 1000:>8.1f} ms  {count:>4} modules  {name}")
+
+    loaded = sorted(name for name in HEAVY if name in packages)
+    print(f"\nHeavy dependencies loaded: "
+          + (', '.join(f"{name} ({HEAVY[name]})" for name in loaded) if loaded else 'none'))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--only', help="comma-separated widgets to enable (default: the app's defaults)")
+    parser.add_argument('--top', type=int, default=15, help="rows per table")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as home:
+        if args.only is not None:
+            write_settings(home, args.only.split(','))
+        lines = run_probe(home)
+    if not lines:
+        sys.exit("the app produced no import log; is it starting?")
+    report(parse(lines), args.top)
+
+if __name__ == '__main__':
+    main()
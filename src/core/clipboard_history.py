@@ -0,0 +1,143 @@
+import threading
+from array import array
+from core.clipboard_journal import ClipboardJournal
+
+class HistorySnapshot:
+    """Entry ids as of when the snapshot was taken
+
+    Iterating does not copy: it walks the history's append-only id log up
+    to the length it had at the time, skipping entries removed since.
+    """
+    __slots__ = ('history', 'order', 'length')
+
+    def __init__(self, history, order, length):
+        self.history = history
+        self.order = order
+        self.length = length
+
+    def newest_first(self):
+        """Iterate entry ids, newest first"""
+        order, history = self.order, self.history
+        for position in range(self.length - 1, -1, -1):
+            entry_id = order[position]
+            if entry_id in history:
+                yield entry_id
+
+    def oldest_first(self):
+        """Iterate entry ids, oldest first"""
+        order, history = self.order, self.history
+        for position in range(self.length):
+            entry_id = order[position]
+            if entry_id in history:
+                yield entry_id
+
+class ClipboardHistory:
+    """Thread-safe clipboard entries keyed by stable id
+
+    Entries live in a ClipboardJournal, whose ordered index makes adding,
+    finding and removing an entry by id O(1). Every method holds the lock,
+    so each mutation is atomic; callers that must keep other state in step
+    with the history (like the search index) hold `lock` around both.
+
+    Alongside the journal is a log of ids in the order they were added.
+    It is only ever appended to, so a snapshot is just the log and its
+    length; removed ids stay in it until they outnumber live ones, when a
+    fresh log replaces it and existing snapshots keep the old one.
+    """
+
+    def __init__(self, path):
+        self.lock = threading.RLock()
+        self.journal = ClipboardJournal(path)
+        self.order = array('Q', self.journal.ids())
+
+    def __len__(self):
+        return len(self.journal)
+
+    def __contains__(self, entry_id):
+        return entry_id in self.journal
+
+    @property
+    def payload_bytes(self):
+        """Stored bytes of every live entry"""
+        return self.journal.payload_bytes
+
+    def snapshot(self):
+        """Get the current entry ids for iterating without holding the lock"""
+        with self.lock:
+            return HistorySnapshot(self, self.order, len(self.order))
+
+    def newest(self):
+        """Get the newest entry's id, or None if the history is empty"""
+        with self.lock:
+            return self.journal.newest()
+
+    def digest(self, entry_id):
+        """Get an entry's content hash, or None if it has been removed"""
+        with self.lock:
+            return self.journal.digest(entry_id) if entry_id in self.journal else None
+
+    def read(self, entry_id):
+        """Get an entry's text, or None if it has been removed"""
+        with self.lock:
+            return self.journal.read(entry_id) if entry_id in self.journal else None
+
+    def preview(self, entry_id, chars):
+        """Get the start of an entry's text, or None if it has been removed"""
+        with self.lock:
+            return self.journal.preview(entry_id, chars) if entry_id in self.journal else None
+
+    def add(self, payload, digest):
+        """Add an entry, replacing any with the same content
+
+        Returns the new entry's id and the id of the entry it replaced, or None.
+        """
+        with self.lock:
+            replaced = self.journal.find(digest)
+            if replaced is not None:
+                self.journal.remove(replaced)
+            entry_id = self.journal.append(payload, digest)
+            self.order.append(entry_id)
+            self._maybe_compact_order()
+            return entry_id, replaced
+
+    def remove(self, entry_id):
+        """Remove an entry and get whether it was there"""
+        with self.lock:
+            if entry_id not in self.journal:
+                return False
+            self.journal.remove(entry_id)
+            self._maybe_compact_order()
+            return True
+
+    def evict(self, max_count, max_bytes):
+        """Remove the oldest entries until both budgets are met, keeping the newest
+
+        Returns the removed ids, oldest first.
+        """
+        evicted = []
+        with self.lock:
+            journal = self.journal
+            while len(journal) > 1 and (len(journal) > max_count or
+                                        journal.payload_bytes > max_bytes):
+                entry_id = journal.oldest()
+                journal.remove(entry_id)
+                evicted.append(entry_id)
+            if evicted:
+                self._maybe_compact_order()
+        return evicted
+
+    def clear(self):
+        """Remove every entry"""
+        with self.lock:
+            self.journal.clear()
+            self.order = array('Q')
+
+    def _maybe_compact_order(self):
+        """Start a fresh id log once removed ids outnumber live ones"""
+        if len(self.order) > 2 * len(self.journal) + 1024:
+            self.order = array('Q', self.journal.ids())
+
+    def close(self):
+        """Close the journal"""
+        with self.lock:
+            self.journal.close()
@@ -0,0 +1,291 @@
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from core.private_files import PRIVATE_DIR_MODE, open_private
+
+# Payloads above this size (bytes) are stored zlib-compressed
+COMPRESS_THRESHOLD = 64 * 1024
+
+def content_digest(payload):
+    """Get the 16-byte hash identifying an entry's UTF-8 payload"""
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+class ClipboardJournal:
+    """Append-only on-disk clipboard history
+
+    The file is a magic header followed by length-prefixed records: an
+    entry being added (with its UTF-8 text and content hash), removed, or
+    the whole history being cleared. Opening the journal only walks the
+    record headers of the memory-mapped file, keeping each live entry's
+    offset, length, flags and hash in RAM; the text is decoded when an
+    entry is read. Large payloads are stored compressed and previews of
+    them only decompress the first few kilobytes. A removed entry's text
+    and hash are overwritten with zeros at once, since clipboard text can
+    be a password; its record stays in the file as dead bytes until the
+    journal is compacted. Clearing truncates the file.
+    """
+    MAGIC = b'NHCJ\x02'
+    RECORD = struct.Struct('<BBQI16s')  # kind, flags, entry id, payload length, digest
+    ADD = 1
+    REMOVE = 2
+    CLEAR = 3
+    COMPRESSED = 1
+    NO_DIGEST = bytes(16)
+
+    def __init__(self, path, compact_ratio=0.5, compact_min_bytes=1024 * 1024,
+                 compress_threshold=COMPRESS_THRESHOLD):
+        self.path = path
+        # Compact once dead bytes make up this share of a file at least this big
+        self.compact_ratio = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
+        self.compress_threshold = compress_threshold
+        self.entries = OrderedDict()
+        self.digests = {}
+        self.next_id = 1
+        self.live_bytes = 0
+        # Stored (possibly compressed) payload bytes of live entries
+        self.payload_bytes = 0
+        self.file = None
+        self.map = None
+        self.size = 0
+        self._open()
+
+    def _open(self):
+        """Open or create the journal and index its records"""
+        os.makedirs(os.path.dirname(self.path), mode=PRIVATE_DIR_MODE, exist_ok=True)
+        self.file = open_private(self.path)
+        self.size = os.fstat(self.file.fileno()).st_size
+        if self.size < len(self.MAGIC) or self._read_magic() != self.MAGIC:
+            if self.size:
+                print(f"Clipboard journal {self.path} is unreadable, starting a new one")
+            self._reset_file()
+        self._remap()
+        self._scan()
+
+    def _read_magic(self):
+        self.file.seek(0)
+        return self.file.read(len(self.MAGIC))
+
+    def _reset_file(self):
+        """Truncate the file down to an empty journal"""
+        self.file.seek(0)
+        self.file.truncate()
+        self.file.write(self.MAGIC)
+        self.file.flush()
+        self.size = len(self.MAGIC)
+
+    def _remap(self):
+        """Map the file again so records appended since are visible"""
+        if self.map is not None:
+            self.map.close()
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _scan(self):
+        """Rebuild the entry index from record headers without decoding text"""
+        data = self.map
+        header = self.RECORD.size
+        position = len(self.MAGIC)
+        end = len(data)
+        while position + header <= end:
+            kind, flags, entry_id, length, digest = self.RECORD.unpack_from(data, position)
+            payload = position + header
+            if payload + length > end or kind not in (self.ADD, self.REMOVE, self.CLEAR):
+                break
+            if kind == self.ADD:
+                self._index_entry(entry_id, payload, length, flags, digest)
+            elif kind == self.REMOVE:
+                self._forget(entry_id)
+            else:
+                self._forget_all()
+            self.next_id = max(self.next_id, entry_id + 1)
+            position = payload + length
+        if position != self.size:
+            # Drop a record torn by a crash mid-write; Windows cannot
+            # resize a file while it is mapped
+            self.map.close()
+            self.map = None
+            self.file.truncate(position)
+            self.size = position
+            self._remap()
+
+    def _index_entry(self, entry_id, offset, length, flags, digest):
+        """Track a live entry"""
+        self.entries[entry_id] = (offset, length, flags, digest)
+        self.digests[digest] = entry_id
+        self.live_bytes += self.RECORD.size + length
+        self.payload_bytes += length
+
+    def _forget(self, entry_id):
+        """Stop tracking an entry and get whether it was live"""
+        removed = self.entries.pop(entry_id, None)
+        if removed is None:
+            return False
+        if self.digests.get(removed[3]) == entry_id:
+            del self.digests[removed[3]]
+        self.live_bytes -= self.RECORD.size + removed[1]
+        self.payload_bytes -= removed[1]
+        return True
+
+    def _forget_all(self):
+        """Stop tracking every entry"""
+        self.entries.clear()
+        self.digests.clear()
+        self.live_bytes = 0
+        self.payload_bytes = 0
+
+    def _write(self, kind, entry_id, payload=b'', flags=0, digest=NO_DIGEST):
+        """Append one record"""
+        self.file.seek(self.size)
+        self.file.write(self.RECORD.pack(kind, flags, entry_id, len(payload), digest) + payload)
+        self.file.flush()
+        offset = self.size + self.RECORD.size
+        self.size = offset + len(payload)
+        return offset
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, entry_id):
+        return entry_id in self.entries
+
+    def ids(self):
+        """Get entry ids, oldest first"""
+        return list(self.entries)
+
+    def oldest(self):
+        """Get the oldest entry's id, or None if there are no entries"""
+        return next(iter(self.entries), None)
+
+    def newest(self):
+        """Get the newest entry's id, or None if there are no entries"""
+        return next(reversed(self.entries), None)
+
+    def digest(self, entry_id):
+        """Get an entry's content hash"""
+        return self.entries[entry_id][3]
+
+    def find(self, digest):
+        """Get the id of the live entry with this content hash, or None"""
+        return self.digests.get(digest)
+
+    def stored_size(self, entry_id):
+        """Get the bytes an entry's payload takes on disk"""
+        return self.entries[entry_id][1]
+
+    def append(self, payload, digest=None):
+        """Add an entry from its UTF-8 payload and get its id"""
+        if digest is None:
+            digest = content_digest(payload)
+        flags = 0
+        if len(payload) > self.compress_threshold:
+            compressed = zlib.compress(payload, 6)
+            if len(compressed) < len(payload):
+                payload = compressed
+                flags = self.COMPRESSED
+        entry_id = self.next_id
+        self.next_id += 1
+        offset = self._write(self.ADD, entry_id, payload, flags, digest)
+        self._index_entry(entry_id, offset, len(payload), flags, digest)
+        return entry_id
+
+    def _stored(self, entry_id):
+        """Get an entry's stored bytes and flags"""
+        offset, length, flags, _ = self.entries[entry_id]
+        if offset + length > len(self.map):
+            self._remap()
+        return self.map[offset:offset + length], flags
+
+    def read(self, entry_id):
+        """Get an entry's text"""
+        data, flags = self._stored(entry_id)
+        if flags & self.COMPRESSED:
+            data = zlib.decompress(data)
+        return data.decode('utf-8', 'surrogatepass')
+
+    def preview(self, entry_id, chars):
+        """Get roughly the first `chars` characters of an entry without decoding all of it"""
+        offset, length, flags, _ = self.entries[entry_id]
+        limit = chars * 4  # longest UTF-8 encoding of a character
+        if flags & self.COMPRESSED:
+            data, _ = self._stored(entry_id)
+            data = zlib.decompressobj().decompress(data, limit)
+        else:
+            if offset + length > len(self.map):
+                self._remap()
+            data = self.map[offset:offset + min(length, limit)]
+        # A cut may split the last character
+        return data.decode('utf-8', 'ignore')[:chars]
+
+    def remove(self, entry_id):
+        """Remove an entry and overwrite its text on disk"""
+        entry = self.entries.get(entry_id)
+        if entry is None:
+            return
+        self._forget(entry_id)
+        # The REMOVE record goes first, so a crash in between never
+        # brings the entry back with zeroed text
+        self._write(self.REMOVE, entry_id)
+        self._scrub(entry[0], entry[1])
+        self.maybe_compact()
+
+    def _scrub(self, offset, length):
+        """Overwrite a removed entry's content hash and payload with zeros"""
+        # The hash is the last field of the record header, right before the payload
+        start = offset - len(self.NO_DIGEST)
+        self.file.seek(start)
+        self.file.write(bytes(offset + length - start))
+        self.file.flush()
+
+    def clear(self):
+        """Remove every entry, truncating the file so none of their text stays on disk"""
+        self._forget_all()
+        # Windows cannot resize a file while it is mapped
+        self.map.close()
+        self.map = None
+        self._reset_file()
+        self._remap()
+
+    def maybe_compact(self):
+        """Compact the file if it is mostly dead records"""
+        dead = self.size - len(self.MAGIC) - self.live_bytes
+        if self.size >= self.compact_min_bytes and dead >= self.size * self.compact_ratio:
+            self.compact()
+
+    def compact(self):
+        """Rewrite the journal with only the live entries, keeping their ids"""
+        temp_path = self.path + '.tmp'
+        entries = OrderedDict()
+        if len(self.map) < self.size:
+            self._remap()
+        with open_private(temp_path, truncate=True) as f:
+            f.write(self.MAGIC)
+            position = len(self.MAGIC)
+            for entry_id, (offset, length, flags, digest) in self.entries.items():
+                f.write(self.RECORD.pack(self.ADD, flags, entry_id, length, digest))
+                f.write(self.map[offset:offset + length])
+                position += self.RECORD.size
+                entries[entry_id] = (position, length, flags, digest)
+                position += length
+            f.flush()
+            os.fsync(f.fileno())
+        # Windows cannot replace a file that is still open or mapped
+        self.map.close()
+        self.map = None
+        self.file.close()
+        os.replace(temp_path, self.path)
+        self.file = open(self.path, 'r+b')
+        self.size = position
+        self.entries = entries
+        self._remap()
+
+    def close(self):
+        """Close the file and its mapping"""
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -1,94 +1,293 @@
-import pyperclip
+import os
+import queue
 import threading
-import time
+from itertools import islice
 from PyQt5.QtCore import QObject, pyqtSignal
-from collections import deque
+from core.clipboard_sources import create_clipboard_source
+from core.clipboard_journal import content_digest
+from core.clipboard_history import ClipboardHistory
+from core.clipboard_search import (TrigramIndex, ClipboardSearcher, rank_entries,
+                                   MAX_INDEXED_CHARS)
+
+DEFAULT_JOURNAL_PATH = os.path.join(os.path.expanduser("~"), ".nerdhud", "clipboard.journal")
+# Entries indexed per lock hold while the search index is built at startup
+INDEX_CHUNK = 1000
+# Characters of an entry shown in lists, plus one so lists can tell it was cut
+PREVIEW_CHARS = 101
+# Copies bigger than this (UTF-8 bytes) are not kept
+MAX_ENTRY_BYTES = 16 * 1024 * 1024
+# Stored bytes of the whole history before the least recently used entries go
+MAX_TOTAL_BYTES = 64 * 1024 * 1024
 
 class ClipboardManager(QObject):
     clipboard_changed = pyqtSignal(str)  
+    # Id of a new entry, newest in the history
+    entry_added = pyqtSignal(int)
+    # Ids dropped as duplicates, by eviction or by removal
+    entries_removed = pyqtSignal(list)
+    # Query and matching entry ids, best first
+    search_results = pyqtSignal(str, list)
     
-    def __init__(self, max_history=20):
+    def __init__(self, max_history=1000, source=None, journal_path=None,
+                 max_entry_bytes=MAX_ENTRY_BYTES, max_total_bytes=MAX_TOTAL_BYTES):
         super().__init__()
         self.max_history = max_history
-        self.history = deque(maxlen=max_history)
+        self.max_entry_bytes = max_entry_bytes
+        self.max_total_bytes = max_total_bytes
         self.running = False
-        self.monitor_thread = None
-        self.last_content = None
+        # Chosen on start so the Qt platform is known; see clipboard_sources
+        self.source = source
+        # History survives restarts; entries are only read back on demand
+        self.history = ClipboardHistory(journal_path or DEFAULT_JOURNAL_PATH)
+        # Held around changes that must keep the search index in step
+        self.lock = self.history.lock
+        # Built in the background once monitoring starts, then kept up to
+        # date on every change
+        self.index = TrigramIndex()
+        self.index_built = False
+        self.index_thread = None
+        self.searcher = ClipboardSearcher(self._search, self.search_results.emit)
+        # Copies are hashed, compressed and written on a worker, in the order reported
+        self.record_queue = queue.Queue()
+        self.record_thread = None
+        # Text last reported by the source, so repeats are dropped before the hand-off
+        self.last_text = None
+        self._trim()
+        # Hash of the newest entry; re-reports of it are ignored
+        self.last_digest = self.history.digest(self.history.newest())
         
     def start_monitoring(self):
         """Start monitoring clipboard changes"""
         if not self.running:
             self.running = True
-            self.monitor_thread = threading.Thread(target=self._monitor_loop)
-            self.monitor_thread.daemon = True
-            self.monitor_thread.start()
+            self.start_indexing()
+            if self.source is None:
+                self.source = create_clipboard_source()
+            try:
+                # Pick up whatever is already on the clipboard
+                self._on_clipboard_content(self.source.read())
+            except Exception as e:
+                print(f"Error reading clipboard: {e}")
+            self.source.start(self._on_clipboard_content)
             
     def stop_monitoring(self):
         """Stop monitoring clipboard changes"""
         self.running = False
-        if self.monitor_thread:
-            self.monitor_thread.join()
+        if self.source:
+            self.source.stop()
             
-    def _monitor_loop(self):
-        """Main monitoring loop"""
-        while self.running:
+    def _on_clipboard_content(self, content):
+        """Queue new clipboard content reported by the source for recording
+        
+        The Qt source calls this on the GUI thread, so only the repeat check
+        happens here; hashing, compressing and writing a copy of up to
+        max_entry_bytes run on the record thread.
+        """
+        if not content or content == self.last_text:
+            return
+        self.last_text = content
+        if self.record_thread is None:
+            self.record_thread = threading.Thread(target=self._record_loop)
+            self.record_thread.daemon = True
+            self.record_thread.start()
+        self.record_queue.put(content)
+        
+    def _record_loop(self):
+        """Record queued copies one at a time"""
+        while True:
+            content = self.record_queue.get()
             try:
-                current_content = None
-                # Try to paste, with retries for clipboard access errors
-                for _ in range(3): # Retry up to 3 times
-                    try:
-                        current_content = pyperclip.paste()
-                        break # If successful, break out of retry loop
-                    except pyperclip.PyperclipWindowsException as e:
-                        print(f"Clipboard access error, retrying: {e}")
-                        time.sleep(0.1) # Wait a bit before retrying
-                
-                if current_content is None: # If all retries failed
-                    raise pyperclip.PyperclipWindowsException("Failed to access clipboard after multiple retries.")
-
-                # Only process if content has changed and is not empty
-                if current_content and current_content != self.last_content:
-                    self.last_content = current_content
-                    self.history.append(current_content)
-                    self.clipboard_changed.emit(current_content)
+                self._record(content)
             except Exception as e:
-                print(f"Error in clipboard monitoring loop: {e}")
-            time.sleep(0.5) 
+                print(f"Error recording clipboard entry: {e}")
+            finally:
+                self.record_queue.task_done()
+                
+    def wait_for_recording(self):
+        """Block until every queued copy is in the history"""
+        self.record_queue.join()
+        
+    def _record(self, content):
+        """Add a copy to the history, unless it repeats the newest entry"""
+        payload = content.encode('utf-8', 'surrogatepass')
+        if len(payload) > self.max_entry_bytes:
+            print(f"Skipping {len(payload)} byte clipboard entry, over the {self.max_entry_bytes} byte limit")
+            return
+        digest = content_digest(payload)
+        with self.lock:
+            if digest == self.last_digest:
+                return
+            self.last_digest = digest
+            removed = []
+            # Copying something already in the history moves it to the top
+            entry_id, duplicate = self.history.add(payload, digest)
+            if duplicate is not None:
+                self.index.remove(duplicate)
+                removed.append(duplicate)
+            if self.index_built:
+                self.index.add(entry_id, content)
+            removed.extend(self._trim())
+        if removed:
+            self.entries_removed.emit(removed)
+        self.entry_added.emit(entry_id)
+        self.clipboard_changed.emit(content)
+        
+    def _trim(self):
+        """Evict the least recently copied entries beyond the count and byte budgets
+        
+        The newest entry is always kept. Returns the evicted ids.
+        """
+        with self.lock:
+            evicted = self.history.evict(self.max_history, self.max_total_bytes)
+            for entry_id in evicted:
+                self.index.remove(entry_id)
+        return evicted
             
     def get_history(self):
-        """Get clipboard history"""
-        return list(self.history)
+        """Get clipboard history, oldest first"""
+        texts = (self.history.read(entry_id)
+                 for entry_id in self.history.snapshot().oldest_first())
+        return [text for text in texts if text is not None]
+            
+    def get_history_count(self):
+        """Get the number of entries in the history"""
+        return len(self.history)
+        
+    def get_entry_ids(self):
+        """Get a list of entry ids, oldest first"""
+        return list(self.history.snapshot().oldest_first())
         
     def clear_history(self):
         """Clear clipboard history"""
-        self.history.clear()
+        with self.lock:
+            self.history.clear()
+            self.index.clear()
+            self.last_digest = None
+            self.last_text = None
         
     def copy_to_clipboard(self, content):
         """Copy content to clipboard"""
-        pyperclip.copy(content)
+        if self.source is None:
+            self.source = create_clipboard_source()
+        self.source.write(content)
+        
+    def get_entry(self, entry_id):
+        """Get an entry's text, or None if it has been removed"""
+        return self.history.read(entry_id)
+            
+    def get_preview(self, entry_id, chars=PREVIEW_CHARS):
+        """Get the start of an entry without reading all of it, or None if it has been removed"""
+        return self.history.preview(entry_id, chars)
+            
+    def _search_text(self, entry_id):
+        """Get the searchable start of an entry, or None if it has been removed"""
+        return self.get_preview(entry_id, MAX_INDEXED_CHARS)
+            
+    def _ids_newest_first(self):
+        """Iterate a snapshot of entry ids, newest first"""
+        return self.history.snapshot().newest_first()
+        
+    def _index_entries(self, entry_ids):
+        """Add entries that are still in the history to the search index"""
+        for entry_id in entry_ids:
+            text = self.history.preview(entry_id, MAX_INDEXED_CHARS)
+            if text is not None:
+                self.index.add(entry_id, text)
+        
+    def start_indexing(self):
+        """Build the search index for the stored history on a background thread"""
+        with self.lock:
+            if self.index_thread is not None:
+                return
+            self.index_thread = threading.Thread(target=self._build_index_safely)
+            self.index_thread.daemon = True
+        self.index_thread.start()
+        
+    def _build_index_safely(self):
+        try:
+            self._build_index()
+        except Exception as e:
+            print(f"Error indexing clipboard history: {e}")
+        
+    def _build_index(self):
+        """Index the stored history in chunks so new copies are not held up"""
+        entry_ids = self.history.snapshot().oldest_first()
+        last_id = 0
+        while True:
+            with self.lock:
+                chunk = list(islice(entry_ids, INDEX_CHUNK))
+                self._index_entries(chunk)
+            if not chunk:
+                break
+            last_id = chunk[-1]
+        with self.lock:
+            # Pick up copies made while building, still in id order
+            newer = []
+            for entry_id in self.history.snapshot().newest_first():
+                if entry_id <= last_id:
+                    break
+                newer.append(entry_id)
+            self._index_entries(reversed(newer))
+            self.index_built = True
+            
+    def _search(self, query, cancelled=None):
+        """Get ids of entries matching `query`, best first"""
+        # Until the index is complete every entry is checked, within the budget
+        indexed = self.index_built
+        if not indexed:
+            self.start_indexing()
+        return rank_entries(query, self.index, self._ids_newest_first,
+                            self._search_text, cancelled=cancelled, indexed=indexed)
+        
+    def request_search(self, query):
+        """Search in the background; results arrive through search_results"""
+        self.searcher.request(query)
         
     def search_history(self, query):
-        """Search clipboard history for matching content"""
-        query = query.lower()
-        return [item for item in self.history if query in item.lower()]
+        """Search clipboard history for matching content, best match first"""
+        texts = (self.get_entry(entry_id) for entry_id in self._search(query))
+        return [text for text in texts if text is not None]
         
     def set_max_history(self, max_items):
         """Set maximum number of items to keep in history"""
         self.max_history = max_items
-        # Create new deque with new maxlen
-        self.history = deque(self.history, maxlen=max_items)
+        evicted = self._trim()
+        if evicted:
+            self.entries_removed.emit(evicted)
+            
+    def set_byte_budget(self, max_entry_bytes=None, max_total_bytes=None):
+        """Set the largest copy kept and the stored size of the whole history"""
+        if max_entry_bytes is not None:
+            self.max_entry_bytes = max_entry_bytes
+        if max_total_bytes is not None:
+            self.max_total_bytes = max_total_bytes
+        evicted = self._trim()
+        if evicted:
+            self.entries_removed.emit(evicted)
+        
+    def remove_entry(self, entry_id):
+        """Remove an entry by id"""
+        with self.lock:
+            if not self.history.remove(entry_id):
+                return
+            self.index.remove(entry_id)
+            # Copying the removed text again must record it
+            self.last_digest = self.history.digest(self.history.newest())
+            self.last_text = None
+        self.entries_removed.emit([entry_id])
         
     def remove_from_history(self, index):
-        """Remove item from history at specified index"""
-        if 0 <= index < len(self.history):
-            # Convert to list, remove item, and create new deque
-            items = list(self.history)
-            items.pop(index)
-            self.history = deque(items, maxlen=self.max_history) 
+        """Remove item from history at specified index, counted from the oldest"""
+        if index < 0:
+            return
+        entry_id = next(islice(self.history.snapshot().oldest_first(), index, None), None)
+        if entry_id is not None:
+            self.remove_entry(entry_id)
             
     def get_last_content(self):
         """gert last copied content"""
-        return self.last_content if self.last_content else None
+        newest = self.history.newest()
+        return self.history.read(newest) if newest is not None else None
     
     def is_running(self):
         return self.running
\ No newline at end of file
@@ -0,0 +1,231 @@
+import threading
+import time
+from array import array
+
+# Only the start of very long entries is indexed and searched
+MAX_INDEXED_CHARS = 4096
+# Trigrams are hashed into this many buckets so memory stays bounded no
+# matter how many distinct trigrams the history contains
+BUCKET_BITS = 16
+SEARCH_BUDGET = 0.05
+SEARCH_LIMIT = 200
+# Candidates walked between deadline checks; reads of long entries add up fast
+DEADLINE_CHECK_EVERY = 16
+
+def search_text(text):
+    """Get the part of an entry that is indexed and matched, lowercased"""
+    return text[:MAX_INDEXED_CHARS].lower()
+
+def fuzzy_score(query, text):
+    """Score `query` as a subsequence of `text` (both lowercase), or None if it is not one
+
+    Consecutive characters and characters at the start of a word score
+    higher, so 'gco' ranks 'git checkout' above 'log collection'.
+    """
+    position = 0
+    previous = -2
+    score = 0.0
+    for char in query:
+        index = text.find(char, position)
+        if index < 0:
+            return None
+        if index == previous + 1:
+            score += 3
+        elif index == 0 or not text[index - 1].isalnum():
+            score += 2
+        else:
+            score += 1 - min(index - position, 20) * 0.04
+        previous = index
+        position = index + 1
+    return score
+
+def char_mask(text):
+    """Get a 64-bit mask of the characters in a text, for ruling out fuzzy matches"""
+    mask = 0
+    for char in set(text):
+        mask |= 1 << (ord(char) & 63)
+    return mask
+
+def substring_score(query, text):
+    """Score an exact match of `query` in `text`, or None if there is none
+
+    Matches that start a word or the whole entry score higher; otherwise
+    the newer entry wins.
+    """
+    index = text.find(query)
+    if index < 0:
+        return None
+    if index == 0:
+        return 120
+    return 110 if not text[index - 1].isalnum() else 100
+
+class TrigramIndex:
+    """Incremental trigram index over clipboard entries
+
+    Each bucket keeps an array of entry ids in the order they were added,
+    which is also oldest to newest, so candidates can be walked newest
+    first and the walk stopped as soon as enough results are found.
+    Removed ids are tombstoned and swept out once they pile up. A
+    character mask per entry lets fuzzy matching skip entries without
+    reading them.
+    """
+
+    def __init__(self, bucket_bits=BUCKET_BITS):
+        self.mask = (1 << bucket_bits) - 1
+        self.buckets = {}
+        self.removed = set()
+        self.char_masks = {}
+        self.count = 0
+
+    def _bucket_keys(self, text):
+        """Get the bucket numbers for every trigram of an already lowercased text"""
+        mask = self.mask
+        return {hash(text[i:i + 3]) & mask for i in range(len(text) - 2)}
+
+    def add(self, entry_id, text):
+        """Index a new entry; ids must be added in increasing order"""
+        text = search_text(text)
+        self.char_masks[entry_id] = char_mask(text)
+        for key in self._bucket_keys(text):
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = array('Q')
+            bucket.append(entry_id)
+        self.count += 1
+
+    def remove(self, entry_id):
+        """Forget an entry"""
+        # Every indexed entry has a mask; others were never added or are already gone
+        if self.char_masks.pop(entry_id, None) is None:
+            return
+        self.removed.add(entry_id)
+        if len(self.removed) > max(self.count // 2, 1024):
+            self._sweep()
+
+    def _sweep(self):
+        """Drop tombstoned ids from every bucket"""
+        removed = self.removed
+        for key, bucket in list(self.buckets.items()):
+            kept = array('Q', (entry_id for entry_id in bucket if entry_id not in removed))
+            if kept:
+                self.buckets[key] = kept
+            else:
+                del self.buckets[key]
+        self.count -= len(removed)
+        self.removed = set()
+
+    def clear(self):
+        """Forget every entry"""
+        self.buckets.clear()
+        self.removed.clear()
+        self.char_masks.clear()
+        self.count = 0
+
+    def candidates(self, query):
+        """Get the ids that may contain `query`, newest first, or None if it is too short to narrow"""
+        keys = self._bucket_keys(query.lower())
+        if not keys:
+            return None
+        # The rarest trigram narrows the most; matches are verified anyway
+        rarest = min((self.buckets.get(key, ()) for key in keys), key=len)
+        removed = self.removed
+        return (entry_id for entry_id in reversed(rarest) if entry_id not in removed)
+
+    def may_contain(self, entry_id, mask):
+        """Check whether an entry may contain every character in `mask`"""
+        entry_mask = self.char_masks.get(entry_id)
+        # Entries not indexed yet have to be read to find out
+        return entry_mask is None or entry_mask & mask == mask
+
+class ClipboardSearcher:
+    """Runs searches on a background thread, newest request first
+
+    `request(query)` returns immediately; an in-flight search notices the
+    newer request and stops early, and only the latest query's results are
+    passed to `on_results(query, entry_ids)`.
+    """
+
+    def __init__(self, search, on_results):
+        self.search = search
+        self.on_results = on_results
+        self.query = None
+        self.generation = 0
+        self.wake_event = threading.Event()
+        self.thread = None
+
+    def request(self, query):
+        """Search for `query`, cancelling any older search"""
+        self.query = query
+        self.generation += 1
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._search_loop)
+            self.thread.daemon = True
+            self.thread.start()
+        self.wake_event.set()
+
+    def _search_loop(self):
+        """Wait for requests and run the most recent one"""
+        while True:
+            self.wake_event.wait()
+            self.wake_event.clear()
+            generation, query = self.generation, self.query
+            cancelled = lambda: self.generation != generation
+            try:
+                results = self.search(query, cancelled=cancelled)
+            except Exception as e:
+                print(f"Error searching clipboard history: {e}")
+                continue
+            if not cancelled():
+                self.on_results(query, results)
+
+def rank_entries(query, index, all_ids, read, limit=SEARCH_LIMIT,
+                 budget=SEARCH_BUDGET, cancelled=None, indexed=True):
+    """Find up to `limit` entries matching `query`, best first
+
+    Exact substring matches among the index candidates come first, then
+    fuzzy subsequence matches from the rest of the history, both walked
+    newest first. The walk stops at `limit` results, after `budget`
+    seconds, or once `cancelled()` is true. Pass `indexed=False` while
+    the index is still being built, so every entry is checked.
+    """
+    deadline = time.monotonic() + budget
+    query = query.lower()
+    candidate_ids = index.candidates(query) if indexed else None
+    query_mask = char_mask(query)
+    scored = {}
+    checked = 0
+
+    def out_of_time():
+        return time.monotonic() >= deadline or (cancelled is not None and cancelled())
+
+    # Exact matches
+    for entry_id in candidate_ids if candidate_ids is not None else all_ids():
+        checked += 1
+        if checked % DEADLINE_CHECK_EVERY == 0 and out_of_time():
+            break
+        text = read(entry_id)
+        if text is None:
+            continue
+        score = substring_score(query, search_text(text))
+        if score is not None:
+            scored[entry_id] = score
+            if len(scored) >= limit:
+                break
+    else:
+        # Fuzzy matches fill what is left of the limit and budget
+        for entry_id in all_ids():
+            if len(scored) >= limit:
+                break
+            checked += 1
+            if checked % DEADLINE_CHECK_EVERY == 0 and out_of_time():
+                break
+            if entry_id in scored or not index.may_contain(entry_id, query_mask):
+                continue
+            text = read(entry_id)
+            if text is None:
+                continue
+            score = fuzzy_score(query, search_text(text))
+            if score is not None:
+                # Scaled below any exact match
+                scored[entry_id] = 50 * score / (3 * len(query))
+    return sorted(scored, key=lambda entry_id: (scored[entry_id], entry_id), reverse=True)
@@ -0,0 +1,130 @@
+import time
+from abc import ABC, abstractmethod
+from PyQt5.QtWidgets import QApplication
+from core.scheduler import shared_scheduler
+
+# Qt platforms where QClipboard only reports changes while the HUD has
+# focus, so the clipboard has to be polled instead
+POLLING_PLATFORMS = ('wayland', 'wayland-egl', 'cocoa', 'offscreen', 'minimal')
+
+class ClipboardSource(ABC):
+    """Where ClipboardManager reads clipboard changes from
+
+    `start(on_change)` begins calling `on_change(text)` whenever the
+    clipboard may have changed (duplicates are filtered by the manager),
+    `stop()` ends it, and `read()`/`write(text)` access the clipboard
+    directly. Tests can pass any object with these methods.
+    """
+
+    @abstractmethod
+    def start(self, on_change):
+        """Start reporting clipboard changes"""
+
+    def stop(self):
+        """Stop reporting clipboard changes"""
+
+    @abstractmethod
+    def read(self):
+        """Get the current clipboard text"""
+
+    @abstractmethod
+    def write(self, text):
+        """Replace the clipboard text"""
+
+class QtClipboardSource(ClipboardSource):
+    """Event-driven source built on QClipboard.dataChanged
+
+    On X11, Qt's xcb backend subscribes to XFixes selection-owner
+    notifications, and on Windows to clipboard format listener messages, so
+    changes arrive as events without polling. Must be used from the GUI thread.
+    """
+
+    def __init__(self, clipboard=None):
+        self.clipboard = clipboard or QApplication.clipboard()
+        self.on_change = None
+
+    def start(self, on_change):
+        """Start reporting clipboard changes"""
+        if self.on_change is None:
+            self.clipboard.dataChanged.connect(self._on_data_changed)
+        self.on_change = on_change
+
+    def stop(self):
+        """Stop reporting clipboard changes"""
+        if self.on_change is not None:
+            try:
+                self.clipboard.dataChanged.disconnect(self._on_data_changed)
+            except TypeError:
+                pass
+            self.on_change = None
+
+    def _on_data_changed(self):
+        """Forward the new clipboard text"""
+        if self.on_change:
+            self.on_change(self.clipboard.text())
+
+    def read(self):
+        """Get the current clipboard text"""
+        return self.clipboard.text()
+
+    def write(self, text):
+        """Replace the clipboard text"""
+        self.clipboard.setText(text)
+
+class PollingClipboardSource(ClipboardSource):
+    """Fallback source that polls pyperclip as a job on the shared scheduler"""
+
+    def __init__(self, interval=0.5, scheduler=None):
+        # Only imported when polling is needed; the Qt source does not use it
+        import pyperclip
+        self.pyperclip = pyperclip
+        self.interval = interval
+        self.on_change = None
+        self.scheduler = scheduler or shared_scheduler()
+        self.job = None
+        self.last_content = None
+
+    def start(self, on_change):
+        """Start polling"""
+        self.on_change = on_change
+        if self.job is None:
+            self.last_content = None
+            self.job = self.scheduler.schedule('clipboard_poll', self._poll, self.interval)
+
+    def stop(self):
+        """Stop polling"""
+        if self.job:
+            self.scheduler.cancel(self.job)
+            self.job = None
+
+    def _poll(self):
+        """Report the clipboard text if it differs from the last poll"""
+        try:
+            content = self.read()
+            if content != self.last_content:
+                self.last_content = content
+                self.on_change(content)
+        except Exception as e:
+            print(f"Error in clipboard monitoring loop: {e}")
+
+    def read(self):
+        """Get the current clipboard text, retrying on access errors"""
+        pyperclip = self.pyperclip
+        for _ in range(3):  # Retry up to 3 times
+            try:
+                return pyperclip.paste()
+            except pyperclip.PyperclipWindowsException as e:
+                print(f"Clipboard access error, retrying: {e}")
+                time.sleep(0.1)  # Wait a bit before retrying
+        raise pyperclip.PyperclipWindowsException("Failed to access clipboard after multiple retries.")
+
+    def write(self, text):
+        """Replace the clipboard text"""
+        self.pyperclip.copy(text)
+
+def create_clipboard_source():
+    """Create an event-driven source when the Qt platform supports it, else a poller"""
+    app = QApplication.instance()
+    if app is not None and app.platformName() not in POLLING_PLATFORMS:
+        return QtClipboardSource()
+    return PollingClipboardSource()
@@ -0,0 +1,184 @@
+import datetime
+import json
+import os
+import struct
+
+DEFAULT_LOG_PATH = os.path.join(os.path.expanduser("~"), ".nerdhud", "focus_sessions.log")
+KINDS = ('work', 'break', 'long_break')
+# Daily totals: work seconds, completed work sessions, break seconds, interruptions
+WORK_SECONDS, WORK_SESSIONS, BREAK_SECONDS, INTERRUPTIONS = range(4)
+# The summary is rewritten after this many new records, and on flush()
+SUMMARY_EVERY = 10
+
+class FocusHistory:
+    """On-disk log of focus timer intervals with per-day totals
+
+    Each interval is one fixed-size record: wall-clock start and end, the
+    seconds actually spent running, its type, whether it ran to the end,
+    and how often it was paused or stopped. Totals per local day are kept
+    up to date as intervals are recorded and saved now and then to a small
+    summary file along with how much of the log they cover and which log
+    that is, so startup reads the summary and at most the few records
+    written after it, never the whole log. Weekly totals and streaks are
+    derived from the daily ones.
+    """
+    MAGIC = b'NHFS\x01'
+    RECORD = struct.Struct('<ddfBBH')  # start, end, active seconds, kind, completed, interruptions
+
+    def __init__(self, path=DEFAULT_LOG_PATH):
+        self.path = path
+        self.summary_path = path + '.summary'
+        self.days = {}
+        self.covered = len(self.MAGIC)
+        # Last record counted, to recognise the log the summary was made from
+        self.last_record = b''
+        self.unsaved = 0
+        self._open()
+
+    def _open(self):
+        """Create the log if needed and bring the daily totals up to date"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if not os.path.exists(self.path):
+            with open(self.path, 'wb') as f:
+                f.write(self.MAGIC)
+        summary = self._load_summary()
+        if summary is not None and self._describes_log(summary):
+            self.days = summary['days']
+            self.covered = summary['covered']
+            self.last_record = bytes.fromhex(summary['last_record'])
+        if os.path.getsize(self.path) > self.covered:
+            self._scan()
+            self._save_summary()
+
+    def _load_summary(self):
+        """Read the saved summary, if any"""
+        try:
+            with open(self.summary_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error loading focus summary, rebuilding it: {e}")
+            return None
+
+    def _describes_log(self, summary):
+        """Check that a summary was made from the log on disk, not one it replaced"""
+        try:
+            covered = summary['covered']
+            last_record = bytes.fromhex(summary['last_record'])
+            if summary['inode'] != os.stat(self.path).st_ino:
+                return False
+            with open(self.path, 'rb') as f:
+                if f.read(len(self.MAGIC)) != self.MAGIC:
+                    return False
+                f.seek(covered - len(last_record))
+                return f.read(len(last_record)) == last_record
+        except Exception as e:
+            print(f"Error checking focus summary, rebuilding it: {e}")
+            return False
+
+    def _save_summary(self):
+        """Write the daily totals along with which log and how much of it they cover"""
+        temp_path = self.summary_path + '.tmp'
+        try:
+            summary = {
+                'inode': os.stat(self.path).st_ino,
+                'covered': self.covered,
+                'last_record': self.last_record.hex(),
+                'days': self.days,
+            }
+            with open(temp_path, 'w') as f:
+                json.dump(summary, f)
+            os.replace(temp_path, self.summary_path)
+            self.unsaved = 0
+        except Exception as e:
+            print(f"Error saving focus summary: {e}")
+
+    def flush(self):
+        """Write the summary if records were added since it was last saved"""
+        if self.unsaved:
+            self._save_summary()
+
+    def _scan(self):
+        """Add records the summary does not cover yet to the daily totals"""
+        with open(self.path, 'rb') as f:
+            if f.read(len(self.MAGIC)) != self.MAGIC:
+                print(f"Focus log {self.path} is unreadable, ignoring it")
+                return
+            f.seek(self.covered)
+            data = f.read()
+        usable = len(data) - len(data) % self.RECORD.size
+        for record in self.RECORD.iter_unpack(data[:usable]):
+            self._add_to_days(*record)
+        if usable:
+            self.last_record = data[usable - self.RECORD.size:usable]
+        self.covered += usable
+
+    def _add_to_days(self, start, end, active, kind, completed, interruptions):
+        """Count one interval in the totals of the day it started"""
+        day = datetime.date.fromtimestamp(start).isoformat()
+        totals = self.days.setdefault(day, [0.0, 0, 0.0, 0])
+        if KINDS[kind] == 'work':
+            totals[WORK_SECONDS] += active
+            if completed:
+                totals[WORK_SESSIONS] += 1
+        else:
+            totals[BREAK_SECONDS] += active
+        totals[INTERRUPTIONS] += interruptions
+
+    def record(self, kind, start, end, active, interruptions=0, completed=True):
+        """Log one interval; `start` and `end` are Unix times"""
+        record = (start, end, active, KINDS.index(kind), int(completed), interruptions)
+        packed = self.RECORD.pack(*record)
+        try:
+            with open(self.path, 'ab') as f:
+                if f.tell() != self.covered:
+                    # Drop a record torn by a crash mid-write
+                    f.truncate(self.covered)
+                f.write(packed)
+        except Exception as e:
+            print(f"Error recording focus session: {e}")
+            return
+        self.covered += self.RECORD.size
+        self.last_record = packed
+        self._add_to_days(*record)
+        # The log is the source of truth; a summary a few records behind only
+        # costs reading those records at the next startup
+        self.unsaved += 1
+        if self.unsaved >= SUMMARY_EVERY:
+            self._save_summary()
+
+    def day_totals(self, date=None):
+        """Get a day's totals as a dict; `date` defaults to today"""
+        date = date or datetime.date.today()
+        totals = self.days.get(date.isoformat(), [0.0, 0, 0.0, 0])
+        return {
+            'work_seconds': totals[WORK_SECONDS],
+            'work_sessions': totals[WORK_SESSIONS],
+            'break_seconds': totals[BREAK_SECONDS],
+            'interruptions': totals[INTERRUPTIONS],
+        }
+
+    def week_totals(self, date=None):
+        """Get the totals of the Monday-to-Sunday week containing `date`"""
+        date = date or datetime.date.today()
+        monday = date - datetime.timedelta(days=date.weekday())
+        week = {'work_seconds': 0.0, 'work_sessions': 0, 'break_seconds': 0.0, 'interruptions': 0}
+        for offset in range(7):
+            for key, value in self.day_totals(monday + datetime.timedelta(days=offset)).items():
+                week[key] += value
+        return week
+
+    def streak(self, date=None):
+        """Get the number of consecutive days up to `date` with a completed work session
+
+        A day with nothing yet does not break a streak that ran until the day before.
+        """
+        date = date or datetime.date.today()
+        if not self.day_totals(date)['work_sessions']:
+            date -= datetime.timedelta(days=1)
+        streak = 0
+        while self.day_totals(date)['work_sessions']:
+            streak += 1
+            date -= datetime.timedelta(days=1)
+        return streak
@@ -1,23 +1,68 @@
-import threading
+import math
 import time
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, QTimer, Qt, pyqtSignal
+
+def monotonic_clock():
+    """Get seconds from a clock that never jumps back and keeps counting through suspend"""
+    return time.clock_gettime(time.CLOCK_BOOTTIME)
+
+if not hasattr(time, 'CLOCK_BOOTTIME'):
+    # Elsewhere fall back to time.monotonic, which counts suspend on Windows
+    monotonic_clock = time.monotonic
+
+# Timers may fire a little early; this close to a second boundary counts as on it
+TICK_SLACK = 0.02
 
 class FocusTimer(QObject):
     time_updated = pyqtSignal(int) 
     timer_completed = pyqtSignal(str) 
     state_changed = pyqtSignal(str)  
-    def __init__(self):
+    # A finished or abandoned interval was written to the history
+    history_updated = pyqtSignal()
+    def __init__(self, clock=monotonic_clock, history=None, wall_clock=time.time):
         super().__init__()
+        # Injectable so tests can drive time by hand
+        self.clock = clock
+        self.wall_clock = wall_clock
+        # Optional FocusHistory every interval is recorded to
+        self.history = history
+        # The interval in progress: when it began, its length and how often it was paused or stopped
+        self.interval_start = None
+        self.interval_duration = 0.0
+        self.interruptions = 0
         self.running = False
         self.paused = False
-        self.timer_thread = None
-        self.remaining_seconds = 0
+        # Seconds left, exact to the clock; while running it is derived from the deadline
+        self.remaining = 0.0
+        self.deadline = None
         self.work_duration = 25 * 60 
         self.break_duration = 5 * 60  
         self.long_break_duration = 15 * 60 
         self.pomodoros_until_long_break = 4
         self.current_pomodoro_count = 0
         self.is_break = False
+        # Fires when the displayed second changes, so ticks never accumulate error
+        self.tick_timer = QTimer(self)
+        self.tick_timer.setSingleShot(True)
+        self.tick_timer.setTimerType(Qt.PreciseTimer)
+        self.tick_timer.timeout.connect(self.tick)
+    
+    @property
+    def remaining_seconds(self):
+        """Whole seconds left, rounded up as shown on the clock face"""
+        return max(math.ceil(self.get_remaining() - TICK_SLACK), 0)
+    
+    @remaining_seconds.setter
+    def remaining_seconds(self, seconds):
+        self.remaining = float(seconds)
+        if self.deadline is not None:
+            self.deadline = self.clock() + self.remaining
+    
+    def get_remaining(self):
+        """Get the exact seconds left"""
+        if self.deadline is not None:
+            return max(self.deadline - self.clock(), 0.0)
+        return self.remaining
         
     def start_timer(self, duration=None):
         """Start the timer with optional custom duration"""
@@ -25,18 +70,23 @@ class FocusTimer(QObject):
             self.running = True
             self.paused = False
             if duration is not None:
-                self.remaining_seconds = duration
-            elif self.remaining_seconds == 0:
-                self.remaining_seconds = self.work_duration
+                self.remaining = float(duration)
+            elif self.remaining <= 0:
+                self.remaining = float(self.work_duration)
                 
-            self.timer_thread = threading.Thread(target=self._timer_loop)
-            self.timer_thread.daemon = True
-            self.timer_thread.start()
+            if self.interval_start is None:
+                self._begin_interval()
+            self.deadline = self.clock() + self.remaining
+            self._schedule_tick()
             self.state_changed.emit("started")
             
     def pause_timer(self):
         """Pause the timer"""
         if self.running and not self.paused:
+            self.remaining = self.get_remaining()
+            self.deadline = None
+            self.tick_timer.stop()
+            self.interruptions += 1
             self.paused = True
             self.state_changed.emit("paused")
             
@@ -44,35 +94,80 @@ class FocusTimer(QObject):
         """Resume the timer"""
         if self.running and self.paused:
             self.paused = False
+            self.deadline = self.clock() + self.remaining
+            self._schedule_tick()
             self.state_changed.emit("resumed")
             
     def stop_timer(self):
         """Stop the timer"""
         if self.running:
+            self.remaining = self.get_remaining()
+            self.deadline = None
+            self.tick_timer.stop()
+            if self.interval_start is not None and not self.paused:
+                self.interruptions += 1
             self.running = False
             self.paused = False
-            if self.timer_thread:
-                self.timer_thread.join()
             self.state_changed.emit("stopped")
             
     def reset_timer(self):
         """Reset the timer to initial state"""
+        self._record_interval(completed=False)
         self.stop_timer()
         self.remaining_seconds = self.work_duration
         self.is_break = False
         self.current_pomodoro_count = 0
         self.time_updated.emit(self.remaining_seconds)
         
-    def _timer_loop(self):
-        """Main timer loop"""
-        while self.running:
-            if not self.paused:
-                if self.remaining_seconds > 0:
-                    self.remaining_seconds -= 1
-                    self.time_updated.emit(self.remaining_seconds)
-                else:
-                    self._handle_timer_completion()
-            time.sleep(1)
+    def _schedule_tick(self):
+        """Arm the tick timer for the moment the displayed second changes"""
+        remaining = self.get_remaining()
+        # Wait for the boundary below the second on display, so a wakeup
+        # just short of one does not show the same second again
+        shown = max(math.ceil(remaining - TICK_SLACK), 0)
+        until_boundary = remaining - max(shown - 1, 0)
+        self.tick_timer.start(math.ceil(until_boundary * 1000))
+    
+    def tick(self):
+        """Report the time left and roll over to the next period when it runs out"""
+        if not self.running or self.paused:
+            return
+        if self.get_remaining() <= 0:
+            self.time_updated.emit(0)
+            self._record_interval(completed=True)
+            self._handle_timer_completion()
+            self._begin_interval()
+            self.deadline = self.clock() + self.remaining
+        else:
+            self.time_updated.emit(self.remaining_seconds)
+        self._schedule_tick()
+            
+    def _current_kind(self):
+        """Get the type of the interval in progress"""
+        if not self.is_break:
+            return 'work'
+        if self.current_pomodoro_count % self.pomodoros_until_long_break == 0:
+            return 'long_break'
+        return 'break'
+        
+    def _begin_interval(self):
+        """Note the start of a new interval for the history"""
+        self.interval_start = self.wall_clock()
+        self.interval_duration = self.remaining
+        self.interruptions = 0
+        
+    def _record_interval(self, completed):
+        """Write the interval in progress to the history and close it"""
+        if self.interval_start is None:
+            return
+        active = max(self.interval_duration - self.get_remaining(), 0.0)
+        if self.history is not None:
+            self.history.record(self._current_kind(), self.interval_start, self.wall_clock(),
+                                active, self.interruptions, completed)
+        self.interval_start = None
+        self.interruptions = 0
+        if self.history is not None:
+            self.history_updated.emit()
             
     def _handle_timer_completion(self):
         """Handle timer completion and switch between work/break periods"""
@@ -83,16 +178,16 @@ class FocusTimer(QObject):
             
             if self.current_pomodoro_count % self.pomodoros_until_long_break == 0:
                 # Long break
-                self.remaining_seconds = self.long_break_duration
+                self.remaining = float(self.long_break_duration)
                 self.timer_completed.emit("long_break")
             else:
                 # Regular break
-                self.remaining_seconds = self.break_duration
+                self.remaining = float(self.break_duration)
                 self.timer_completed.emit("break")
         else:
             # Break completed
             self.is_break = False
-            self.remaining_seconds = self.work_duration
+            self.remaining = float(self.work_duration)
             self.timer_completed.emit("work")
             
     def set_work_duration(self, minutes):
@@ -115,8 +210,9 @@ class FocusTimer(QObject):
         
     def get_time_string(self):
         """Get formatted time string (MM:SS)"""
-        minutes = self.remaining_seconds // 60
-        seconds = self.remaining_seconds % 60
+        remaining_seconds = self.remaining_seconds
+        minutes = remaining_seconds // 60
+        seconds = remaining_seconds % 60
         return f"{minutes:02d}:{seconds:02d}"
         
     def get_progress(self):
@@ -125,4 +221,4 @@ class FocusTimer(QObject):
             total = self.long_break_duration if self.current_pomodoro_count % self.pomodoros_until_long_break == 0 else self.break_duration
         else:
             total = self.work_duration
-        return ((total - self.remaining_seconds) / total) * 100 
\ No newline at end of file
+        return ((total - self.get_remaining()) / total) * 100
@@ -0,0 +1,191 @@
+import json
+import math
+import os
+import re
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from core.private_files import PRIVATE_DIR_MODE, open_private
+
+API_URL = 'https://api.github.com'
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".nerdhud", "github_cache.json")
+# Responses kept for revalidation; least recently used ones are dropped first
+MAX_CACHE_ENTRIES = 200
+# Pages followed for one list, at up to 100 items each
+MAX_PAGES = 10
+# Share of each resource's rate limit left alone by polling, for refreshes the
+# user asks for: 50 of core's 5000 an hour, 1 of search's 30 a minute
+RATE_LIMIT_RESERVE = 0.01
+NEXT_LINK = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+class GitHubClient:
+    """Read-only GitHub REST client that revalidates instead of refetching
+
+    Every response with an ETag or Last-Modified header is cached along
+    with its body and saved to disk, so polls send If-None-Match /
+    If-Modified-Since even across restarts. A 304 Not Modified reply does
+    not count against the rate limit and the cached body is returned.
+    The X-RateLimit-* headers of each response are kept per resource
+    (core, search) so the caller can spread its polls over what is left.
+    """
+
+    def __init__(self, token, cache_path=DEFAULT_CACHE_PATH, api_url=API_URL, timeout=10):
+        self.token = token
+        self.api_url = api_url.rstrip('/')
+        self.timeout = timeout
+        self.cache_path = cache_path
+        self.cache = self._load_cache()
+        self.dirty = False
+        # resource -> (remaining, limit, reset as Unix time)
+        self.rate_limits = {}
+        # Requests that counted against each resource's limit since begin_poll()
+        self.poll_charged = {}
+        self.requests = 0
+        self.not_modified = 0
+
+    def _load_cache(self):
+        """Read the saved responses, if any"""
+        try:
+            with open(self.cache_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error loading GitHub cache, starting empty: {e}")
+            return {}
+
+    def save(self):
+        """Write the cached responses if they changed"""
+        if not self.dirty:
+            return
+        temp_path = self.cache_path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), mode=PRIVATE_DIR_MODE, exist_ok=True)
+            # Responses include private repositories and issues
+            with open_private(temp_path, truncate=True) as f:
+                f.write(json.dumps(self.cache).encode('utf-8'))
+            os.replace(temp_path, self.cache_path)
+            self.dirty = False
+        except Exception as e:
+            print(f"Error saving GitHub cache: {e}")
+
+    def url(self, path, params=None):
+        """Get the full URL for an API path"""
+        url = path if path.startswith('http') else self.api_url + path
+        if params:
+            url += '?' + urllib.parse.urlencode(params)
+        return url
+
+    def get(self, path, params=None):
+        """GET a JSON resource, revalidating any cached copy
+
+        Returns the body and the URL of the next page, or None.
+        """
+        url = self.url(path, params)
+        # Left in the cache until a response replaces it, so a failed request keeps it
+        cached = self.cache.get(url)
+        headers = {
+            'Accept': 'application/vnd.github+json',
+            'Authorization': f'token {self.token}',
+            'User-Agent': 'NerdHUD',
+        }
+        if cached is not None:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        self.requests += 1
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers),
+                                        timeout=self.timeout) as response:
+                self._read_rate_limit(response.headers, charged=True)
+                body = json.loads(response.read().decode('utf-8'))
+                entry = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'next': self._next_link(response.headers.get('Link')),
+                    'body': body,
+                }
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cached is not None:
+                self._read_rate_limit(e.headers, charged=False)
+                self.not_modified += 1
+                self._remember(url, cached)
+                return cached['body'], cached['next']
+            self._read_rate_limit(e.headers, charged=True)
+            raise
+        if entry['etag'] or entry['last_modified']:
+            self._remember(url, entry)
+            self.dirty = True
+        elif self.cache.pop(url, None) is not None:
+            self.dirty = True
+        return entry['body'], entry['next']
+
+    def get_pages(self, path, params=None, max_pages=MAX_PAGES):
+        """GET a list resource page by page, following Link headers; yields each page's body"""
+        url = self.url(path, params)
+        for _ in range(max_pages):
+            body, url = self.get(url)
+            yield body
+            if url is None:
+                return
+
+    def _remember(self, url, entry):
+        """Cache a response as the most recently used one"""
+        self.cache.pop(url, None)
+        self.cache[url] = entry
+        while len(self.cache) > MAX_CACHE_ENTRIES:
+            del self.cache[next(iter(self.cache))]
+            self.dirty = True
+
+    def _next_link(self, link):
+        """Get the rel="next" URL of a Link header"""
+        match = NEXT_LINK.search(link or '')
+        return match.group(1) if match else None
+
+    def _read_rate_limit(self, headers, charged):
+        """Record a response's X-RateLimit-* headers"""
+        if headers is None or headers.get('X-RateLimit-Remaining') is None:
+            return
+        resource = headers.get('X-RateLimit-Resource', 'core')
+        try:
+            self.rate_limits[resource] = (int(headers['X-RateLimit-Remaining']),
+                                          int(headers.get('X-RateLimit-Limit', 0)),
+                                          float(headers.get('X-RateLimit-Reset', 0)))
+        except ValueError:
+            return
+        if charged:
+            self.poll_charged[resource] = self.poll_charged.get(resource, 0) + 1
+
+    def begin_poll(self):
+        """Start counting the requests one poll spends"""
+        self.poll_charged = {}
+
+    def next_delay(self, interval, now=None):
+        """Get the seconds until the next poll: `interval`, or longer if the rate limit is running low
+
+        The requests the last poll spent per resource are spread over what
+        that resource has left, minus a reserve in proportion to its limit,
+        until its window resets.
+        """
+        now = now or time.time()
+        delay = interval
+        for resource, (remaining, limit, reset) in self.rate_limits.items():
+            until_reset = max(reset - now, 0.0)
+            cost = max(self.poll_charged.get(resource, 0), 1)
+            spare = remaining - math.ceil(limit * RATE_LIMIT_RESERVE)
+            if spare < cost:
+                delay = max(delay, until_reset)
+            else:
+                delay = max(delay, until_reset * cost / spare)
+        return delay
+
+    def get_stats(self):
+        """Get request counts and the rate limits last seen"""
+        return {
+            'requests': self.requests,
+            'not_modified': self.not_modified,
+            'cached_responses': len(self.cache),
+            'rate_limits': dict(self.rate_limits),
+        }
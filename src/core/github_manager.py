@@ -1,7 +1,14 @@
-from github import Github
 from PyQt5.QtCore import QObject, pyqtSignal
-import threading
+from datetime import datetime
+from urllib.parse import quote
 import time
+from core.github_client import GitHubClient
+from core.watchers import WatcherSet
+from core.scheduler import shared_scheduler
+
+def parse_time(value):
+    """Turn an API timestamp like 2024-01-31T12:00:00Z into a datetime"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')) if value else None
 
 class GitHubManager(QObject):
     activity_updated = pyqtSignal(list) 
@@ -12,52 +19,116 @@ class GitHubManager(QObject):
     def __init__(self, settings):
         super().__init__()
         self.settings = settings
+        # Polling reads go through the conditional-request client; PyGithub
+        # is only loaded for the write calls
+        self.client = None
         self.github = None
         self.user = None
         self.running = False
-        self.update_thread = None
+        # Set when the token or username changes; the job signs in again on its thread
+        self.reconnect = False
         self.update_interval = 300  # 5 minutes
-        
-        self.init_github()
+        self.last_update = None
+        # Refreshing runs as a job on the shared scheduler
+        self.scheduler = shared_scheduler()
+        self.job = None
+        # Polling pauses while no GitHub widget is visible
+        self.watchers = WatcherSet(self._on_watched_changed)
         
     def init_github(self):
         """Initialize GitHub connection"""
         token = self.settings.get('github_token')
         username = self.settings.get('github_username')
+        # Write calls sign in again with the current token
+        self.github = None
         if token and username:
             try:
-                self.github = Github(token)
-                self.user = self.github.get_user(username)
+                self.client = GitHubClient(token)
+                self.user = self._get_user(username)
                 return True
             except Exception as e:
                 print(f"Failed to initialize GitHub: {e}")
+                self.client = None
+                self.user = None
         return False
+
+    def _get_user(self, username):
+        """Fetch a user's profile (a 304 when it has not changed)"""
+        user, _ = self.client.get(f"/users/{quote(username)}")
+        return user
         
     def start_monitoring(self):
-        """Start monitoring GitHub activity"""
-        if not self.running and self.github and self.user:
+        """Start monitoring GitHub activity; connecting happens on a scheduler thread"""
+        if not self.running:
             self.running = True
-            self.update_thread = threading.Thread(target=self._monitor_loop)
-            self.update_thread.daemon = True
-            self.update_thread.start()
+            self.job = self.scheduler.schedule('github', self._refresh)
             
     def stop_monitoring(self):
-        """Stop monitoring GitHub activity"""
+        """Stop monitoring GitHub activity; a refresh in progress is not waited for"""
         self.running = False
-        if self.update_thread:
-            self.update_thread.join()
+        if self.job:
+            self.scheduler.cancel(self.job)
+            self.job = None
             
-    def _monitor_loop(self):
-        """Main monitoring loop"""
-        while self.running:
+    def set_watched(self, watcher, watching):
+        """Tell the manager whether a widget showing GitHub data is visible"""
+        self.watchers.set_watched(watcher, watching)
+        
+    def request_refresh(self):
+        """Refresh on the scheduler thread now instead of waiting for the next poll"""
+        self.last_update = None
+        job = self.job
+        if job:
+            self.scheduler.wake(job)
+
+    def _on_watched_changed(self, watched):
+        """Wake the job so it refreshes stale data or goes back to sleep"""
+        job = self.job
+        if job:
+            self.scheduler.wake(job)
+        
+    def _refresh(self):
+        """Refresh stale data, then get the seconds until the next refresh (None: until woken)"""
+        if self.reconnect:
+            self.reconnect = False
+            self.client = None
+            self.user = None
+            self.last_update = None
+        # get_user is a network round trip, so it stays off the GUI thread
+        if not (self.client and self.user) and not self.init_github():
+            # Sleep until new credentials (or a widget being shown) wake the job
+            return None
+        # Read once: request_refresh() may clear it from another thread meanwhile
+        last_update = self.last_update
+        if self.watchers and self._is_stale(last_update):
+            self.client.begin_poll()
             try:
-                self.update_activity()
-                self.update_issues()
+                # Feeds nothing is connected to are not fetched
+                if self.receivers(self.activity_updated):
+                    self.update_activity()
+                if self.receivers(self.issues_updated):
+                    self.update_issues()
                 self.update_prs()
                 self.update_repos()  # Add repository updates
             except Exception as e:
                 print(f"Error updating GitHub data: {e}")
-            time.sleep(self.update_interval)
+            last_update = self.last_update = time.monotonic()
+            self.client.save()
+        
+        if self.watchers:
+            if last_update is None:
+                # A widget was shown since the check above; refresh right away
+                return 0.0
+            # Polls stretch out when the rate limit would not last until it resets
+            interval = self.client.next_delay(self.update_interval)
+            return max(0, last_update + interval - time.monotonic())
+        # Nothing on screen: sleep until a widget is shown
+        return None
+            
+    def _is_stale(self, last_update):
+        """Check whether a refresh at `last_update` is older than the update interval"""
+        return (last_update is None
+                or time.monotonic() - last_update >= self.update_interval)
             
     def update_activity(self):
         """Update activity feed"""
@@ -65,14 +136,15 @@ class GitHubManager(QObject):
             return
             
         try:
-            events = self.user.get_events()
+            events, _ = self.client.get(f"/users/{quote(self.user['login'])}/events",
+                                        {'per_page': 10})
             activity = []
             for event in events[:10]: 
                 activity.append({
-                    'type': event.type,
-                    'repo': event.repo.name if event.repo else 'Unknown',
-                    'created_at': event.created_at,
-                    'payload': event.payload
+                    'type': event['type'],
+                    'repo': event['repo']['name'] if event.get('repo') else 'Unknown',
+                    'created_at': parse_time(event['created_at']),
+                    'payload': event['payload']
                 })
             self.activity_updated.emit(activity)
         except Exception as e:
@@ -84,17 +156,17 @@ class GitHubManager(QObject):
             return
             
         try:
-            issues = self.user.get_issues(state='open')
             issue_list = []
-            for issue in issues:
-                issue_list.append({
-                    'number': issue.number,
-                    'title': issue.title,
-                    'repo': issue.repository.name,
-                    'created_at': issue.created_at,
-                    'labels': [label.name for label in issue.labels],
-                    'comments': issue.comments
-                })
+            for page in self.client.get_pages('/issues', {'state': 'open', 'per_page': 100}):
+                for issue in page:
+                    issue_list.append({
+                        'number': issue['number'],
+                        'title': issue['title'],
+                        'repo': issue['repository']['name'] if issue.get('repository') else 'Unknown',
+                        'created_at': parse_time(issue['created_at']),
+                        'labels': [label['name'] for label in issue['labels']],
+                        'comments': issue['comments']
+                    })
             self.issues_updated.emit(issue_list)
         except Exception as e:
             print(f"Error updating issues: {e}")
@@ -106,24 +178,23 @@ class GitHubManager(QObject):
             
         try:
             # Use search issues endpoint to find PRs with proper query format
-            query = f"is:pr author:{self.user.login}"
-            print(f"Searching PRs with query: {query}")
-            prs = self.github.search_issues(query=query)
+            query = f"is:pr author:{self.user['login']}"
             
             # Convert to list of PR objects
             pr_list = []
-            for pr in prs:
-                if pr.pull_request:  # Ensure it's a PR
-                    pr_list.append({
-                        'number': pr.number,
-                        'title': pr.title,
-                        'repo': pr.repository.name,
-                        'created_at': pr.created_at,
-                        'state': pr.state,
-                        'updated_at': pr.updated_at
-                    })
+            for page in self.client.get_pages('/search/issues', {'q': query, 'per_page': 100}):
+                for pr in page['items']:
+                    if 'pull_request' in pr:  # Ensure it's a PR
+                        pr_list.append({
+                            'number': pr['number'],
+                            'title': pr['title'],
+                            # Named from the URL rather than fetching each repository
+                            'repo': pr['repository_url'].rsplit('/', 1)[-1],
+                            'created_at': parse_time(pr['created_at']),
+                            'state': pr['state'],
+                            'updated_at': parse_time(pr['updated_at'])
+                        })
             
-            print(f"Found {len(pr_list)} PRs")
             self.prs_updated.emit(pr_list)
         except Exception as e:
             print(f"Error updating PRs: {e}")
@@ -134,19 +205,26 @@ class GitHubManager(QObject):
             return
             
         try:
-            repos = self.user.get_repos()
-            repo_count = sum(1 for _ in repos)  # Count total repositories
-            self.repos_updated.emit(repo_count)
+            # The profile carries the count, so the repository list is not paged through
+            self.user = self._get_user(self.user['login'])
+            self.repos_updated.emit(self.user['public_repos'])
         except Exception as e:
             print(f"Error updating repos: {e}")
             
+    def _write_user(self):
+        """Get the PyGithub user for write calls"""
+        if self.github is None:
+            from github import Github
+            self.github = Github(self.settings.get('github_token'))
+        return self.github.get_user()
+            
     def create_issue(self, title, body, labels=None):
         """Create a new issue"""
         if not self.user:
             return None
             
         try:
-            return self.user.create_issue(
+            return self._write_user().create_issue(
                 title=title,
                 body=body,
                 labels=labels or []
@@ -161,7 +239,7 @@ class GitHubManager(QObject):
             return None
             
         try:
-            return self.user.create_pull(
+            return self._write_user().create_pull(
                 title=title,
                 body=body,
                 base=base,
@@ -174,12 +252,24 @@ class GitHubManager(QObject):
     def set_token(self, token):
         """Set GitHub access token"""
         self.settings.set('github_token', token)
-        return self.init_github()
+        return self._credentials_changed()
         
     def set_username(self, username):
         """Set GitHub username"""
         self.settings.set('github_username', username)
-        return self.init_github()
+        return self._credentials_changed()
+        
+    def _credentials_changed(self):
+        """Sign in with the new settings; get whether that worked, or None if the job will do it
+        
+        While monitoring, the job signs in on its scheduler thread and refreshes.
+        """
+        job = self.job
+        if job is None:
+            return self.init_github()
+        self.reconnect = True
+        self.scheduler.wake(job)
+        return None
         
     def set_update_interval(self, interval):
         """Set update interval in seconds"""
@@ -196,13 +286,13 @@ class GitHubManager(QObject):
             
         try:
             print(f"Attempting to authenticate with GitHub as {username}")
-            self.github = Github(token)
+            self.client = GitHubClient(token)
             # Verify token by getting user info
-            self.user = self.github.get_user()
-            print(f"Successfully authenticated as {self.user.login}")
+            self.user, _ = self.client.get('/user')
+            print(f"Successfully authenticated as {self.user['login']}")
             return True
         except Exception as e:
             print(f"GitHub authentication error: {e}")
-            self.github = None
+            self.client = None
             self.user = None
             return False  
\ No newline at end of file
@@ -0,0 +1,239 @@
+import shutil
+import subprocess
+import threading
+import time
+from core.stats_snapshot import GpuStats
+
+# An nvidia-smi child that exits is restarted after this many seconds,
+# doubling on each exit in a row up to the maximum
+RESTART_DELAY = 1.0
+MAX_RESTART_DELAY = 60.0
+
+class NvmlGpuProbe:
+    """Reads GPU stats in-process through the NVML bindings"""
+
+    def __init__(self):
+        import pynvml
+        self.nvml = pynvml
+        pynvml.nvmlInit()
+        self.initialized = True
+        self.handles = []
+        self.static = []
+        for index in range(pynvml.nvmlDeviceGetCount()):
+            handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+            name = pynvml.nvmlDeviceGetName(handle)
+            if isinstance(name, bytes):
+                name = name.decode()
+            total = pynvml.nvmlDeviceGetMemoryInfo(handle).total / (1024 * 1024)
+            self.handles.append(handle)
+            # Name and total memory never change, so look them up once
+            self.static.append((index, name, total))
+
+    def device_count(self):
+        """Get the number of GPUs found"""
+        return len(self.handles)
+
+    def start(self):
+        """Re-initialise NVML if the probe was closed"""
+        if not self.initialized:
+            self.nvml.nvmlInit()
+            self.initialized = True
+            self.handles = [self.nvml.nvmlDeviceGetHandleByIndex(index)
+                            for index, _, _ in self.static]
+
+    def read(self):
+        """Get current stats for every GPU"""
+        nvml = self.nvml
+        gpus = []
+        for handle, (index, name, total) in zip(self.handles, self.static):
+            # Each reading is optional: many GPUs do not report all of them
+            load = self._query(nvml.nvmlDeviceGetUtilizationRates, handle)
+            memory = self._query(nvml.nvmlDeviceGetMemoryInfo, handle)
+            temperature = self._query(nvml.nvmlDeviceGetTemperature, handle,
+                                      nvml.NVML_TEMPERATURE_GPU)
+            gpus.append(GpuStats(
+                index,
+                name,
+                float(load.gpu) if load is not None else None,
+                total,
+                memory.used / (1024 * 1024) if memory is not None else None,
+                memory.free / (1024 * 1024) if memory is not None else None,
+                temperature
+            ))
+        return gpus or None
+
+    def _query(self, function, *args):
+        """Call an NVML query, or get None if the GPU does not support it"""
+        try:
+            return function(*args)
+        except self.nvml.NVMLError:
+            return None
+
+    def close(self):
+        """Shut down NVML"""
+        if not self.initialized:
+            return
+        self.initialized = False
+        try:
+            self.nvml.nvmlShutdown()
+        except Exception:
+            pass
+
+class NvidiaSmiGpuProbe:
+    """Streams GPU stats from one long-lived `nvidia-smi` child process
+
+    If the child exits (a driver reset, a crash, being killed) its stats
+    are dropped rather than shown stale, and read() restarts it with
+    backoff.
+    """
+    STATIC_QUERY = 'index,name,memory.total'
+    DYNAMIC_QUERY = 'index,utilization.gpu,memory.used,memory.free,temperature.gpu'
+
+    def __init__(self, command='nvidia-smi', interval_ms=1000, restart_delay=RESTART_DELAY):
+        self.command = command
+        self.interval_ms = interval_ms
+        self.restart_delay = restart_delay
+        self.process = None
+        self.reader_thread = None
+        self.lock = threading.Lock()
+        self.latest = {}
+        # Exits in a row without a line read, and when the next restart may happen
+        self.exits = 0
+        self.restart_at = 0.0
+        self.static = self._query_static()
+
+    def _query_static(self):
+        """Look up GPU names and total memory once"""
+        output = subprocess.run(
+            [self.command, f'--query-gpu={self.STATIC_QUERY}',
+             '--format=csv,noheader,nounits'],
+            capture_output=True, text=True, timeout=10, check=True
+        ).stdout
+        static = {}
+        for line in output.splitlines():
+            fields = [field.strip() for field in line.split(',')]
+            if len(fields) != 3:
+                continue
+            try:
+                static[int(fields[0])] = (fields[1], float(fields[2]))
+            except ValueError:
+                continue
+        return static
+
+    def device_count(self):
+        """Get the number of GPUs found"""
+        return len(self.static)
+
+    def start(self):
+        """Start the looping child process and its reader thread"""
+        if self.process and self.process.poll() is None:
+            return
+        self.process = subprocess.Popen(
+            [self.command, f'--query-gpu={self.DYNAMIC_QUERY}',
+             '--format=csv,noheader,nounits', f'--loop-ms={self.interval_ms}'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1
+        )
+        self.reader_thread = threading.Thread(target=self._read_loop, args=(self.process,))
+        self.reader_thread.daemon = True
+        self.reader_thread.start()
+
+    def _read_loop(self, process):
+        """Parse stat lines as nvidia-smi prints them, until it exits or is replaced"""
+        for line in process.stdout:
+            parsed = self._parse_line(line)
+            if parsed:
+                with self.lock:
+                    # Lines still buffered from a closed or replaced child are dropped
+                    if process is not self.process:
+                        break
+                    self.latest[parsed[0]] = parsed
+                    self.exits = 0
+        with self.lock:
+            if process is self.process:
+                self.latest.clear()
+
+    def _parse_line(self, line):
+        """Parse one dynamic query line into (index, load, used, free, temperature)
+
+        nvidia-smi prints "[N/A]" for fields a GPU does not support; those
+        come back as None and the GPU is kept.
+        """
+        fields = line.split(',')
+        if len(fields) != 5:
+            return None
+        try:
+            index = int(fields[0])
+        except ValueError:
+            return None
+        return (index,) + tuple(self._parse_value(field) for field in fields[1:])
+
+    def _parse_value(self, field):
+        """Parse one numeric field, or get None if it is not a number"""
+        try:
+            return float(field)
+        except ValueError:
+            return None
+
+    def read(self):
+        """Get the most recent stats for every GPU, or None while nvidia-smi is not running"""
+        process = self.process
+        if process is not None and process.poll() is not None:
+            self._restart()
+        with self.lock:
+            latest = list(self.latest.values())
+        gpus = []
+        for index, load, used, free, temperature in sorted(latest, key=lambda stats: stats[0]):
+            default_total = used + free if used is not None and free is not None else None
+            name, total = self.static.get(index, ('GPU %d' % index, default_total))
+            gpus.append(GpuStats(index, name, load, total, used, free, temperature))
+        return gpus or None
+
+    def _restart(self):
+        """Start nvidia-smi again once the backoff since it exited has passed"""
+        now = time.monotonic()
+        if not self.restart_at:
+            with self.lock:
+                self.latest.clear()
+            self.exits += 1
+            delay = min(self.restart_delay * 2 ** min(self.exits - 1, 30), MAX_RESTART_DELAY)
+            self.restart_at = now + delay
+            print(f"nvidia-smi exited with code {self.process.returncode}, restarting in {delay:.0f} s")
+        if now < self.restart_at:
+            return
+        self.restart_at = 0.0
+        try:
+            self.start()
+        except Exception as e:
+            print(f"Failed to restart nvidia-smi: {e}")
+
+    def close(self):
+        """Stop the child process"""
+        process = self.process
+        with self.lock:
+            self.process = None
+            self.latest.clear()
+        if process and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+def create_gpu_probe(smi_command='nvidia-smi'):
+    """Create the cheapest available GPU probe, or None if there are no GPUs"""
+    try:
+        probe = NvmlGpuProbe()
+        if probe.device_count():
+            return probe
+        probe.close()
+    except Exception:
+        pass
+
+    if shutil.which(smi_command):
+        try:
+            probe = NvidiaSmiGpuProbe(smi_command)
+            if probe.device_count():
+                return probe
+        except Exception as e:
+            print(f"Failed to start nvidia-smi GPU probe: {e}")
+    return None
@@ -0,0 +1,248 @@
+import os
+import re
+
+COUNTER_32_MAX = 2 ** 32
+# A 32-bit counter that drops from at least this value is taken to have wrapped
+WRAP_FROM = COUNTER_32_MAX * 3 // 4
+PARTITION_SUFFIX = re.compile(r'p?\d+$')
+SYS_BLOCK = '/sys/block'
+SYS_CLASS_NET = '/sys/class/net'
+# Used where /sys is not available: devices whose I/O is already counted
+# on a physical disk (device-mapper, md RAID, loop files) or is not disk I/O (zram, ramdisks)
+STACKED_DISK_PREFIXES = ('dm-', 'md', 'loop', 'zram', 'ram')
+# Loopback, container, VM, bridge and VPN interfaces, by name
+VIRTUAL_NIC_PREFIXES = ('lo', 'docker', 'veth', 'br-', 'bridge', 'virbr', 'vnet', 'tun', 'tap',
+                        'utun', 'wg', 'zt', 'vmnet', 'vboxnet', 'cni', 'flannel', 'cali',
+                        'awdl', 'llw', 'vethernet', 'virtualbox', 'vmware')
+
+# Disk, network and process collection only start in a tick if the core
+# metrics took less than this (seconds); otherwise they are retried shortly
+# after. A collection that has started is not cut short.
+DEFER_AFTER = 0.02
+
+def counter_delta(previous, current):
+    """Get the increase of a monotonically increasing counter
+
+    Some platforms still report 32-bit counters that wrap around. A drop
+    from the top quarter of the 32-bit range to a value low in it is
+    treated as a wrap; any other drop means the counter was reset (e.g. a
+    device was re-attached) and the new value is the whole delta.
+    """
+    if current >= previous:
+        return current - previous
+    if WRAP_FROM <= previous < COUNTER_32_MAX and current < COUNTER_32_MAX - WRAP_FROM:
+        return current + COUNTER_32_MAX - previous
+    return current
+
+def find_partitions(names):
+    """Get the device names that are partitions of another listed disk
+
+    psutil reports both whole disks and their partitions (sda and sda1,
+    nvme0n1 and nvme0n1p1), so partitions must be left out of totals.
+    """
+    names = set(names)
+    partitions = set()
+    for name in names:
+        for disk in names:
+            if disk == name or not name.startswith(disk):
+                continue
+            suffix = name[len(disk):]
+            # loop10 is not a partition of loop1: disks whose names end in a
+            # digit (nvme0n1, mmcblk0) separate partitions with a 'p'
+            if PARTITION_SUFFIX.match(suffix) and (suffix[0] == 'p' or not disk[-1].isdigit()):
+                partitions.add(name)
+                break
+    return partitions
+
+def find_stacked_disks(names, sys_block=SYS_BLOCK):
+    """Get the device names whose I/O is also counted on another listed device
+
+    LVM and LUKS (dm-*) and md RAID volumes sit on top of physical disks,
+    which see the same reads and writes. On Linux a device with entries
+    in /sys/block/<name>/slaves is stacked; elsewhere names decide.
+    """
+    stacked = set()
+    for name in names:
+        slaves = os.path.join(sys_block, name, 'slaves')
+        try:
+            if os.listdir(slaves):
+                stacked.add(name)
+                continue
+        except OSError:
+            pass
+        if name.startswith(STACKED_DISK_PREFIXES):
+            stacked.add(name)
+    return stacked
+
+def find_virtual_interfaces(names, sys_class_net=SYS_CLASS_NET):
+    """Get the interface names that are loopback or virtual
+
+    Loopback traffic never leaves the machine, and container, VM and VPN
+    traffic is counted again on the physical interface it goes out on. On
+    Linux virtual interfaces live under /sys/devices/virtual; elsewhere
+    names decide.
+    """
+    virtual = set()
+    for name in names:
+        path = os.path.join(sys_class_net, name)
+        if os.path.islink(path):
+            if '/virtual/' in os.path.realpath(path):
+                virtual.add(name)
+        elif name.lower().startswith(VIRTUAL_NIC_PREFIXES):
+            virtual.add(name)
+    return virtual
+
+class DiskRate:
+    """Throughput of one disk over the last sample period"""
+    __slots__ = ('name', 'read_bytes', 'write_bytes', 'read_iops', 'write_iops')
+
+    def __init__(self, name, read_bytes, write_bytes, read_iops, write_iops):
+        self.name = name
+        self.read_bytes = read_bytes
+        self.write_bytes = write_bytes
+        self.read_iops = read_iops
+        self.write_iops = write_iops
+
+    def to_dict(self):
+        """Convert to a plain dict"""
+        return {
+            'read_bytes': self.read_bytes,
+            'write_bytes': self.write_bytes,
+            'read_iops': self.read_iops,
+            'write_iops': self.write_iops
+        }
+
+class NetRate:
+    """Throughput of one network interface over the last sample period"""
+    __slots__ = ('name', 'rx_bytes', 'tx_bytes')
+
+    def __init__(self, name, rx_bytes, tx_bytes):
+        self.name = name
+        self.rx_bytes = rx_bytes
+        self.tx_bytes = tx_bytes
+
+    def to_dict(self):
+        """Convert to a plain dict"""
+        return {'rx_bytes': self.rx_bytes, 'tx_bytes': self.tx_bytes}
+
+class IoRates:
+    """Per-device rates plus totals for one collector sample (bytes/s, ops/s)"""
+    __slots__ = ('devices', 'totals')
+
+    def __init__(self, devices, totals):
+        self.devices = devices
+        self.totals = totals
+
+    def to_dict(self):
+        """Convert to a plain dict"""
+        return {
+            'devices': {device.name: device.to_dict() for device in self.devices},
+            'totals': dict(self.totals)
+        }
+
+class DiskIoCollector:
+    """Computes per-disk read/write rates from disk I/O counter deltas"""
+
+    def __init__(self, read_counters=None, sys_block=SYS_BLOCK):
+        if read_counters is None:
+            import psutil
+            read_counters = lambda: psutil.disk_io_counters(perdisk=True)
+        self.read_counters = read_counters
+        self.sys_block = sys_block
+        self.previous = {}
+        self.previous_time = None
+        # Partitions and stacked devices, left out of the totals
+        self.excluded = set()
+
+    def sample(self, now):
+        """Get rates since the previous sample, or None on the first call"""
+        counters = self.read_counters() or {}
+        previous, previous_time = self.previous, self.previous_time
+        if counters.keys() != previous.keys():
+            self.excluded = find_partitions(counters) | find_stacked_disks(counters, self.sys_block)
+        # Keep only the four fields used so the stored state stays small
+        self.previous = {
+            name: (c.read_bytes, c.write_bytes, c.read_count, c.write_count)
+            for name, c in counters.items()
+        }
+        self.previous_time = now
+        if previous_time is None or now <= previous_time:
+            return None
+
+        elapsed = now - previous_time
+        devices = []
+        total_read = total_write = total_read_ops = total_write_ops = 0.0
+        for name, current in self.previous.items():
+            old = previous.get(name)
+            if old is None:
+                continue
+            read = counter_delta(old[0], current[0]) / elapsed
+            write = counter_delta(old[1], current[1]) / elapsed
+            read_ops = counter_delta(old[2], current[2]) / elapsed
+            write_ops = counter_delta(old[3], current[3]) / elapsed
+            devices.append(DiskRate(name, read, write, read_ops, write_ops))
+            if name in self.excluded:
+                continue
+            total_read += read
+            total_write += write
+            total_read_ops += read_ops
+            total_write_ops += write_ops
+        return IoRates(devices, {
+            'read_bytes': total_read,
+            'write_bytes': total_write,
+            'read_iops': total_read_ops,
+            'write_iops': total_write_ops
+        })
+
+class NetIoCollector:
+    """Computes per-interface receive/transmit rates from network counter deltas"""
+
+    def __init__(self, read_counters=None, sys_class_net=SYS_CLASS_NET):
+        if read_counters is None:
+            import psutil
+            read_counters = lambda: psutil.net_io_counters(pernic=True)
+        self.read_counters = read_counters
+        self.sys_class_net = sys_class_net
+        self.previous = {}
+        self.previous_time = None
+        # Loopback and virtual interfaces, left out of the totals
+        self.excluded = set()
+
+    def sample(self, now):
+        """Get rates since the previous sample, or None on the first call"""
+        counters = self.read_counters() or {}
+        previous, previous_time = self.previous, self.previous_time
+        if counters.keys() != previous.keys():
+            self.excluded = find_virtual_interfaces(counters, self.sys_class_net)
+        self.previous = {
+            name: (c.bytes_recv, c.bytes_sent) for name, c in counters.items()
+        }
+        self.previous_time = now
+        if previous_time is None or now <= previous_time:
+            return None
+
+        elapsed = now - previous_time
+        devices = []
+        total_rx = total_tx = 0.0
+        for name, current in self.previous.items():
+            old = previous.get(name)
+            if old is None:
+                continue
+            rx = counter_delta(old[0], current[0]) / elapsed
+            tx = counter_delta(old[1], current[1]) / elapsed
+            devices.append(NetRate(name, rx, tx))
+            if name in self.excluded:
+                continue
+            total_rx += rx
+            total_tx += tx
+        return IoRates(devices, {'rx_bytes': total_rx, 'tx_bytes': total_tx})
+
+def format_rate(bytes_per_second):
+    """Format a byte rate compactly, e.g. '1.2M' for 1.2 MiB/s"""
+    value = float(bytes_per_second)
+    for unit in ('B', 'K', 'M', 'G'):
+        if value < 1024 or unit == 'G':
+            if unit == 'B':
+                return f"{value:.0f}{unit}"
+            return f"{value:.1f}{unit}"
+        value /= 1024
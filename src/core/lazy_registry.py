@@ -0,0 +1,46 @@
+import importlib
+
+def deferred(module_name, attribute, *args, **kwargs):
+    """Get a factory that imports `module_name` only when called, then builds its `attribute`
+
+    Keeps a feature's module (and whatever heavy packages it pulls in) out
+    of startup unless the feature is actually used.
+    """
+    def factory():
+        return getattr(importlib.import_module(module_name), attribute)(*args, **kwargs)
+    return factory
+
+class LazyRegistry:
+    """Named objects, each built by its factory the first time it is asked for
+
+    Lets the app list every service and widget up front while only paying
+    for the ones that are actually used. `instances` holds what has been
+    built so far, in the order it was built. `on_create(name, instance)`,
+    if given, is called once for each object right after it is built.
+    """
+
+    def __init__(self, on_create=None):
+        self.factories = {}
+        self.instances = {}
+        self.on_create = on_create
+
+    def register(self, name, factory):
+        """Add a factory called with no arguments to build `name`"""
+        self.factories[name] = factory
+
+    def get(self, name):
+        """Get the object called `name`, building it if needed"""
+        instance = self.instances.get(name)
+        if instance is None:
+            instance = self.factories[name]()
+            self.instances[name] = instance
+            if self.on_create is not None:
+                self.on_create(name, instance)
+        return instance
+
+    def created(self, name):
+        """Get the object called `name` if it has been built, else None"""
+        return self.instances.get(name)
+
+    def __contains__(self, name):
+        return name in self.factories
@@ -0,0 +1,202 @@
+from array import array
+import threading
+
+# (window name, seconds per sample, number of samples)
+DEFAULT_WINDOWS = (
+    ('1m', 1, 60),
+    ('1h', 10, 360),
+    ('24h', 60, 1440),
+)
+
+class RingBuffer:
+    """Fixed-size circular buffer of floats backed by a preallocated array"""
+    __slots__ = ('capacity', '_data', '_index', '_count', 'appended')
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._data = array('d', bytes(8 * capacity))
+        self._index = 0
+        self._count = 0
+        # Values ever appended, so readers can tell how many are new to them
+        self.appended = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value):
+        """Append a value, overwriting the oldest one when full"""
+        self._data[self._index] = value
+        self._index = (self._index + 1) % self.capacity
+        self.appended += 1
+        if self._count < self.capacity:
+            self._count += 1
+
+    def latest(self):
+        """Get the most recently appended value"""
+        if not self._count:
+            return None
+        return self._data[self._index - 1]
+
+    def views(self):
+        """Get zero-copy memoryviews over the samples, oldest first"""
+        view = memoryview(self._data)
+        if self._count < self.capacity:
+            return (view[:self._count],)
+        return (view[self._index:], view[:self._index])
+
+    def tail(self, count):
+        """Get a copy of the newest `count` samples (at most all of them), oldest first"""
+        count = min(count, self._count)
+        start = (self._index - count) % self.capacity
+        if start + count <= self.capacity:
+            return self._data[start:start + count]
+        return self._data[start:] + self._data[:self._index]
+
+    def values(self):
+        """Get a copy of the samples, oldest first"""
+        result = array('d')
+        for view in self.views():
+            result.extend(view)
+        return result
+
+    def clear(self):
+        """Drop all samples"""
+        self._index = 0
+        self._count = 0
+
+class DownsampledSeries:
+    """One metric kept at several resolutions, averaging samples into each bucket"""
+    __slots__ = ('windows', '_buckets')
+
+    def __init__(self, windows=DEFAULT_WINDOWS):
+        self.windows = {}
+        # Per window: [resolution, bucket start, running sum, sample count]
+        self._buckets = {}
+        for name, resolution, capacity in windows:
+            self.windows[name] = RingBuffer(capacity)
+            self._buckets[name] = [resolution, None, 0.0, 0]
+
+    def append(self, value, timestamp):
+        """Add a raw sample taken at the given monotonic timestamp"""
+        for name, bucket in self._buckets.items():
+            resolution, start = bucket[0], bucket[1]
+            if start is None:
+                bucket[1] = timestamp
+            elif timestamp - start >= resolution:
+                if bucket[3]:
+                    self.windows[name].append(bucket[2] / bucket[3])
+                bucket[1] = timestamp
+                bucket[2] = 0.0
+                bucket[3] = 0
+            bucket[2] += value
+            bucket[3] += 1
+
+    def get(self, window):
+        """Get the ring buffer for a window"""
+        return self.windows[window]
+
+class MetricHistory:
+    """History store for every metric reported by SystemStats"""
+
+    def __init__(self, windows=DEFAULT_WINDOWS):
+        self.window_specs = windows
+        self.series = {}
+        self.lock = threading.Lock()
+        # Bumped by clear(), so readers of since() know their counts are void
+        self.generation = 0
+
+    def record(self, snapshot):
+        """Record one StatsSnapshot"""
+        with self.lock:
+            for metric, value in self._flatten(snapshot):
+                if value is None:
+                    continue
+                series = self.series.get(metric)
+                if series is None:
+                    series = self.series[metric] = DownsampledSeries(self.window_specs)
+                series.append(float(value), snapshot.timestamp)
+
+    def _flatten(self, snapshot):
+        """Yield (metric name, value) pairs from a StatsSnapshot"""
+        cpu = snapshot.cpu
+        if cpu:
+            yield 'cpu.total', cpu.total_percent
+            for i, percent in enumerate(cpu.percent_per_core):
+                yield f'cpu.core.{i}', percent
+        memory = snapshot.memory
+        if memory:
+            yield 'memory.percent', memory.percent
+            yield 'swap.percent', memory.swap_percent
+        for gpu in snapshot.gpu or ():
+            yield f'gpu.{gpu.id}.load', gpu.load
+            yield f'gpu.{gpu.id}.memory', gpu.memory_percent
+        if snapshot.disk:
+            yield 'disk.read', snapshot.disk.totals['read_bytes']
+            yield 'disk.write', snapshot.disk.totals['write_bytes']
+        if snapshot.net:
+            yield 'net.rx', snapshot.net.totals['rx_bytes']
+            yield 'net.tx', snapshot.net.totals['tx_bytes']
+
+    def metrics(self):
+        """Get the names of all recorded metrics"""
+        with self.lock:
+            return list(self.series.keys())
+
+    def window_names(self):
+        """Get the names of the available windows"""
+        return [name for name, _, _ in self.window_specs]
+
+    def get(self, metric, window='1m'):
+        """Get a copy of a metric's samples for a window, oldest first"""
+        with self.lock:
+            series = self.series.get(metric)
+            if series is None:
+                return array('d')
+            return series.get(window).values()
+
+    def views(self, metric, window='1m'):
+        """Get zero-copy views of a metric's samples for a window, oldest first
+
+        The views alias the live buffer, so read them on the thread that
+        records or while holding the lock.
+        """
+        series = self.series.get(metric)
+        if series is None:
+            return ()
+        return series.get(window).views()
+
+    def since(self, known, generation=None, window='1m'):
+        """Get the samples added to several metrics since counts a reader already has
+
+        `known` is a list of (metric, samples taken in so far) pairs, the count
+        being 0 at first, and `generation` the one returned with those counts.
+        Returns the current generation and a (samples taken in now, new
+        samples oldest first) pair for each metric, under one lock; no more
+        than a window's worth of samples comes back. A generation other than
+        the reader's means the history was cleared since, and its counts
+        start over from 0.
+        """
+        result = []
+        with self.lock:
+            stale = generation != self.generation
+            for metric, count in known:
+                series = self.series.get(metric)
+                if series is None:
+                    result.append((0, ()))
+                    continue
+                buffer = series.get(window)
+                new = buffer.appended if stale else buffer.appended - count
+                result.append((buffer.appended, buffer.tail(new) if new > 0 else ()))
+            return self.generation, result
+
+    def latest(self, metric, window='1m'):
+        """Get the newest sample for a metric"""
+        with self.lock:
+            series = self.series.get(metric)
+            return series.get(window).latest() if series else None
+
+    def clear(self):
+        """Drop all recorded history"""
+        with self.lock:
+            self.series.clear()
+            self.generation += 1
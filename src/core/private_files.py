@@ -0,0 +1,19 @@
+import os
+
+# Clipboard history and API responses can hold secrets, so only the user may read them
+PRIVATE_FILE_MODE = 0o600
+PRIVATE_DIR_MODE = 0o700
+
+def open_private(path, truncate=False):
+    """Open a binary file for reading and writing, creating it readable by the owner only"""
+    flags = os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+    if truncate:
+        flags |= os.O_TRUNC
+    fd = os.open(path, flags, PRIVATE_FILE_MODE)
+    try:
+        # Tighten a file left readable by an older version
+        os.chmod(path, PRIVATE_FILE_MODE)
+        return os.fdopen(fd, 'r+b')
+    except Exception:
+        os.close(fd)
+        raise
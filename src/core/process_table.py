@@ -0,0 +1,241 @@
+import heapq
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    CLOCK_TICKS = 100
+    PAGE_SIZE = 4096
+
+class ProcessInfo:
+    """Latest usage figures for one process"""
+    __slots__ = ('pid', 'name', 'cpu_percent', 'rss')
+
+    def __init__(self, pid, name, cpu_percent=0.0, rss=0):
+        self.pid = pid
+        self.name = name
+        self.cpu_percent = cpu_percent
+        self.rss = rss
+
+    def to_dict(self):
+        """Convert to a plain dict"""
+        return {
+            'pid': self.pid,
+            'name': self.name,
+            'cpu_percent': self.cpu_percent,
+            'rss': self.rss
+        }
+
+class ProcessTable:
+    """Top processes by CPU and by resident memory for one tick"""
+    __slots__ = ('top_cpu', 'top_rss', 'total')
+
+    def __init__(self, top_cpu, top_rss, total):
+        self.top_cpu = top_cpu
+        self.top_rss = top_rss
+        self.total = total
+
+    def to_dict(self):
+        """Convert to a plain dict"""
+        return {
+            'top_cpu': [info.to_dict() for info in self.top_cpu],
+            'top_rss': [info.to_dict() for info in self.top_rss],
+            'total': self.total
+        }
+
+class ProcfsProcess:
+    """The part of psutil.Process the collector uses, read from /proc/<pid>/stat
+
+    One read of one file gives the name, CPU time and RSS; psutil reads
+    several files per process for the same figures, about four times the
+    cost. Raises OSError when the process is gone.
+    """
+    __slots__ = ('pid', 'path', 'comm', 'cpu_time', 'rss', 'last_cpu_time', 'last_time')
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.path = f'/proc/{pid}/stat'
+        self.last_cpu_time = None
+        self.last_time = None
+        self._read()
+
+    def _read(self):
+        """Re-read the process's stat line"""
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        # The name is in parentheses and may itself contain spaces or ')'
+        close = data.rindex(b')')
+        self.comm = data[data.index(b'(') + 1:close].decode('utf-8', 'replace')
+        fields = data[close + 2:].split()
+        # Fields 14, 15 and 24 of proc(5), counted after pid and comm
+        self.cpu_time = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+        self.rss = int(fields[21]) * PAGE_SIZE
+
+    @contextmanager
+    def oneshot(self):
+        """Read fresh figures for the calls made inside the block"""
+        self._read()
+        yield
+
+    def name(self):
+        return self.comm
+
+    def cpu_percent(self, interval=None):
+        """Get CPU use since the previous call, like psutil (0.0 on the first call)"""
+        now = time.monotonic()
+        last_cpu_time, last_time = self.last_cpu_time, self.last_time
+        self.last_cpu_time, self.last_time = self.cpu_time, now
+        if last_time is None or now <= last_time:
+            return 0.0
+        return (self.cpu_time - last_cpu_time) / (now - last_time) * 100
+
+    def memory_info(self):
+        """Get an object with an `rss` attribute, as psutil does"""
+        return self
+
+def list_proc_pids():
+    """Get the PIDs listed in /proc"""
+    return [int(name) for name in os.listdir('/proc') if name.isdigit()]
+
+def process_source(backend):
+    """Get (list_pids, make_process, errors) for a stats backend name"""
+    if backend == 'procfs':
+        # A process can exit between listing and reading, mid-read included
+        return list_proc_pids, ProcfsProcess, (OSError, ValueError, IndexError)
+    import psutil
+    return psutil.pids, psutil.Process, (psutil.NoSuchProcess, psutil.AccessDenied)
+
+class ProcessCollector:
+    """Tracks per-process CPU and memory without rescanning every tick
+
+    Process objects are kept across ticks, keyed by PID, so that
+    cpu_percent() measures the delta since the previous call. The PID set is
+    only re-listed every `rescan_every` ticks, and a tick reads at most
+    `batch_size` processes: new ones are taken in (at most half the batch,
+    so a first scan of thousands of processes is spread over several ticks),
+    the rows currently shown are refreshed, and the rest of the batch goes
+    round-robin through everything else. The cost of a tick stays bounded on
+    machines with thousands of processes, and the rows on screen never lag.
+
+    `backend` picks the reader the same way as the CPU and memory backends:
+    'procfs' reads /proc/<pid>/stat directly, anything else uses psutil.
+    """
+    BATCH_SIZES = {'procfs': 1024, 'psutil': 512}
+
+    def __init__(self, top_n=5, rescan_every=5, batch_size=None,
+                 list_pids=None, make_process=None, errors=None, backend='psutil'):
+        if list_pids is None or make_process is None or errors is None:
+            default_list_pids, default_make_process, default_errors = process_source(backend)
+            list_pids = list_pids or default_list_pids
+            make_process = make_process or default_make_process
+            errors = errors or default_errors
+        self.errors = errors
+        self.top_n = top_n
+        self.rescan_every = rescan_every
+        self.batch_size = batch_size or self.BATCH_SIZES.get(backend, 512)
+        self.list_pids = list_pids
+        self.make_process = make_process
+        self.processes = {}
+        self.info = {}
+        self.order = []
+        self.cursor = 0
+        # PIDs seen by the last rescan and not yet tracked
+        self.pending = []
+        # PIDs of the rows returned by the previous sample
+        self.shown = []
+        self.ticks = 0
+
+    def _rescan(self):
+        """Sync tracked processes with the current PID set; new ones are queued"""
+        pids = set(self.list_pids())
+        for pid in list(self.processes):
+            if pid not in pids:
+                self._forget(pid)
+        self.pending = [pid for pid in pids if pid not in self.processes]
+        self.order = list(self.processes)
+        self.cursor = 0
+
+    def _admit(self, limit):
+        """Start tracking up to `limit` queued processes; get how many were read"""
+        count = min(limit, len(self.pending))
+        for _ in range(count):
+            pid = self.pending.pop()
+            try:
+                process = self.make_process(pid)
+                name = process.name()
+                # The first cpu_percent() call only primes the counter
+                process.cpu_percent(None)
+            except self.errors:
+                continue
+            self.processes[pid] = process
+            self.info[pid] = ProcessInfo(pid, name)
+            self.order.append(pid)
+        return count
+
+    def _forget(self, pid):
+        """Stop tracking a process"""
+        self.processes.pop(pid, None)
+        self.info.pop(pid, None)
+
+    def _refresh(self, pid):
+        """Read fresh usage for one tracked process"""
+        process = self.processes.get(pid)
+        if process is None:
+            return
+        try:
+            with process.oneshot():
+                cpu = process.cpu_percent(None)
+                rss = process.memory_info().rss
+        except self.errors:
+            self._forget(pid)
+            return
+        info = self.info[pid]
+        info.cpu_percent = cpu
+        info.rss = rss
+
+    def _refresh_batch(self, count, skip):
+        """Refresh usage for the next `count` processes, passing over those in `skip`"""
+        order = self.order
+        count = min(count, len(order))
+        for _ in range(count):
+            if self.cursor >= len(order):
+                self.cursor = 0
+            pid = order[self.cursor]
+            self.cursor += 1
+            if pid not in skip:
+                self._refresh(pid)
+
+    def sample(self):
+        """Refresh the table and get the current top processes"""
+        if self.ticks % self.rescan_every == 0:
+            self._rescan()
+        self.ticks += 1
+        budget = self.batch_size - self._admit(self.batch_size // 2)
+        shown = set(self.shown)
+        for pid in shown:
+            self._refresh(pid)
+        self._refresh_batch(budget - len(shown), shown)
+
+        infos = self.info.values()
+        top_cpu = heapq.nlargest(self.top_n, infos, key=lambda info: info.cpu_percent)
+        top_rss = heapq.nlargest(self.top_n, infos, key=lambda info: info.rss)
+        self.shown = [info.pid for info in top_cpu] + [info.pid for info in top_rss]
+        # Copy the rows so the UI thread never sees them change underneath it
+        return ProcessTable(
+            [ProcessInfo(i.pid, i.name, i.cpu_percent, i.rss) for i in top_cpu],
+            [ProcessInfo(i.pid, i.name, i.cpu_percent, i.rss) for i in top_rss],
+            len(self.info)
+        )
+
+    def reset(self):
+        """Drop all tracked processes"""
+        self.processes.clear()
+        self.info.clear()
+        self.order = []
+        self.cursor = 0
+        self.pending = []
+        self.shown = []
+        self.ticks = 0
@@ -0,0 +1,72 @@
+import time
+
+class SamplingCadence:
+    """Adaptive sampling interval for one metric family on a monotonic deadline clock
+
+    The interval drops to `fast` whenever the sampled value moves by at least
+    `threshold`, then backs off geometrically while the value stays flat. The
+    back-off ceiling is `visible` while a HUD widget shows the metric, and
+    rises to `flat` once the value has not moved for FLAT_SAMPLES samples in
+    a row; with nothing on screen the interval stays pinned at `hidden`.
+    """
+    BACKOFF = 1.5
+    FLAT_SAMPLES = 5
+
+    def __init__(self, name, fast, visible, hidden, threshold, flat=None):
+        self.name = name
+        self.fast = fast
+        self.visible = visible
+        self.hidden = hidden
+        self.threshold = threshold
+        self.flat = visible if flat is None else flat
+        self.interval = fast
+        self.deadline = 0.0
+        self.last_value = None
+        # Samples in a row that did not move by `threshold`
+        self.flat_samples = 0
+
+    def is_due(self, now):
+        """Check whether a sample should be taken now"""
+        return now >= self.deadline
+
+    def ceiling(self, active):
+        """Get the longest interval allowed for the current visibility"""
+        if not active:
+            return self.hidden
+        if self.flat_samples >= self.FLAT_SAMPLES:
+            return max(self.flat, self.visible)
+        return self.visible
+
+    def update(self, value, now, active):
+        """Adapt the interval to a new sample and schedule the next deadline"""
+        changing = (value is not None and self.last_value is not None
+                    and abs(value - self.last_value) >= self.threshold)
+        self.flat_samples = 0 if changing else self.flat_samples + 1
+        if not active:
+            self.interval = self.hidden
+        elif changing:
+            self.interval = self.fast
+        else:
+            self.interval = min(self.interval * self.BACKOFF, self.ceiling(active))
+        self.last_value = value
+        # Advance from the previous deadline so collection time does not add
+        # drift, but never schedule into the past after a stall
+        deadline = self.deadline + self.interval
+        if deadline <= now:
+            deadline = now + self.interval
+        self.deadline = deadline
+
+    def defer(self, now):
+        """Skip this tick and try again after the fast interval"""
+        self.deadline = now + self.fast
+
+    def relax(self, now):
+        """Switch straight to the hidden interval"""
+        self.interval = self.hidden
+        self.deadline = now + self.hidden
+
+    def reset(self, now=None):
+        """Sample on the next tick at the fast rate"""
+        self.interval = self.fast
+        self.flat_samples = 0
+        self.deadline = time.monotonic() if now is None else now
@@ -0,0 +1,213 @@
+import heapq
+import itertools
+import threading
+import time
+
+WORKER_COUNT = 3
+# A job that raised is retried after this many seconds, doubling on each
+# failure in a row up to the maximum
+RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 60.0
+
+class Job:
+    """A call run by the Scheduler, with its cadence and runtime stats
+
+    The function's return value picks the next run: a number of seconds,
+    or None for the job's `interval`. A job with no interval that returns
+    None waits until it is woken. A job that raises is retried with
+    backoff, never left waiting.
+    """
+    __slots__ = ('name', 'func', 'interval', 'deadline', 'key', 'cancelled', 'running',
+                 'wake_requested', 'runs', 'errors', 'failures', 'total_time', 'max_time',
+                 'last_time')
+
+    def __init__(self, name, func, interval):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.deadline = None
+        # Identifies the job's live entry in the timer heap; older entries are stale
+        self.key = None
+        self.cancelled = False
+        self.running = False
+        self.wake_requested = False
+        self.runs = 0
+        self.errors = 0
+        # Failed runs in a row, for the retry backoff
+        self.failures = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+
+    def get_stats(self):
+        """Get how often the job ran and how long it took, in seconds"""
+        return {
+            'name': self.name,
+            'interval': self.interval,
+            'runs': self.runs,
+            'errors': self.errors,
+            'total_time': self.total_time,
+            'mean_time': self.total_time / self.runs if self.runs else 0.0,
+            'max_time': self.max_time,
+            'last_time': self.last_time,
+            'scheduled': self.deadline is not None and not self.cancelled,
+        }
+
+class Scheduler:
+    """Runs periodic jobs for every service on a small shared pool of threads
+
+    Jobs wait in a heap ordered by deadline. Idle workers sleep on a
+    condition variable until the earliest deadline, and are woken early
+    when a job is added, woken or cancelled, so stopping never waits out
+    a poll interval. A job never runs on two workers at once.
+    """
+
+    def __init__(self, workers=WORKER_COUNT, clock=time.monotonic,
+                 retry_delay=RETRY_DELAY, max_retry_delay=MAX_RETRY_DELAY):
+        self.clock = clock
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.condition = threading.Condition()
+        self.heap = []
+        self.jobs = []
+        self.counter = itertools.count()
+        self.stopping = False
+        self.worker_count = workers
+        self.threads = []
+
+    def _start_workers(self):
+        """Start the worker threads on first use"""
+        while len(self.threads) < self.worker_count:
+            thread = threading.Thread(target=self._work, name=f"scheduler-{len(self.threads)}")
+            thread.daemon = True
+            self.threads.append(thread)
+            thread.start()
+
+    def schedule(self, name, func, interval=None, delay=0.0):
+        """Run `func()` after `delay` seconds, then as its return value or `interval` says"""
+        job = Job(name, func, interval)
+        with self.condition:
+            self.jobs.append(job)
+            self._push(job, self.clock() + delay)
+            self._start_workers()
+        return job
+
+    def wake(self, job):
+        """Run a job as soon as possible instead of at its deadline"""
+        with self.condition:
+            if job.cancelled:
+                return
+            if job.running:
+                # Run again right after the current run
+                job.wake_requested = True
+            else:
+                self._push(job, self.clock())
+
+    def cancel(self, job):
+        """Stop running a job; a run already in progress finishes but is not repeated"""
+        with self.condition:
+            job.cancelled = True
+            job.deadline = None
+            job.key = None
+            if job in self.jobs:
+                self.jobs.remove(job)
+            self.condition.notify_all()
+
+    def _push(self, job, deadline):
+        """Put a job in the heap, replacing its previous entry"""
+        job.deadline = deadline
+        job.key = next(self.counter)
+        heapq.heappush(self.heap, (deadline, job.key, job))
+        self.condition.notify()
+
+    def _next_job(self):
+        """Wait for the earliest job to fall due and take it; None when stopping"""
+        with self.condition:
+            while not self.stopping:
+                heap = self.heap
+                # Drop entries of cancelled jobs and ones replaced by a newer deadline
+                while heap and heap[0][1] != heap[0][2].key:
+                    heapq.heappop(heap)
+                if not heap:
+                    self.condition.wait()
+                    continue
+                deadline, key, job = heap[0]
+                delay = deadline - self.clock()
+                if delay > 0:
+                    self.condition.wait(delay)
+                    continue
+                heapq.heappop(heap)
+                job.key = None
+                job.running = True
+                job.wake_requested = False
+                return job
+            return None
+
+    def _work(self):
+        """Worker loop: run due jobs until the scheduler shuts down"""
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            start = time.perf_counter()
+            try:
+                next_delay = job.func()
+                failed = False
+            except Exception as e:
+                print(f"Error in scheduled job {job.name}: {e}")
+                next_delay = None
+                failed = True
+            elapsed = time.perf_counter() - start
+            with self.condition:
+                job.running = False
+                job.runs += 1
+                job.errors += failed
+                job.failures = job.failures + 1 if failed else 0
+                job.total_time += elapsed
+                job.max_time = max(job.max_time, elapsed)
+                job.last_time = elapsed
+                if job.cancelled or self.stopping:
+                    continue
+                if job.wake_requested:
+                    next_delay = 0.0
+                elif failed:
+                    next_delay = self._retry_delay(job)
+                elif next_delay is None:
+                    next_delay = job.interval
+                if next_delay is None:
+                    # Idle until woken
+                    job.deadline = None
+                else:
+                    self._push(job, self.clock() + max(next_delay, 0.0))
+
+    def _retry_delay(self, job):
+        """Get the seconds until a failed job runs again, never sooner than its interval"""
+        backoff = min(self.retry_delay * 2 ** min(job.failures - 1, 30), self.max_retry_delay)
+        return max(backoff, job.interval or 0.0)
+
+    def get_stats(self):
+        """Get the runtime stats of every scheduled job"""
+        with self.condition:
+            return [job.get_stats() for job in self.jobs]
+
+    def shutdown(self, wait=False):
+        """Stop the workers; idle ones exit at once, busy ones after their current job"""
+        with self.condition:
+            self.stopping = True
+            self.condition.notify_all()
+        if wait:
+            for thread in self.threads:
+                if thread is not threading.current_thread():
+                    thread.join()
+
+_shared_scheduler = None
+# Services may be built on different threads; only one of them may create the scheduler
+_shared_lock = threading.Lock()
+
+def shared_scheduler():
+    """Get the scheduler shared by all services"""
+    global _shared_scheduler
+    with _shared_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = Scheduler()
+        return _shared_scheduler
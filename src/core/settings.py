@@ -1,14 +1,50 @@
 from PyQt5.QtCore import QSettings
+import copy
 import json
 import os
-from PyQt5.QtCore import QObject, pyqtSignal
+import threading
+from PyQt5.QtCore import QObject, QCoreApplication, QTimer, pyqtSignal
+
+# Changes are written once this long after the last one in a burst
+SAVE_DELAY_MS = 1000
+
+def _paths_overlap(a, b):
+    """Check whether one dotted settings path is the other or contains it"""
+    return a == b or a.startswith(b + '.') or b.startswith(a + '.')
 
 class Settings(QObject):
+    # Something changed; prefer subscribe() to hear only about the keys you use
     settings_changed = pyqtSignal()
+    # Carries a change to the thread that owns the timers; queued when made from another thread
+    _change_made = pyqtSignal(str, object, object)
     def __init__(self):
         super().__init__()
         self.settings_file = os.path.join(os.path.expanduser("~"), ".nerdhud", "settings.json")
         self.settings = self._load_settings()
+        # Setters may run on worker threads; this guards the dict while it changes or is saved
+        self.lock = threading.RLock()
+        # Mutations are written behind: one file write per burst, by one writer thread
+        self.dirty = False
+        self.save_generation = 0
+        self.written_generation = 0
+        self.pending_save = None
+        self.write_condition = threading.Condition()
+        self.writer_thread = None
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self._save_settings)
+        # Listeners hear about every change made in one event loop pass at once
+        self.pending_changes = {}
+        self.subscriptions = []
+        self.notify_timer = QTimer(self)
+        self.notify_timer.setSingleShot(True)
+        self.notify_timer.setInterval(0)
+        self.notify_timer.timeout.connect(self._notify)
+        self._change_made.connect(self._record_change)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
         
     def _load_settings(self):
         """Load settings from file"""
@@ -20,11 +56,111 @@ class Settings(QObject):
                 return self._get_default_settings()
         return self._get_default_settings()
         
-    def _save_settings(self):
-        """Save settings to file"""
-        os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
-        with open(self.settings_file, 'w') as f:
-            json.dump(self.settings, f, indent=4)
+    def subscribe(self, paths, callback):
+        """Call `callback(changes)` after each batch of changes touching any of `paths`
+        
+        `paths` is a dotted path or a tuple of them; a path also matches the
+        keys below it and the keys containing it. `changes` maps each changed
+        path to its (old, new) value.
+        """
+        if isinstance(paths, str):
+            paths = (paths,)
+        self.subscriptions.append((tuple(paths), callback))
+        
+    def unsubscribe(self, callback):
+        """Stop calling `callback` for changes"""
+        self.subscriptions = [(paths, subscriber) for paths, subscriber in self.subscriptions
+                              if subscriber != callback]
+        
+    def _notify(self):
+        """Tell subscribers about the batch of changes that just ended"""
+        changes = {path: values for path, values in self.pending_changes.items()
+                   if values[0] != values[1]}
+        self.pending_changes = {}
+        if not changes:
+            return
+        for paths, callback in list(self.subscriptions):
+            matching = {changed: values for changed, values in changes.items()
+                        if any(_paths_overlap(changed, path) for path in paths)}
+            if matching:
+                try:
+                    callback(matching)
+                except Exception as e:
+                    print(f"Error notifying settings subscriber: {e}")
+        self.settings_changed.emit()
+        
+    def _changed(self, path, old, new):
+        """Schedule a save and a change notification for this batch of mutations
+        
+        Safe to call from any thread: timers can only be started from the
+        GUI thread, so the change is passed there by a signal.
+        """
+        # Copies, so editing the stored value in place later cannot make old equal new
+        self._change_made.emit(path, copy.deepcopy(old), copy.deepcopy(new))
+        
+    def _record_change(self, path, old, new):
+        """Add a change to the batch and (re)start the save and notify timers"""
+        if path in self.pending_changes:
+            # Keep the value from before the batch
+            old = self.pending_changes[path][0]
+        self.pending_changes[path] = (old, new)
+        self.dirty = True
+        # Each change restarts the window, so a drag is saved once it ends
+        self.save_timer.start()
+        if not self.notify_timer.isActive():
+            self.notify_timer.start()
+            
+    def _save_settings(self, wait=False):
+        """Hand the settings to the writer thread, and with `wait` until they are written"""
+        with self.write_condition:
+            if self.dirty:
+                self.dirty = False
+                # Serialized under the lock so a setter on another thread cannot change it midway
+                with self.lock:
+                    data = json.dumps(self.settings, indent=4)
+                self.save_generation += 1
+                # Only the newest settings matter; a copy the writer has not taken yet is dropped
+                self.pending_save = (data, self.save_generation)
+                if self.writer_thread is None:
+                    self.writer_thread = threading.Thread(target=self._write_loop)
+                    self.writer_thread.daemon = True
+                    self.writer_thread.start()
+                self.write_condition.notify_all()
+            if wait:
+                while self.written_generation < self.save_generation:
+                    self.write_condition.wait()
+                    
+    def _write_loop(self):
+        """Write each newest copy of the settings handed over by _save_settings"""
+        while True:
+            with self.write_condition:
+                while self.pending_save is None:
+                    self.write_condition.wait()
+                data, generation = self.pending_save
+                self.pending_save = None
+            self._write_settings(data)
+            with self.write_condition:
+                # Counted even when the write failed, so flush() never waits forever
+                self.written_generation = generation
+                self.write_condition.notify_all()
+            
+    def _write_settings(self, data):
+        """Replace the settings file atomically"""
+        temp_file = self.settings_file + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
+            with open(temp_file, 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.settings_file)
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+                
+    def flush(self):
+        """Write pending changes now and wait for them to reach the disk"""
+        self.save_timer.stop()
+        self._save_settings(wait=True)
             
     def _get_default_settings(self):
         """Get default settings"""
@@ -37,7 +173,8 @@ class Settings(QObject):
                 'system_stats': True,
                 'clipboard': True,
                 'focus_timer': True,
-                'github': True
+                'github': True,
+                'spotify': True
             },
             'keybinds': {
                 'toggle_visibility': 'ctrl+alt+h',
@@ -59,9 +196,12 @@ class Settings(QObject):
         
     def set(self, key, value):
         """Set a setting value"""
-        self.settings[key] = value
-        self._save_settings()
-        self.settings_changed.emit()
+        with self.lock:
+            old = self.settings.get(key)
+            if key in self.settings and old == value:
+                return
+            self.settings[key] = value
+        self._changed(key, old, value)
         
     def get_theme(self):
         """Get current theme"""
@@ -90,11 +230,14 @@ class Settings(QObject):
         
     def set_widget_position(self, widget_name, x, y):
         """Set widget position"""
-        if 'widget_positions' not in self.settings:
-            self.settings['widget_positions'] = {}
-        self.settings['widget_positions'][widget_name] = [x, y]
-        self._save_settings()
-        self.settings_changed.emit()
+        with self.lock:
+            if 'widget_positions' not in self.settings:
+                self.settings['widget_positions'] = {}
+            old = self.settings['widget_positions'].get(widget_name)
+            if old == [x, y]:
+                return
+            self.settings['widget_positions'][widget_name] = [x, y]
+        self._changed(f'widget_positions.{widget_name}', old, [x, y])
         
     def get_setting(self, key, default=None):
         """Get a setting value by key (supports nested keys with dots)"""
@@ -110,40 +253,39 @@ class Settings(QObject):
         """Set a setting value by key (supports nested keys with dots)"""
         try:
             keys = key.split('.')
-            target = self.settings
-            for k in keys[:-1]:
-                target = target[k]
-            target[keys[-1]] = value
-            self._save_settings()
-            self.settings_changed.emit()
+            with self.lock:
+                target = self.settings
+                for k in keys[:-1]:
+                    target = target[k]
+                old = target.get(keys[-1])
+                target[keys[-1]] = value
+            self._changed(key, old, value)
             return True
         except (KeyError, TypeError):
             return False
             
     def set_theme(self, theme_name):
         """Set current theme"""
-        result = self.set('theme', theme_name)
-        self.settings_changed.emit()
-        return result
+        return self.set('theme', theme_name)
         
     def set_opacity(self, opacity):
         """Set window opacity"""
-        result = self.set('opacity', max(0.1, min(1.0, opacity)))
-        self.settings_changed.emit()
-        return result
+        return self.set('opacity', max(0.1, min(1.0, opacity)))
         
     def set_enabled(self, widget_name, enabled):
         """Enable or disable a widget"""
-        if 'enabled_widgets' not in self.settings:
-            self.settings['enabled_widgets'] = {}
-        self.settings['enabled_widgets'][widget_name] = enabled
-        self._save_settings()
-        self.settings_changed.emit()
+        with self.lock:
+            if 'enabled_widgets' not in self.settings:
+                self.settings['enabled_widgets'] = {}
+            old = self.settings['enabled_widgets'].get(widget_name)
+            self.settings['enabled_widgets'][widget_name] = enabled
+        self._changed(f'enabled_widgets.{widget_name}', old, enabled)
         
     def set_keybind(self, action, key_combination):
         """Set keybind for an action"""
-        if 'keybinds' not in self.settings:
-            self.settings['keybinds'] = {}
-        self.settings['keybinds'][action] = key_combination
-        self._save_settings()
-        self.settings_changed.emit() 
\ No newline at end of file
+        with self.lock:
+            if 'keybinds' not in self.settings:
+                self.settings['keybinds'] = {}
+            old = self.settings['keybinds'].get(action)
+            self.settings['keybinds'][action] = key_combination
+        self._changed(f'keybinds.{action}', old, key_combination) 
\ No newline at end of file
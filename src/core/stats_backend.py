@@ -0,0 +1,213 @@
+import os
+import sys
+from core.stats_snapshot import CpuStats, MemoryStats
+
+class PsutilBackend:
+    """Portable CPU and memory collection through psutil"""
+    name = 'psutil'
+
+    def __init__(self):
+        import psutil
+        self.psutil = psutil
+        self.cpu_count = psutil.cpu_count()
+
+    def cpu_stats(self):
+        """Get CPU usage since the previous call"""
+        cpu_percent = self.psutil.cpu_percent(interval=None, percpu=True)
+        cpu_freq = self.psutil.cpu_freq()
+
+        return CpuStats(
+            cpu_percent,
+            sum(cpu_percent) / len(cpu_percent),
+            cpu_freq.current if cpu_freq else None,
+            cpu_freq.min if cpu_freq else None,
+            cpu_freq.max if cpu_freq else None,
+            self.cpu_count
+        )
+
+    def memory_stats(self):
+        """Get current RAM and swap usage"""
+        memory = self.psutil.virtual_memory()
+        swap = self.psutil.swap_memory()
+
+        return MemoryStats(
+            memory.total,
+            memory.available,
+            memory.used,
+            memory.percent,
+            swap.total,
+            swap.used,
+            swap.free,
+            swap.percent
+        )
+
+    def close(self):
+        """Nothing to release for psutil"""
+
+class ProcfsBackend:
+    """Linux CPU and memory collection straight from /proc and sysfs
+
+    The files are opened once and re-read with preadv() from offset 0 into
+    preallocated buffers, instead of psutil opening and parsing them again
+    on every call.
+    """
+    name = 'procfs'
+    CPUFREQ_DIR = '/sys/devices/system/cpu/cpu%d/cpufreq/%s'
+    # Matched with the leading newline so 'Cached:' does not hit 'SwapCached:'
+    MEMINFO_FIELDS = (b'\nMemTotal:', b'\nMemFree:', b'\nMemAvailable:', b'\nBuffers:',
+                      b'\nCached:', b'\nSReclaimable:', b'\nSwapTotal:', b'\nSwapFree:')
+
+    def __init__(self, stat_path='/proc/stat', meminfo_path='/proc/meminfo', cpufreq_dir=CPUFREQ_DIR):
+        self.cpufreq_dir = cpufreq_dir
+        self.stat_fd = os.open(stat_path, os.O_RDONLY)
+        self.meminfo_fd = os.open(meminfo_path, os.O_RDONLY)
+        # Only the cpu lines at the top of /proc/stat are needed
+        self.stat_buffer = bytearray(4096 + 128 * (os.cpu_count() or 1))
+        # Byte 0 stays a newline so the first line matches like the others
+        self.meminfo_buffer = bytearray(b'\n' * 8192)
+        self.previous_times = None
+        # Offline CPUs have no line in /proc/stat, so os.cpu_count() may count more
+        cpus = self._online_cpus()
+        self.cpu_count = len(cpus) or 1
+
+        self.freq_fds = []
+        self.freq_buffer = bytearray(32)
+        self.freq_min = None
+        self.freq_max = None
+        for cpu in cpus:
+            try:
+                self.freq_fds.append(os.open(cpufreq_dir % (cpu, 'scaling_cur_freq'), os.O_RDONLY))
+            except OSError:
+                break
+        if self.freq_fds:
+            # Hardware limits do not change, so read them once
+            self.freq_min = self._read_sysfs_mhz(cpufreq_dir % (cpus[0], 'cpuinfo_min_freq'))
+            self.freq_max = self._read_sysfs_mhz(cpufreq_dir % (cpus[0], 'cpuinfo_max_freq'))
+
+    def _online_cpus(self):
+        """Get the numbers of the CPUs listed in /proc/stat"""
+        data = self.stat_buffer
+        end = self._pread(self.stat_fd, data)
+        cpus = []
+        for line in bytes(data[:end]).split(b'\n'):
+            if not line.startswith(b'cpu'):
+                break
+            name = line.split(None, 1)[0]
+            if name != b'cpu':
+                cpus.append(int(name[3:]))
+        return cpus
+
+    def _pread(self, fd, buffer, skip=0):
+        """Re-read a file from offset 0 into a reused buffer and get its size"""
+        return os.preadv(fd, [memoryview(buffer)[skip:]], 0) + skip
+
+    def _read_sysfs_mhz(self, path):
+        """Read a one-off kHz value from sysfs as MHz"""
+        try:
+            with open(path, 'rb') as f:
+                return int(f.read()) / 1000
+        except (OSError, ValueError):
+            return None
+
+    def _read_cpu_times(self):
+        """Get (busy, total) jiffies for every core from /proc/stat"""
+        data = self.stat_buffer
+        end = self._pread(self.stat_fd, data)
+        times = []
+        start = 0
+        while start < end:
+            newline = data.find(b'\n', start, end)
+            if newline < 0:
+                newline = end
+            # Per-core lines are "cpuN ..."; the aggregate line is "cpu  ..."
+            if not data.startswith(b'cpu', start, newline):
+                break
+            if data[start + 3] != 0x20:
+                fields = data[start:newline].split()
+                user, nice, system, idle, iowait, irq, softirq, steal = map(int, fields[1:9])
+                total = user + nice + system + idle + iowait + irq + softirq + steal
+                times.append((total - idle - iowait, total))
+            start = newline + 1
+        return times
+
+    def cpu_stats(self):
+        """Get CPU usage since the previous call"""
+        times = self._read_cpu_times()
+        previous = self.previous_times
+        self.previous_times = times
+        if previous is None or len(previous) != len(times):
+            percents = [0.0] * len(times)
+        else:
+            percents = []
+            for (busy, total), (old_busy, old_total) in zip(times, previous):
+                delta = total - old_total
+                percents.append((busy - old_busy) / delta * 100 if delta > 0 else 0.0)
+
+        current = None
+        if self.freq_fds:
+            khz = 0
+            buffer = self.freq_buffer
+            for fd in self.freq_fds:
+                khz += int(buffer[:self._pread(fd, buffer)])
+            current = khz / len(self.freq_fds) / 1000
+
+        return CpuStats(
+            percents,
+            sum(percents) / len(percents) if percents else 0.0,
+            current,
+            self.freq_min,
+            self.freq_max,
+            self.cpu_count
+        )
+
+    def memory_stats(self):
+        """Get current RAM and swap usage, computed the way psutil does"""
+        data = self.meminfo_buffer
+        size = self._pread(self.meminfo_fd, data, skip=1)
+        total, free, available, buffers, cached, reclaimable, swap_total, swap_free = (
+            self._meminfo_value(data, field, size) for field in self.MEMINFO_FIELDS
+        )
+
+        if not available:
+            # Kernels before 3.14 have no MemAvailable
+            available = free + buffers + cached + reclaimable
+        # psutil 7 reports used as everything that is not available
+        used = total - available
+        swap_used = swap_total - swap_free
+
+        return MemoryStats(
+            total,
+            available,
+            used,
+            round((total - available) / total * 100, 1) if total else 0.0,
+            swap_total,
+            swap_used,
+            swap_free,
+            round(swap_used / swap_total * 100, 1) if swap_total else 0.0
+        )
+
+    def _meminfo_value(self, data, field, size):
+        """Get one /proc/meminfo field in bytes"""
+        index = data.find(field, 0, size)
+        if index < 0:
+            return 0
+        start = index + len(field)
+        return int(data[start:data.find(b'kB', start, size)]) * 1024
+
+    def close(self):
+        """Close the kept-open files"""
+        for fd in [self.stat_fd, self.meminfo_fd] + self.freq_fds:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self.freq_fds = []
+
+def create_backend(name=None):
+    """Create a stats backend: 'procfs' on Linux when usable, else 'psutil'"""
+    if name in (None, 'procfs') and sys.platform.startswith('linux'):
+        try:
+            return ProcfsBackend()
+        except OSError as e:
+            print(f"Failed to open /proc stats backend, using psutil: {e}")
+    return PsutilBackend()
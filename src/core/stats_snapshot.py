@@ -0,0 +1,124 @@
+SNAPSHOT_VERSION = 3
+
+class CpuStats:
+    """CPU usage for one tick"""
+    __slots__ = ('percent_per_core', 'total_percent', 'freq_current',
+                 'freq_min', 'freq_max', 'cores')
+
+    def __init__(self, percent_per_core, total_percent, freq_current=None,
+                 freq_min=None, freq_max=None, cores=0):
+        self.percent_per_core = percent_per_core
+        self.total_percent = total_percent
+        self.freq_current = freq_current
+        self.freq_min = freq_min
+        self.freq_max = freq_max
+        self.cores = cores
+
+    def to_dict(self):
+        """Convert to the legacy stats dict layout"""
+        return {
+            'percent_per_core': list(self.percent_per_core),
+            'total_percent': self.total_percent,
+            'frequency': {
+                'current': self.freq_current,
+                'min': self.freq_min,
+                'max': self.freq_max
+            },
+            'cores': self.cores
+        }
+
+class MemoryStats:
+    """RAM and swap usage for one tick"""
+    __slots__ = ('total', 'available', 'used', 'percent',
+                 'swap_total', 'swap_used', 'swap_free', 'swap_percent')
+
+    def __init__(self, total, available, used, percent,
+                 swap_total, swap_used, swap_free, swap_percent):
+        self.total = total
+        self.available = available
+        self.used = used
+        self.percent = percent
+        self.swap_total = swap_total
+        self.swap_used = swap_used
+        self.swap_free = swap_free
+        self.swap_percent = swap_percent
+
+    def to_dict(self):
+        """Convert to the legacy stats dict layout"""
+        return {
+            'total': self.total,
+            'available': self.available,
+            'used': self.used,
+            'percent': self.percent,
+            'swap': {
+                'total': self.swap_total,
+                'used': self.swap_used,
+                'free': self.swap_free,
+                'percent': self.swap_percent
+            }
+        }
+
+class GpuStats:
+    """Usage of a single GPU for one tick"""
+    __slots__ = ('id', 'name', 'load', 'memory_total', 'memory_used',
+                 'memory_free', 'temperature')
+
+    def __init__(self, id, name, load, memory_total, memory_used,
+                 memory_free, temperature):
+        self.id = id
+        self.name = name
+        self.load = load
+        self.memory_total = memory_total
+        self.memory_used = memory_used
+        self.memory_free = memory_free
+        self.temperature = temperature
+
+    @property
+    def memory_percent(self):
+        """Get used GPU memory as a percentage, or None if it is not reported"""
+        if self.memory_used is None:
+            return None
+        if not self.memory_total:
+            return 0.0
+        return self.memory_used / self.memory_total * 100
+
+    def to_dict(self):
+        """Convert to the legacy stats dict layout"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'load': self.load,
+            'memory': {
+                'total': self.memory_total,
+                'used': self.memory_used,
+                'free': self.memory_free
+            },
+            'temperature': self.temperature
+        }
+
+class StatsSnapshot:
+    """All system statistics collected in one tick"""
+    __slots__ = ('version', 'timestamp', 'cpu', 'memory', 'gpu', 'disk', 'net',
+                 'processes')
+
+    def __init__(self, timestamp, cpu, memory, gpu=None, disk=None, net=None,
+                 processes=None):
+        self.version = SNAPSHOT_VERSION
+        self.timestamp = timestamp
+        self.cpu = cpu
+        self.memory = memory
+        self.gpu = gpu
+        self.disk = disk
+        self.net = net
+        self.processes = processes
+
+    def to_dict(self):
+        """Convert to the legacy nested dict emitted by stats_updated"""
+        return {
+            'cpu': self.cpu.to_dict() if self.cpu else None,
+            'memory': self.memory.to_dict() if self.memory else None,
+            'gpu': [gpu.to_dict() for gpu in self.gpu] if self.gpu else None,
+            'disk': self.disk.to_dict() if self.disk else None,
+            'net': self.net.to_dict() if self.net else None,
+            'processes': self.processes.to_dict() if self.processes else None
+        }
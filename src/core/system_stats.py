@@ -1,109 +1,229 @@
-import psutil
-import threading
 import time
 from PyQt5.QtCore import QObject, pyqtSignal
+from core.metric_history import MetricHistory
+from core.stats_snapshot import StatsSnapshot
+from core.stats_backend import create_backend
+from core.sampling import SamplingCadence
+from core.gpu_probe import create_gpu_probe
+from core.io_rates import DiskIoCollector, NetIoCollector, DEFER_AFTER
+from core.process_table import ProcessCollector
+from core.watchers import WatcherSet
+from core.scheduler import shared_scheduler
+
+MEGABYTE = 1024 * 1024
 
 class SystemStats(QObject):
+    # Versioned signal carrying a StatsSnapshot (see SNAPSHOT_VERSION)
+    snapshot_updated = pyqtSignal(object)
+    # Legacy nested dict, kept for older consumers
     stats_updated = pyqtSignal(dict)  
     
-    def __init__(self):
+    def __init__(self, backend=None):
         super().__init__()
         self.running = False
         self.update_interval = 1.0  
-        self.monitor_thread = None
+        # Sampling runs as a job on the shared scheduler
+        self.scheduler = shared_scheduler()
+        self.job = None
+        # Sampling stays at the slow hidden cadence until a widget is shown
+        self.active = False
+        self.watchers = WatcherSet(self._on_watched_changed)
         self.gpu_available = False
+        # /proc reader on Linux, psutil everywhere else
+        self.backend = create_backend(backend)
+        self.cpu_count = self.backend.cpu_count
+        self.history = MetricHistory()
         
-        try:
-            import GPUtil
-            self.gpu_available = len(GPUtil.getGPUs()) > 0
-        except ImportError:
-            self.gpu_available = False
+        self.gpu_probe = create_gpu_probe()
+        self.gpu_available = self.gpu_probe is not None
+            
+        # Each metric family backs off on its own; the nvidia-smi probe only
+        # refreshes once a second, so GPU sampling is kept slower. A value that
+        # stays flat while shown slows to the last figure, a few seconds
+        self.cadences = {
+            'cpu': SamplingCadence('cpu', 0.25, self.update_interval, 5.0, 5.0, 3.0),
+            'memory': SamplingCadence('memory', 0.5, self.update_interval, 10.0, 2.0, 5.0),
+        }
+        if self.gpu_available:
+            self.cadences['gpu'] = SamplingCadence('gpu', 1.0, 2.0, 15.0, 5.0, 5.0)
+        # Disk and network thresholds are in MB/s of combined throughput
+        self.cadences['disk'] = SamplingCadence('disk', 0.5, self.update_interval, 10.0, 1.0, 4.0)
+        self.cadences['net'] = SamplingCadence('net', 0.5, self.update_interval, 10.0, 0.5, 4.0)
+        self.disk_collector = DiskIoCollector()
+        self.net_collector = NetIoCollector()
+        self.last_cpu = None
+        self.last_memory = None
+        self.last_gpu = None
+        self.last_disk = None
+        self.last_net = None
+        
+        # Process scanning is the most expensive family, so it only runs
+        # while the process view is open and on a fixed 2 s cadence
+        self.process_tracking = False
+        self.process_cadence = SamplingCadence('processes', 2.0, 2.0, 2.0, float('inf'))
+        # Reads /proc/<pid>/stat directly when the /proc backend is in use
+        self.process_collector = ProcessCollector(backend=self.backend.name)
+        self.last_processes = None
             
     def start_monitoring(self):
-        """Start the monitoring thread"""
+        """Start sampling on the shared scheduler"""
         if not self.running:
             self.running = True
-            self.monitor_thread = threading.Thread(target=self._monitor_loop)
-            self.monitor_thread.daemon = True
-            self.monitor_thread.start()
+            if self.gpu_probe:
+                self.gpu_probe.start()
+            self.job = self.scheduler.schedule('system_stats', self._sample)
             
     def stop_monitoring(self):
-        """Stop the monitoring thread"""
+        """Stop sampling; returns at once, without waiting for a sample in progress"""
         self.running = False
-        if self.monitor_thread:
-            self.monitor_thread.join()
+        if self.job:
+            self.scheduler.cancel(self.job)
+            self.job = None
+        if self.gpu_probe:
+            self.gpu_probe.close()
             
-    def _monitor_loop(self):
-        """Main monitoring loop"""
-        while self.running:
-            stats = self._collect_stats()
-            self.stats_updated.emit(stats)
-            time.sleep(self.update_interval)
+    def _wake(self):
+        """Sample now instead of sleeping out the old deadlines"""
+        job = self.job
+        if job:
+            self.scheduler.wake(job)
+            
+    def _sample(self):
+        """Collect and publish one snapshot, then get the seconds until the next is due"""
+        snapshot = self._collect_stats()
+        self.history.record(snapshot)
+        self.snapshot_updated.emit(snapshot)
+        # Only build the legacy dict when something still listens for it
+        if self.receivers(self.stats_updated) > 0:
+            self.stats_updated.emit(snapshot.to_dict())
+        
+        next_deadline = min(c.deadline for c in self.cadences.values())
+        if self.process_tracking:
+            next_deadline = min(next_deadline, self.process_cadence.deadline)
+        return next_deadline - time.monotonic()
             
     def _collect_stats(self):
-        """Collect current system statistics"""
-        stats = {
-            'cpu': self._get_cpu_stats(),
-            'memory': self._get_memory_stats(),
-            'gpu': self._get_gpu_stats() if self.gpu_available else None
-        }
-        return stats
+        """Collect the metric families that are due and reuse the rest"""
+        now = time.monotonic()
+        cadences = self.cadences
+        
+        if self.last_cpu is None or cadences['cpu'].is_due(now):
+            self.last_cpu = self._get_cpu_stats()
+            cadences['cpu'].update(self.last_cpu.total_percent, now, self.active)
+            
+        if self.last_memory is None or cadences['memory'].is_due(now):
+            self.last_memory = self._get_memory_stats()
+            cadences['memory'].update(self.last_memory.percent, now, self.active)
+            
+        if 'gpu' in cadences and cadences['gpu'].is_due(now):
+            self.last_gpu = self._get_gpu_stats()
+            loads = [gpu.load for gpu in self.last_gpu or () if gpu.load is not None]
+            load = max(loads) if loads else None
+            cadences['gpu'].update(load, now, self.active)
+            
+        if cadences['disk'].is_due(now):
+            if time.monotonic() - now < DEFER_AFTER:
+                self.last_disk = self._get_disk_stats(now)
+                cadences['disk'].update(self._io_total(self.last_disk), now, self.active)
+            else:
+                cadences['disk'].defer(now)
+            
+        if cadences['net'].is_due(now):
+            if time.monotonic() - now < DEFER_AFTER:
+                self.last_net = self._get_net_stats(now)
+                cadences['net'].update(self._io_total(self.last_net), now, self.active)
+            else:
+                cadences['net'].defer(now)
+            
+        if self.process_tracking and self.process_cadence.is_due(now):
+            if time.monotonic() - now < DEFER_AFTER:
+                self.last_processes = self._get_process_stats()
+                self.process_cadence.update(None, now, self.active)
+            else:
+                self.process_cadence.defer(now)
+        elif not self.process_tracking and self.last_processes is not None:
+            self.last_processes = None
+            self.process_collector.reset()
+            
+        return StatsSnapshot(now, self.last_cpu, self.last_memory, self.last_gpu,
+                             self.last_disk, self.last_net, self.last_processes)
+        
+    def _io_total(self, rates):
+        """Get combined throughput of an IoRates sample in MB/s"""
+        if rates is None:
+            return None
+        totals = rates.totals
+        return sum(totals.get(key, 0.0) for key in
+                   ('read_bytes', 'write_bytes', 'rx_bytes', 'tx_bytes')) / MEGABYTE
         
     def _get_cpu_stats(self):
         """Get CPU usage statistics"""
-        cpu_percent = psutil.cpu_percent(interval=None, percpu=True)
-        cpu_freq = psutil.cpu_freq()
-        cpu_count = psutil.cpu_count()
-        
-        return {
-            'percent_per_core': cpu_percent,
-            'total_percent': sum(cpu_percent) / len(cpu_percent),
-            'frequency': {
-                'current': cpu_freq.current if cpu_freq else None,
-                'min': cpu_freq.min if cpu_freq else None,
-                'max': cpu_freq.max if cpu_freq else None
-            },
-            'cores': cpu_count
-        }
+        return self.backend.cpu_stats()
         
     def _get_memory_stats(self):
         """Get memory usage statistics"""
-        memory = psutil.virtual_memory()
-        swap = psutil.swap_memory()
-        
-        return {
-            'total': memory.total,
-            'available': memory.available,
-            'used': memory.used,
-            'percent': memory.percent,
-            'swap': {
-                'total': swap.total,
-                'used': swap.used,
-                'free': swap.free,
-                'percent': swap.percent
-            }
-        }
+        return self.backend.memory_stats()
         
+    def _get_disk_stats(self, now):
+        """Get per-disk read/write rates"""
+        try:
+            return self.disk_collector.sample(now)
+        except Exception:
+            return None
+            
+    def _get_net_stats(self, now):
+        """Get per-interface network rates"""
+        try:
+            return self.net_collector.sample(now)
+        except Exception:
+            return None
+            
+    def _get_process_stats(self):
+        """Get the top processes by CPU and memory"""
+        try:
+            return self.process_collector.sample()
+        except Exception:
+            return None
+            
     def _get_gpu_stats(self):
         """Get GPU usage statistics if available"""
         try:
-            import GPUtil
-            gpus = GPUtil.getGPUs()
-            if gpus:
-                return [{
-                    'id': gpu.id,
-                    'name': gpu.name,
-                    'load': gpu.load * 100,  # Convert to percentage
-                    'memory': {
-                        'total': gpu.memoryTotal,
-                        'used': gpu.memoryUsed,
-                        'free': gpu.memoryFree
-                    },
-                    'temperature': gpu.temperature
-                } for gpu in gpus]
+            return self.gpu_probe.read()
         except Exception:
             return None
             
     def set_update_interval(self, interval):
-        """Set the update interval in seconds"""
-        self.update_interval = max(0.1, interval) 
\ No newline at end of file
+        """Set the update interval in seconds used while the HUD is visible"""
+        self.update_interval = max(0.1, interval)
+        for name in ('cpu', 'memory', 'disk', 'net'):
+            self.cadences[name].visible = self.update_interval
+        
+    def set_watched(self, watcher, watching):
+        """Tell the sampler whether a widget showing the stats is visible"""
+        self.watchers.set_watched(watcher, watching)
+        
+    def _on_watched_changed(self, watched):
+        """Speed up on show and drop to the hidden cadence when nothing is visible"""
+        self.active = watched
+        now = time.monotonic()
+        for cadence in self.cadences.values():
+            if watched:
+                # Refresh promptly when the HUD comes back
+                cadence.reset(now)
+            else:
+                cadence.relax(now)
+        # Let the job pick up the new deadlines instead of sleeping out the old ones
+        self._wake()
+        
+    def set_process_tracking(self, enabled):
+        """Enable or disable the top processes collector"""
+        if enabled == self.process_tracking:
+            return
+        self.process_tracking = enabled
+        if enabled:
+            self.process_cadence.reset()
+            self._wake()
+        
+    def get_history(self, metric, window='1m'):
+        """Get recorded samples for a metric (e.g. 'cpu.total') over a window"""
+        return self.history.get(metric, window)
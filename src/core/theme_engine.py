@@ -1,6 +1,7 @@
 from PyQt5.QtGui import QColor, QPalette
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication
+from core.theme_styles import SCOPE_PROPERTY, WIDGET_STYLES
 import json
 import os
 
@@ -11,6 +12,8 @@ class ThemeEngine:
         self.opacity = self.settings.get('opacity', 0.8)
         self.themes = self._load_themes()
         self.current_theme = self.settings.get_theme()
+        # Compiled widget stylesheets keyed by (widget scope, theme name, font size)
+        self.style_sheet_cache = {}
         
     def _load_themes(self):
         """Load themes from themes directory"""
@@ -115,6 +118,44 @@ class ThemeEngine:
             return True
         return False
         
+    def _style_values(self):
+        """Get the values the widget style templates are formatted with"""
+        theme = self.get_theme()
+        font_size = theme['font_size']
+        border_radius = theme['border_radius']
+        values = dict(theme['colors'])
+        values.update(
+            font_family=theme['font_family'],
+            font_size=font_size,
+            title_font_size=font_size + 2,
+            large_font_size=font_size + 8,
+            small_font_size=font_size - 2,
+            tiny_font_size=font_size - 4,
+            border_radius=border_radius,
+            inner_radius=border_radius - 2
+        )
+        return values
+        
+    def compile_style_sheet(self, scope):
+        """Get a widget's stylesheet in the current theme, compiled once per theme and font size
+        
+        Opacity is not part of the key: it is applied with setWindowOpacity, not QSS.
+        """
+        key = (scope, self.current_theme, self.get_theme()['font_size'])
+        style_sheet = self.style_sheet_cache.get(key)
+        if style_sheet is None:
+            style_sheet = WIDGET_STYLES[scope].format(
+                scope=f'*[{SCOPE_PROPERTY}="{scope}"]', **self._style_values())
+            self.style_sheet_cache[key] = style_sheet
+        return style_sheet
+        
+    def style_widget(self, widget, scope):
+        """Give a widget its compiled stylesheet, leaving it alone if that is unchanged"""
+        widget.setProperty(SCOPE_PROPERTY, scope)
+        style_sheet = self.compile_style_sheet(scope)
+        if widget.styleSheet() != style_sheet:
+            widget.setStyleSheet(style_sheet)
+            
     def get_theme_css(self):
         """Get CSS styles for current theme"""
         theme = self.get_theme()
@@ -271,6 +312,7 @@ class ThemeEngine:
             'font_size': font_size,
             'padding': 8
         }
+        self.style_sheet_cache.clear()
         self.save_themes()
         
     def save_themes(self):
@@ -292,6 +334,7 @@ class ThemeEngine:
                 with open(theme_file, 'r') as f:
                     custom_themes = json.load(f)
                     self.themes.update(custom_themes)
+                    self.style_sheet_cache.clear()
         except Exception as e:
             print(f"Failed to load themes: {e}")
             
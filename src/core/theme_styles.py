@@ -0,0 +1,291 @@
+# Widgets set this dynamic property; their stylesheet selectors are scoped by it
+SCOPE_PROPERTY = 'hudWidget'
+
+def _base(selector):
+    """Template for the plain look ThemeEngine.get_style_sheet gives a widget type"""
+    return f"""
+            {selector} {{{{
+                background-color: {{background}};
+                color: {{text}};
+                border: 1px solid {{border}};
+                border-radius: {{border_radius}}px;
+                font-family: {{font_family}};
+                font-size: {{font_size}}px;
+            }}}}
+"""
+
+# Rules shared by the tabbed widgets
+_TABBED = """
+            {scope}, {scope} QWidget {{
+                background: {background};
+                color: {foreground};
+                font-size: {font_size}px;
+            }}
+
+            {scope} QFrame#compactFrame {{
+                background: {background};
+                border: 1px solid {border};
+                border-radius: 4px;
+            }}
+
+            {scope} QTabWidget::pane {{
+                border: 1px solid {border};
+                border-radius: 4px;
+            }}
+
+            {scope} QTabBar::tab {{
+                background: {background};
+                color: {foreground};
+                border: 1px solid {border};
+                padding: 5px 10px;
+                border-top-left-radius: 4px;
+                border-top-right-radius: 4px;
+            }}
+
+            {scope} QTabBar::tab:selected {{
+                background: {accent};
+                color: {background};
+            }}
+
+            {scope} QPushButton#modeButton {{
+                background: transparent;
+                border: none;
+                color: {accent};
+                font-size: 14px;
+            }}
+
+            {scope} QLabel#headerTitle {{
+                color: {accent};
+                font-weight: bold;
+            }}
+"""
+
+# QSS templates per widget, formatted with the theme's colors and sizes;
+# {scope} selects the widget whose SCOPE_PROPERTY matches the key
+WIDGET_STYLES = {
+    'clipboard': """
+            {scope} QFrame#clipboardFrame {{
+                background-color: {background};
+                border: 1px solid {border};
+                border-radius: {border_radius}px;
+            }}
+
+            {scope} QLabel#clipboardTitle {{
+                color: {accent};
+                font-weight: bold;
+                font-size: {title_font_size}px;
+            }}
+
+            {scope} QListView {{
+                background-color: {background};
+                border: 1px solid {border};
+                border-radius: {border_radius}px;
+                color: {text};
+            }}
+            {scope} QListView::item {{
+                padding: 5px;
+                border-bottom: 1px solid {border};
+            }}
+            {scope} QListView::item:selected {{
+                background-color: {accent};
+                color: {background};
+            }}
+            {scope} QListView::item:hover {{
+                background-color: {accent_secondary};
+            }}
+""" + _base('{scope} QLineEdit') + """
+            {scope} QLineEdit:focus {{
+                border: 2px solid {accent};
+            }}
+""" + _base('{scope} QPushButton') + """
+            {scope} QPushButton:hover {{
+                background-color: {accent};
+                color: {background};
+            }}
+            {scope} QPushButton:pressed {{
+                background-color: {accent_secondary};
+            }}
+""",
+    'focus_timer': """
+            {scope} QFrame#timerFrame {{
+                background-color: {background};
+                border: 1px solid {border};
+                border-radius: {border_radius}px;
+            }}
+
+            {scope} QLabel#timerTitle {{
+                color: {accent};
+                font-weight: bold;
+                font-size: {title_font_size}px;
+            }}
+
+            {scope} QLabel#timeLabel {{
+                color: {text};
+                font-size: {large_font_size}px;
+                font-weight: bold;
+            }}
+
+            {scope} QLabel#statusLabel, {scope} QLabel#statsLabel {{
+                color: {text_secondary};
+                font-size: {font_size}px;
+            }}
+
+            {scope} QProgressBar {{
+                border: 1px solid {border};
+                border-radius: {border_radius}px;
+                text-align: center;
+                background-color: {background};
+            }}
+            {scope} QProgressBar::chunk {{
+                background-color: {accent};
+                border-radius: {border_radius}px;
+            }}
+""" + _base('{scope} QPushButton') + """
+            {scope} QPushButton:hover {{
+                background-color: {accent};
+                color: {background};
+            }}
+            {scope} QPushButton:pressed {{
+                background-color: {accent_secondary};
+            }}
+""",
+    'system_stats': _TABBED + """
+            {scope} QFrame#statsGroup {{
+                background: {background};
+                border: 1px solid {border};
+                border-radius: 4px;
+                padding: 5px;
+            }}
+
+            {scope} QProgressBar {{
+                border: 1px solid {border};
+                border-radius: 2px;
+                background: {background};
+            }}
+
+            {scope} QProgressBar::chunk {{
+                background: {accent};
+            }}
+""",
+    'github': _TABBED + """
+            {scope} QListWidget {{
+                border: 1px solid {border};
+                border-radius: 4px;
+            }}
+
+            {scope} QListWidget::item {{
+                padding: 5px;
+            }}
+
+            {scope} QListWidget::item:selected {{
+                background: {accent};
+                color: {background};
+            }}
+
+            {scope} QPushButton {{
+                background: {accent};
+                color: {background};
+                border: none;
+                padding: 5px;
+                border-radius: 2px;
+            }}
+
+            {scope} QPushButton:hover {{
+                background: {foreground};
+            }}
+
+            {scope} QLabel#countLabel {{
+                font-size: 18px;
+                font-weight: bold;
+                color: {accent};
+            }}
+""",
+    'settings': _TABBED + """
+            {scope} QGroupBox {{
+                border: 1px solid {border};
+                border-radius: 4px;
+                margin-top: 0.5em;
+                padding-top: 0.5em;
+            }}
+
+            {scope} QGroupBox::title {{
+                color: {accent};
+                subcontrol-origin: margin;
+                left: 10px;
+                padding: 0 3px 0 3px;
+            }}
+
+            {scope} QPushButton {{
+                background: {accent};
+                color: {background};
+                border: none;
+                padding: 5px;
+                border-radius: 2px;
+            }}
+
+            {scope} QPushButton:hover {{
+                background: {foreground};
+            }}
+
+            {scope} QPushButton#saveButton {{
+                background: {accent};
+                color: {background};
+                font-weight: bold;
+                padding: 8px;
+                margin-top: 10px;
+            }}
+
+            {scope} QPushButton#saveButton:disabled {{
+                background: {border};
+                color: {foreground};
+            }}
+
+            {scope} QLineEdit, {scope} QSpinBox, {scope} QComboBox {{
+                background: {background};
+                border: 1px solid {border};
+                border-radius: 2px;
+                padding: 2px;
+            }}
+
+            {scope} QPushButton#themeButton {{
+                background: {accent};
+                color: {background};
+                border-radius: 10px;
+                min-width: 20px;
+                min-height: 20px;
+            }}
+""",
+    'spotify': """
+            {scope} QFrame#SpotifyFrame {{
+                background-color: {background};
+                border: 1px solid {border};
+                border-radius: {border_radius}px;
+            }}
+            {scope} QLabel#TitleLabel {{
+                color: {text};
+                font-weight: bold;
+                font-size: {font_size}px;
+                font-family: {font_family};
+            }}
+            {scope} QLabel#SourceLabel {{
+                color: {accent};
+                font-size: {tiny_font_size}px;
+                font-weight: bold;
+                letter-spacing: 1px;
+                font-family: {font_family};
+            }}
+            {scope} QPushButton {{
+                background: transparent;
+                color: {text};
+                font-size: {small_font_size}px;
+                border: 1px solid {border};
+                border-radius: {inner_radius}px;
+                padding: 2px 8px;
+            }}
+            {scope} QPushButton:hover {{
+                background-color: {accent_secondary};
+                border: 1px solid {accent};
+                border-radius: {inner_radius}px;
+            }}
+""",
+}
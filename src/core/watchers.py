@@ -0,0 +1,30 @@
+import threading
+
+class WatcherSet:
+    """Tracks which widgets are currently showing a service's data
+
+    Services hold one of these and call `on_change(watched)` whenever they go
+    from having no visible watchers to at least one, or back, so they can
+    pause or slow down their polling while nothing is on screen.
+    """
+
+    def __init__(self, on_change=None):
+        self.on_change = on_change
+        self.watchers = set()
+        self.lock = threading.Lock()
+
+    def set_watched(self, watcher, watching):
+        """Record whether a watcher is currently visible"""
+        key = id(watcher)
+        with self.lock:
+            was_watched = bool(self.watchers)
+            if watching:
+                self.watchers.add(key)
+            else:
+                self.watchers.discard(key)
+            watched = bool(self.watchers)
+        if watched != was_watched and self.on_change:
+            self.on_change(watched)
+
+    def __bool__(self):
+        return bool(self.watchers)
@@ -2,42 +2,38 @@ import sys
 import os
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt
-from core.desktop_integration import DesktopIntegration
-from core.window_manager import WindowManager
-from core.system_stats import SystemStats
-from core.clipboard_manager import ClipboardManager
-from core.focus_timer import FocusTimer
-from core.keybind_manager import KeybindManager
 from core.theme_engine import ThemeEngine
 from core.settings import Settings
-from core.github_manager import GitHubManager
+from core.lazy_registry import LazyRegistry, deferred
 from ui.main_window import MainWindow
 
+def create_focus_timer():
+    """Build the focus timer with its session history"""
+    from core.focus_timer import FocusTimer
+    from core.focus_history import FocusHistory
+    history = FocusHistory()
+    # The summary of recent sessions is only written every few records
+    QApplication.instance().aboutToQuit.connect(history.flush)
+    return FocusTimer(history=history)
+
 class NerdHUD:
     def __init__(self):
         self.app = QApplication(sys.argv)
         self.settings = Settings()
         self.theme_engine = ThemeEngine(self.settings)
         
-        self.desktop_integration = DesktopIntegration()
-        self.window_manager = WindowManager()
-        self.system_stats = SystemStats()
-        self.clipboard_manager = ClipboardManager()
-        self.focus_timer = FocusTimer()
-        self.keybind_manager = KeybindManager()
-        self.github_manager = GitHubManager(self.settings)
+        # Services are imported and built the first time a widget asks for one,
+        # so disabled features cost nothing at startup
+        self.services = LazyRegistry()
+        self.services.register('desktop_integration', deferred('core.desktop_integration', 'DesktopIntegration'))
+        self.services.register('window_manager', deferred('core.window_manager', 'WindowManager'))
+        self.services.register('system_stats', deferred('core.system_stats', 'SystemStats'))
+        self.services.register('clipboard_manager', deferred('core.clipboard_manager', 'ClipboardManager'))
+        self.services.register('focus_timer', create_focus_timer)
+        self.services.register('keybind_manager', deferred('core.keybind_manager', 'KeybindManager'))
+        self.services.register('github_manager', deferred('core.github_manager', 'GitHubManager', self.settings))
         
-        self.main_window = MainWindow(
-            self.desktop_integration,
-            self.window_manager,
-            self.system_stats,
-            self.clipboard_manager,
-            self.focus_timer,
-            self.keybind_manager,
-            self.theme_engine,
-            self.settings,
-            self.github_manager
-        )
+        self.main_window = MainWindow(self.services, self.theme_engine, self.settings)
         
         # Apply initial theme
         self.theme_engine.apply_theme(self.settings.get_theme())
@@ -49,7 +45,8 @@ class NerdHUD:
 
 def main():
     app_dir = os.path.join(os.path.expanduser("~"), ".nerdhud")
-    os.makedirs(app_dir, exist_ok=True)
+    # Holds clipboard history and tokens, so only the user may list or read it
+    os.makedirs(app_dir, mode=0o700, exist_ok=True)
     
     nerdhud = NerdHUD()
     sys.exit(nerdhud.run())
@@ -0,0 +1,137 @@
+from bisect import bisect_left
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+
+DISPLAY_CHARS = 100
+# Display strings kept for rows scrolled past recently
+DISPLAY_CACHE_SIZE = 1024
+# Past this many removals at once, reloading is cheaper than row-by-row signals
+RESET_THRESHOLD = 100
+
+class ClipboardHistoryModel(QAbstractListModel):
+    """Clipboard history as list rows, newest first
+
+    Rows only hold entry ids; the view asks for the rows it paints, and
+    only then is an entry's preview read from the journal and cut down
+    for display. While a filter is set, the rows are the search results
+    in rank order instead of the whole history.
+    """
+
+    def __init__(self, clipboard_manager, parent=None):
+        super().__init__(parent)
+        self.clipboard_manager = clipboard_manager
+        # Entry ids oldest first; ids only grow, so the list stays sorted
+        self.ids = clipboard_manager.get_entry_ids()
+        # Search results best first, or None to show the whole history
+        self.filtered = None
+        self.display_cache = OrderedDict()
+        clipboard_manager.entry_added.connect(self.on_entry_added)
+        clipboard_manager.entries_removed.connect(self.on_entries_removed)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self.filtered is not None:
+            return len(self.filtered)
+        return len(self.ids)
+
+    def entry_id(self, row):
+        """Get the entry id shown at a row"""
+        if self.filtered is not None:
+            return self.filtered[row]
+        return self.ids[len(self.ids) - 1 - row]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < self.rowCount():
+            return None
+        entry_id = self.entry_id(index.row())
+        if role == Qt.DisplayRole:
+            return self.display_text(entry_id)
+        if role == Qt.UserRole:
+            return entry_id
+        return None
+
+    def display_text(self, entry_id):
+        """Get an entry's one-line, truncated display string"""
+        text = self.display_cache.get(entry_id)
+        if text is not None:
+            self.display_cache.move_to_end(entry_id)
+            return text
+        preview = self.clipboard_manager.get_preview(entry_id)
+        if preview is None:
+            return ""
+        text = preview[:DISPLAY_CHARS] + "..." if len(preview) > DISPLAY_CHARS else preview
+        text = text.replace("\n", " ")
+        self.display_cache[entry_id] = text
+        if len(self.display_cache) > DISPLAY_CACHE_SIZE:
+            self.display_cache.popitem(last=False)
+        return text
+
+    def set_filter(self, entry_ids):
+        """Show only these entries, in this order"""
+        self.beginResetModel()
+        self.filtered = [entry_id for entry_id in entry_ids if self._position(entry_id) is not None]
+        self.endResetModel()
+
+    def clear_filter(self):
+        """Show the whole history again"""
+        if self.filtered is not None:
+            self.beginResetModel()
+            self.filtered = None
+            self.endResetModel()
+
+    def is_filtered(self):
+        return self.filtered is not None
+
+    def reload(self):
+        """Take a fresh copy of the history's entry ids"""
+        self.beginResetModel()
+        self.ids = self.clipboard_manager.get_entry_ids()
+        if self.filtered is not None:
+            self.filtered = [entry_id for entry_id in self.filtered
+                             if self._position(entry_id) is not None]
+        self.display_cache.clear()
+        self.endResetModel()
+
+    def _position(self, entry_id):
+        """Get an entry's position in self.ids, or None"""
+        position = bisect_left(self.ids, entry_id)
+        if position < len(self.ids) and self.ids[position] == entry_id:
+            return position
+        return None
+
+    def on_entry_added(self, entry_id):
+        """Insert a new entry at the top"""
+        if self.ids and entry_id <= self.ids[-1]:
+            # Already in the copy taken when the model was loaded
+            return
+        if self.filtered is not None:
+            # Search results are refreshed by whoever set the filter
+            self.ids.append(entry_id)
+            return
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self.ids.append(entry_id)
+        self.endInsertRows()
+
+    def on_entries_removed(self, entry_ids):
+        """Drop rows for entries removed from the history"""
+        if len(entry_ids) > RESET_THRESHOLD:
+            self.reload()
+            return
+        for entry_id in entry_ids:
+            self.display_cache.pop(entry_id, None)
+            position = self._position(entry_id)
+            if position is None:
+                continue
+            if self.filtered is None:
+                row = len(self.ids) - 1 - position
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.ids[position]
+                self.endRemoveRows()
+                continue
+            del self.ids[position]
+            if entry_id in self.filtered:
+                row = self.filtered.index(entry_id)
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.filtered[row]
+                self.endRemoveRows()
@@ -1,32 +1,41 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QLabel, QSystemTrayIcon, QMenu, QApplication)
-from PyQt5.QtCore import Qt, QPoint
+from PyQt5.QtCore import Qt, QPoint, QTimer
 from PyQt5.QtGui import QIcon, QMouseEvent
-from .widgets.system_stats_widget import SystemStatsWidget
-from .widgets.clipboard_widget import ClipboardWidget
-from .widgets.focus_timer_widget import FocusTimerWidget
-from .widgets.settings_widget import SettingsWidget
-from .widgets.github_widget import GitHubWidget
-from ui.widgets.spotify_widget import SpotifyWidget
+from core.lazy_registry import LazyRegistry
+from core.scheduler import shared_scheduler
+
+# Widgets shown at startup and the enabled_widgets setting for each
+STARTUP_WIDGETS = (
+    ('stats_widget', 'system_stats'),
+    ('clipboard_widget', 'clipboard'),
+    ('timer_widget', 'focus_timer'),
+    ('github_widget', 'github'),
+    ('spotify_widget', 'spotify'),
+)
+# The widget_positions setting for each widget
+POSITION_NAMES = {
+    'stats_widget': 'system_stats',
+    'clipboard_widget': 'clipboard',
+    'timer_widget': 'focus_timer',
+    'settings_widget': 'settings',
+    'github_widget': 'github',
+    'spotify_widget': 'spotify',
+}
 
 class MainWindow(QMainWindow):
-    def __init__(self, desktop_integration, window_manager, system_stats,
-                 clipboard_manager, focus_timer, keybind_manager, theme_engine, settings,
-                 github_manager):
+    def __init__(self, services, theme_engine, settings):
         super().__init__()
         
-        self.desktop_integration = desktop_integration
-        self.window_manager = window_manager
-        self.system_stats = system_stats
-        self.clipboard_manager = clipboard_manager
-        self.focus_timer = focus_timer
-        self.keybind_manager = keybind_manager
+        # Services are built by the first widget that needs them
+        self.services = services
         self.theme_engine = theme_engine
         self.settings = settings
-        self.github_manager = github_manager
         
-        # Initialize widgets list
-        self.widgets = {}
+        # Widgets are built the first time they are shown; self.widgets holds the built ones
+        self.widget_registry = LazyRegistry(on_create=self.restore_widget_state)
+        self.widgets = self.widget_registry.instances
+        self.register_widgets()
         
         # Apply initial opacity from settings
         opacity = self.settings.get_opacity()
@@ -36,111 +45,15 @@ class MainWindow(QMainWindow):
         
         self.setup_system_tray()
         
-        self.setup_keybinds()
-        
-        self.start_services()
+        # Only redo work for the settings it depends on
+        self.settings.subscribe(('theme', 'font_size', 'opacity', 'always_on_top'),
+                                self.on_settings_changed)
         
-        # Initialize Spotify widget
-        self.spotify_widget = SpotifyWidget(
-            self.desktop_integration,
-            self.theme_engine,
-            self.settings
-        )
-        # Get saved position or use default
-        x, y = self.settings.get_widget_position('spotify')
-        self.spotify_widget.move(x, y)
-        self.spotify_widget.show()
-        self.spotify_widget.setWindowOpacity(self.settings.get_opacity())
-        self.widgets['spotify_widget'] = self.spotify_widget
-        
-        # Initialize other widgets
-        if self.settings.is_enabled('system_stats'):
-            self.stats_widget = SystemStatsWidget(
-                self.system_stats,
-                self.theme_engine,
-                self.settings
-            )
-            x, y = self.settings.get_widget_position('system_stats')
-            self.stats_widget.move(x, y)
-            self.stats_widget.setWindowFlags(
-                Qt.FramelessWindowHint |
-                Qt.WindowStaysOnBottomHint |
-                Qt.Tool
-            )
-            self.stats_widget.setAttribute(Qt.WA_TranslucentBackground)
-            self.stats_widget.show()
-            self.stats_widget.setWindowOpacity(self.settings.get_opacity())
-            self.widgets['stats_widget'] = self.stats_widget
-            
-        if self.settings.is_enabled('clipboard'):
-            self.clipboard_widget = ClipboardWidget(
-                self.clipboard_manager,
-                self.theme_engine,
-                self.settings
-            )
-            x, y = self.settings.get_widget_position('clipboard')
-            self.clipboard_widget.move(x, y)
-            self.clipboard_widget.setWindowFlags(
-                Qt.FramelessWindowHint |
-                Qt.WindowStaysOnBottomHint |
-                Qt.Tool
-            )
-            self.clipboard_widget.setAttribute(Qt.WA_TranslucentBackground)
-            self.clipboard_widget.show()
-            self.clipboard_widget.setWindowOpacity(self.settings.get_opacity())
-            self.widgets['clipboard_widget'] = self.clipboard_widget
-            
-        if self.settings.is_enabled('focus_timer'):
-            self.timer_widget = FocusTimerWidget(
-                self.focus_timer,
-                self.theme_engine,
-                self.settings
-            )
-            x, y = self.settings.get_widget_position('focus_timer')
-            self.timer_widget.move(x, y)
-            self.timer_widget.setWindowFlags(
-                Qt.FramelessWindowHint |
-                Qt.WindowStaysOnBottomHint |
-                Qt.Tool
-            )
-            self.timer_widget.setAttribute(Qt.WA_TranslucentBackground)
-            self.timer_widget.show()
-            self.timer_widget.setWindowOpacity(self.settings.get_opacity())
-            self.widgets['timer_widget'] = self.timer_widget
-            
-        self.settings_widget = SettingsWidget(
-            self.settings,
-            self.theme_engine,
-            self.keybind_manager
-        )
-        x, y = self.settings.get_widget_position('settings')
-        self.settings_widget.move(x, y)
-        self.settings_widget.hide()
-        self.settings_widget.setWindowOpacity(self.settings.get_opacity())
-        self.widgets['settings_widget'] = self.settings_widget
-        self.settings_widget.settings_changed.connect(self.on_settings_changed)
-        
-        # GitHub Widget
-        if self.settings.is_enabled('github'):
-            self.github_widget = GitHubWidget(
-                self.github_manager,
-                self.theme_engine,
-                self.settings
-            )
-            x, y = self.settings.get_widget_position('github')
-            self.github_widget.move(x, y)
-            self.github_widget.setWindowFlags(
-                Qt.FramelessWindowHint |
-                Qt.WindowStaysOnBottomHint |
-                Qt.Tool
-            )
-            self.github_widget.setAttribute(Qt.WA_TranslucentBackground)
-            self.github_widget.show()
-            self.github_widget.setWindowOpacity(self.settings.get_opacity())
-            self.widgets['github_widget'] = self.github_widget
-            
-        # Start GitHub monitoring after all widgets are initialized
-        self.github_manager.start_monitoring()
+        # Build the startup widgets once the event loop runs, one per pass, so the
+        # first one is painted before the rest (and any network service) get going
+        self.pending_widgets = [name for name, setting in STARTUP_WIDGETS
+                                if self.settings.is_enabled(setting)]
+        QTimer.singleShot(0, self.show_next_widget)
         
     def init_ui(self):
         """Initialize the user interface"""
@@ -158,101 +71,90 @@ class MainWindow(QMainWindow):
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.setSpacing(0)
         
-        self.create_widgets()
-        
         self.apply_theme()
         
-        self.restore_window_state()
-        
-    def create_widgets(self):
-        """Create and setup widgets"""
-        if self.settings.is_enabled('system_stats'):
-            self.stats_widget = SystemStatsWidget(
-                self.system_stats,
-                self.theme_engine,
-                self.settings
-            )
-            x, y = self.settings.get_widget_position('system_stats')
-            self.stats_widget.move(x, y)
-            self.stats_widget.setWindowFlags(
-                Qt.FramelessWindowHint |
-                Qt.WindowStaysOnBottomHint |
-                Qt.Tool
-            )
-            self.stats_widget.setAttribute(Qt.WA_TranslucentBackground)
-            self.stats_widget.show()
-            self.stats_widget.setWindowOpacity(self.settings.get_opacity())
-            self.widgets['stats_widget'] = self.stats_widget
-            
-        if self.settings.is_enabled('clipboard'):
-            self.clipboard_widget = ClipboardWidget(
-                self.clipboard_manager,
-                self.theme_engine,
-                self.settings
-            )
-            x, y = self.settings.get_widget_position('clipboard')
-            self.clipboard_widget.move(x, y)
-            self.clipboard_widget.setWindowFlags(
-                Qt.FramelessWindowHint |
-                Qt.WindowStaysOnBottomHint |
-                Qt.Tool
-            )
-            self.clipboard_widget.setAttribute(Qt.WA_TranslucentBackground)
-            self.clipboard_widget.show()
-            self.clipboard_widget.setWindowOpacity(self.settings.get_opacity())
-            self.widgets['clipboard_widget'] = self.clipboard_widget
+    def register_widgets(self):
+        """Register how to build each widget
+        
+        Each widget module is imported by its factory, so a disabled widget's
+        module and the packages behind it are never loaded.
+        """
+        self.widget_registry.register('stats_widget', self.create_stats_widget)
+        self.widget_registry.register('clipboard_widget', self.create_clipboard_widget)
+        self.widget_registry.register('timer_widget', self.create_timer_widget)
+        self.widget_registry.register('settings_widget', self.create_settings_widget)
+        self.widget_registry.register('github_widget', self.create_github_widget)
+        self.widget_registry.register('spotify_widget', self.create_spotify_widget)
+        
+    def show_next_widget(self):
+        """Build and show one startup widget, leaving the rest for later event loop passes"""
+        if self.pending_widgets:
+            self.widget_registry.get(self.pending_widgets.pop(0)).show()
+            QTimer.singleShot(0, self.show_next_widget)
+        else:
+            self.start_background_services()
             
-        if self.settings.is_enabled('focus_timer'):
-            self.timer_widget = FocusTimerWidget(
-                self.focus_timer,
-                self.theme_engine,
-                self.settings
-            )
-            x, y = self.settings.get_widget_position('focus_timer')
-            self.timer_widget.move(x, y)
-            self.timer_widget.setWindowFlags(
-                Qt.FramelessWindowHint |
-                Qt.WindowStaysOnBottomHint |
-                Qt.Tool
-            )
-            self.timer_widget.setAttribute(Qt.WA_TranslucentBackground)
-            self.timer_widget.show()
-            self.timer_widget.setWindowOpacity(self.settings.get_opacity())
-            self.widgets['timer_widget'] = self.timer_widget
+    def start_background_services(self):
+        """Start the services that wait on the OS or the network, after the widgets are up"""
+        self.setup_keybinds()
+        
+        github_manager = self.services.created('github_manager')
+        if github_manager is not None:
+            # Connects to GitHub on its own thread
+            github_manager.start_monitoring()
             
-        self.settings_widget = SettingsWidget(
-            self.settings,
-            self.theme_engine,
-            self.keybind_manager
+    def place_hud_widget(self, widget):
+        """Make a desktop widget frameless"""
+        widget.setWindowFlags(
+            Qt.FramelessWindowHint |
+            Qt.WindowStaysOnBottomHint |
+            Qt.Tool
         )
-        x, y = self.settings.get_widget_position('settings')
-        self.settings_widget.move(x, y)
-        self.settings_widget.hide()
-        self.settings_widget.setWindowOpacity(self.settings.get_opacity())
-        self.widgets['settings_widget'] = self.settings_widget
-        self.settings_widget.settings_changed.connect(self.on_settings_changed)
-        
-        # GitHub Widget
-        if self.settings.is_enabled('github'):
-            self.github_widget = GitHubWidget(
-                self.github_manager,
-                self.theme_engine,
-                self.settings
-            )
-            x, y = self.settings.get_widget_position('github')
-            self.github_widget.move(x, y)
-            self.github_widget.setWindowFlags(
-                Qt.FramelessWindowHint |
-                Qt.WindowStaysOnBottomHint |
-                Qt.Tool
-            )
-            self.github_widget.setAttribute(Qt.WA_TranslucentBackground)
-            self.github_widget.show()
-            self.github_widget.setWindowOpacity(self.settings.get_opacity())
-            self.widgets['github_widget'] = self.github_widget
-            
-        # Start GitHub monitoring after all widgets are initialized
-        self.github_manager.start_monitoring()
+        widget.setAttribute(Qt.WA_TranslucentBackground)
+        widget.setWindowOpacity(self.settings.get_opacity())
+        return widget
+        
+    def create_stats_widget(self):
+        """Create the system stats widget and start sampling"""
+        from ui.widgets.system_stats_widget import SystemStatsWidget
+        system_stats = self.services.get('system_stats')
+        widget = SystemStatsWidget(system_stats, self.theme_engine, self.settings)
+        system_stats.start_monitoring()
+        return self.place_hud_widget(widget)
+        
+    def create_clipboard_widget(self):
+        """Create the clipboard widget and start watching the clipboard"""
+        from ui.widgets.clipboard_widget import ClipboardWidget
+        clipboard_manager = self.services.get('clipboard_manager')
+        widget = ClipboardWidget(clipboard_manager, self.theme_engine, self.settings)
+        clipboard_manager.start_monitoring()
+        return self.place_hud_widget(widget)
+        
+    def create_timer_widget(self):
+        """Create the focus timer widget"""
+        from ui.widgets.focus_timer_widget import FocusTimerWidget
+        widget = FocusTimerWidget(self.services.get('focus_timer'), self.theme_engine, self.settings)
+        return self.place_hud_widget(widget)
+        
+    def create_github_widget(self):
+        """Create the GitHub widget"""
+        from ui.widgets.github_widget import GitHubWidget
+        widget = GitHubWidget(self.services.get('github_manager'), self.theme_engine, self.settings)
+        return self.place_hud_widget(widget)
+        
+    def create_spotify_widget(self):
+        """Create the Spotify widget"""
+        from ui.widgets.spotify_widget import SpotifyWidget
+        widget = SpotifyWidget(self.services.get('desktop_integration'), self.theme_engine, self.settings)
+        widget.setWindowOpacity(self.settings.get_opacity())
+        return widget
+        
+    def create_settings_widget(self):
+        """Create the settings window"""
+        from ui.widgets.settings_widget import SettingsWidget
+        widget = SettingsWidget(self.settings, self.theme_engine, self.services.get('keybind_manager'))
+        widget.setWindowOpacity(self.settings.get_opacity())
+        return widget
         
     def setup_system_tray(self):
         """Setup system tray icon and menu"""
@@ -293,12 +195,14 @@ class MainWindow(QMainWindow):
             
     def setup_keybinds(self):
         """Setup global hotkeys"""
+        keybind_manager = self.services.get('keybind_manager')
+        
         # Toggle visibility
         toggle_key = self.settings.get_keybind("toggle_visibility")
         if not toggle_key:
             toggle_key = "ctrl+alt+h"
             self.settings.set_keybind("toggle_visibility", toggle_key)
-        self.keybind_manager.register_hotkey(
+        keybind_manager.register_hotkey(
             "toggle_visibility",
             toggle_key,
             self.toggle_visibility
@@ -309,7 +213,7 @@ class MainWindow(QMainWindow):
         if not focus_key:
             focus_key = "ctrl+alt+t"
             self.settings.set_keybind("focus_timer_start", focus_key)
-        self.keybind_manager.register_hotkey(
+        keybind_manager.register_hotkey(
             "focus_timer_start",
             focus_key,
             self.toggle_focus_timer
@@ -320,23 +224,15 @@ class MainWindow(QMainWindow):
         if not clipboard_key:
             clipboard_key = "ctrl+alt+c"
             self.settings.set_keybind("clipboard_history", clipboard_key)
-        self.keybind_manager.register_hotkey(
+        keybind_manager.register_hotkey(
             "clipboard_history",
             clipboard_key,
             self.toggle_clipboard_history
         )
         
         # Start monitoring
-        self.keybind_manager.start_monitoring()
+        keybind_manager.start_monitoring()
         
-    def start_services(self):
-        """Start background services"""
-        if self.settings.is_enabled('system_stats'):
-            self.system_stats.start_monitoring()
-            
-        if self.settings.is_enabled('clipboard'):
-            self.clipboard_manager.start_monitoring()
-            
     def apply_theme(self):
         """Apply current theme to all widgets"""
         theme = self.settings.get_theme()
@@ -349,25 +245,21 @@ class MainWindow(QMainWindow):
             widget.setWindowOpacity(opacity)
             widget.apply_theme()
                 
-    def restore_window_state(self):
-        """Restore window position and state"""
-        # Load widget positions from settings
-        for widget in self.widgets.values():
-            name = widget.__class__.__name__.lower()
-            x, y = self.settings.get_widget_position(name)
-            widget.move(x, y)
+    def restore_widget_state(self, name, widget):
+        """Move a widget that was just built to its saved position"""
+        x, y = self.settings.get_widget_position(POSITION_NAMES[name])
+        widget.move(x, y)
         
     def save_window_state(self):
         """Save window position and state"""
-        # Save widget positions
-        for widget in self.widgets.values():
-            name = widget.__class__.__name__.lower()
-            self.settings.set_widget_position(name, widget.x(), widget.y())
+        # Save the positions of the widgets that were built
+        for name, widget in self.widgets.items():
+            self.settings.set_widget_position(POSITION_NAMES[name], widget.x(), widget.y())
             
     def show_all(self):
         """Show all widgets"""
-        for widget in self.widgets.values():
-            if widget != self.settings_widget:  # Don't show settings automatically
+        for name, widget in self.widgets.items():
+            if name != 'settings_widget':  # Don't show settings automatically
                 widget.show()
                 
     def hide_all(self):
@@ -377,36 +269,42 @@ class MainWindow(QMainWindow):
             
     def toggle_visibility(self):
         """Toggle visibility of all widgets"""
-        if any(widget.isVisible() for widget in self.widgets.values() if widget != self.settings_widget):
+        if any(widget.isVisible() for name, widget in self.widgets.items() if name != 'settings_widget'):
             self.hide_all()
         else:
             self.show_all()
             
     def toggle_focus_timer(self):
         """Toggle focus timer"""
-        if hasattr(self, 'timer_widget'):
-            self.timer_widget.toggle_timer()
+        timer_widget = self.widget_registry.created('timer_widget')
+        if timer_widget is not None:
+            timer_widget.toggle_timer()
             
     def toggle_clipboard_history(self):
         """Toggle clipboard history widget"""
-        if hasattr(self, 'clipboard_widget'):
-            self.clipboard_widget.toggle_visibility()
+        clipboard_widget = self.widget_registry.created('clipboard_widget')
+        if clipboard_widget is not None:
+            clipboard_widget.toggle_visibility()
             
     def show_settings(self):
         """Show settings dialog"""
-        self.settings_widget.show()
-        self.settings_widget.set_widget_mode(False)  # Show in window mode
-        self.settings_widget.setWindowOpacity(1.0)  # Full opacity for settings window
+        settings_widget = self.widget_registry.get('settings_widget')
+        settings_widget.show()
+        settings_widget.set_widget_mode(False)  # Show in window mode
+        settings_widget.setWindowOpacity(1.0)  # Full opacity for settings window
         
     def quit_application(self):
         """Clean up and quit the application"""
         # Save window state
         self.save_window_state()
         
-        # Stop services
-        self.system_stats.stop_monitoring()
-        self.clipboard_manager.stop_monitoring()
-        self.keybind_manager.stop_monitoring()
+        # Stop the services that were started
+        for name in ('system_stats', 'clipboard_manager', 'keybind_manager', 'github_manager'):
+            service = self.services.created(name)
+            if service is not None:
+                service.stop_monitoring()
+        # Idle workers exit at once; one busy with a slow poll is a daemon and is not waited for
+        shared_scheduler().shutdown()
         
         # Quit application
         QApplication.quit()
@@ -416,14 +314,21 @@ class MainWindow(QMainWindow):
         event.ignore()  # Prevent closing
         self.hide_all()  # Hide instead of close 
 
-    def on_settings_changed(self):
-        """Handle settings changed signal"""
-        # Apply theme and opacity changes
-        self.apply_theme()
-        
-        # Apply always on top setting
-        if self.settings.get('always_on_top', False):
-            self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
-        else:
-            self.setWindowFlags(self.windowFlags() & ~Qt.WindowStaysOnTopHint)
-        self.show() # Re-show window to apply flags 
\ No newline at end of file
+    def on_settings_changed(self, changes):
+        """Apply changed appearance and behaviour settings"""
+        if 'theme' in changes or 'font_size' in changes:
+            # Restyling also applies the opacity
+            self.apply_theme()
+        elif 'opacity' in changes:
+            opacity = self.settings.get_opacity()
+            self.setWindowOpacity(opacity)
+            for widget in self.widgets.values():
+                widget.setWindowOpacity(opacity)
+        
+        # Changing window flags re-creates the native window, so only do it when needed
+        if 'always_on_top' in changes:
+            if self.settings.get('always_on_top', False):
+                self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
+            else:
+                self.setWindowFlags(self.windowFlags() & ~Qt.WindowStaysOnTopHint)
+            self.show() # Re-show window to apply flags 
\ No newline at end of file
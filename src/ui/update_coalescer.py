@@ -0,0 +1,75 @@
+from PyQt5.QtCore import QObject, QTimer
+
+FRAME_INTERVAL_MS = 16
+
+class UpdateCoalescer(QObject):
+    """Applies widget updates at most once per frame
+
+    Widgets post the latest value for a key instead of touching labels and
+    bars straight from a signal. Posts for a key that is still pending
+    replace the earlier one, so a burst of signals costs a single relayout.
+    The frame timer only runs while something is pending.
+    """
+
+    def __init__(self, interval_ms=FRAME_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.pending = {}
+        self.posted = 0
+        self.dropped = 0
+        self.cancelled = 0
+        self.flushed = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def post(self, key, callback, *args):
+        """Queue `callback(*args)` for the next frame, replacing any pending update for `key`"""
+        self.posted += 1
+        if key in self.pending:
+            self.dropped += 1
+        self.pending[key] = (callback, args)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def cancel(self, key):
+        """Drop a pending update without applying it"""
+        if self.pending.pop(key, None) is not None:
+            self.cancelled += 1
+
+    def flush(self):
+        """Apply every pending update now"""
+        pending = self.pending
+        self.pending = {}
+        for callback, args in pending.values():
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error applying UI update: {e}")
+            self.flushed += 1
+
+    def get_counters(self):
+        """Get how many updates were posted, dropped as superseded, cancelled and applied"""
+        return {
+            'posted': self.posted,
+            'dropped': self.dropped,
+            'cancelled': self.cancelled,
+            'flushed': self.flushed,
+            'pending': len(self.pending)
+        }
+
+    def reset_counters(self):
+        """Zero the posted, dropped, cancelled and flushed counters"""
+        self.posted = 0
+        self.dropped = 0
+        self.cancelled = 0
+        self.flushed = 0
+
+_shared_coalescer = None
+
+def shared_coalescer():
+    """Get the coalescer shared by all HUD widgets"""
+    global _shared_coalescer
+    if _shared_coalescer is None:
+        _shared_coalescer = UpdateCoalescer()
+    return _shared_coalescer
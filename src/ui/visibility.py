@@ -0,0 +1,28 @@
+from PyQt5.QtCore import QObject, QEvent
+
+class VisibilityWatcher(QObject):
+    """Tells services whether a widget showing their data is on screen
+
+    Each service must provide `set_watched(watcher, watching)`.
+    """
+
+    def __init__(self, widget, *services):
+        super().__init__(widget)
+        self.widget = widget
+        self.services = services
+        widget.installEventFilter(self)
+        self.report(widget.isVisible())
+
+    def eventFilter(self, obj, event):
+        """Forward show and hide events (including minimize) to the services"""
+        if obj is self.widget:
+            if event.type() == QEvent.Show:
+                self.report(True)
+            elif event.type() == QEvent.Hide:
+                self.report(False)
+        return False
+
+    def report(self, visible):
+        """Send the widget's visibility to every service"""
+        for service in self.services:
+            service.set_watched(self.widget, visible)
@@ -1,8 +1,11 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QListWidget, QListWidgetItem, QPushButton,
-                             QLineEdit, QFrame)
+                             QListView, QPushButton, QLineEdit, QFrame)
 from PyQt5.QtCore import Qt, pyqtSlot
 from PyQt5.QtGui import QIcon
+from ui.update_coalescer import shared_coalescer
+from ui.clipboard_history_model import ClipboardHistoryModel
+
+LAYOUT_BATCH_SIZE = 1000
 
 class ClipboardWidget(QWidget):
     def __init__(self, clipboard_manager, theme_engine, settings, parent=None):
@@ -10,12 +13,17 @@ class ClipboardWidget(QWidget):
         self.clipboard_manager = clipboard_manager
         self.theme_engine = theme_engine
         self.settings = settings
+        self.coalescer = shared_coalescer()
+        self.history_model = ClipboardHistoryModel(clipboard_manager, self)
+        # The list shows search results instead of the whole history
+        self.searching = False
         
         # Initialize UI
         self.init_ui()
         
         # Connect signals
-        self.clipboard_manager.clipboard_changed.connect(self.on_clipboard_changed)
+        self.clipboard_manager.entry_added.connect(self.on_entry_added)
+        self.clipboard_manager.search_results.connect(self.on_search_results)
         
     def init_ui(self):
         """Initialize the user interface"""
@@ -51,8 +59,14 @@ class ClipboardWidget(QWidget):
         frame_layout.addWidget(self.search_box)
         
         # Add clipboard list
-        self.history_list = QListWidget()
-        self.history_list.itemClicked.connect(self.copy_item)
+        self.history_list = QListView()
+        # Every row is one line, so the view never measures rows it does not paint
+        self.history_list.setUniformItemSizes(True)
+        # Lay out long histories a batch per event loop pass instead of all at once
+        self.history_list.setLayoutMode(QListView.Batched)
+        self.history_list.setBatchSize(LAYOUT_BATCH_SIZE)
+        self.history_list.setModel(self.history_model)
+        self.history_list.clicked.connect(self.copy_item)
         frame_layout.addWidget(self.history_list)
         
         # Add control buttons
@@ -73,113 +87,53 @@ class ClipboardWidget(QWidget):
         # Apply theme
         self.apply_theme()
         
-        # Load initial history
-        self.load_history()
-        
     def apply_theme(self):
         """Apply theme to the widget"""
-        # Apply base widget style
-        self.setStyleSheet(self.theme_engine.get_style_sheet("QWidget"))
-        
-        # Apply frame style
-        frame_style = """
-            QFrame#clipboardFrame {
-                background-color: %s;
-                border: 1px solid %s;
-                border-radius: %dpx;
-            }
-        """ % (
-            self.theme_engine.get_color('background'),
-            self.theme_engine.get_color('border'),
-            self.theme_engine.get_theme()['border_radius']
-        )
-        
-        # Apply title style
-        title_style = """
-            QLabel#clipboardTitle {
-                color: %s;
-                font-weight: bold;
-                font-size: %dpx;
-            }
-        """ % (
-            self.theme_engine.get_color('accent'),
-            self.theme_engine.get_theme()['font_size'] + 2
-        )
-        
-        # Apply list style
-        list_style = """
-            QListWidget {
-                background-color: %s;
-                border: 1px solid %s;
-                border-radius: %dpx;
-                color: %s;
-            }
-            QListWidget::item {
-                padding: 5px;
-                border-bottom: 1px solid %s;
-            }
-            QListWidget::item:selected {
-                background-color: %s;
-                color: %s;
-            }
-            QListWidget::item:hover {
-                background-color: %s;
-            }
-        """ % (
-            self.theme_engine.get_color('background'),
-            self.theme_engine.get_color('border'),
-            self.theme_engine.get_theme()['border_radius'],
-            self.theme_engine.get_color('text'),
-            self.theme_engine.get_color('border'),
-            self.theme_engine.get_color('accent'),
-            self.theme_engine.get_color('background'),
-            self.theme_engine.get_color('accent_secondary')
-        )
-        
-        # Apply search box style
-        search_style = self.theme_engine.get_style_sheet("QLineEdit")
-        
-        # Apply button style
-        button_style = self.theme_engine.get_style_sheet("QPushButton")
+        self.theme_engine.style_widget(self, 'clipboard')
         
-        self.setStyleSheet(frame_style + title_style + list_style + search_style + button_style)
-        
-    def load_history(self):
-        """Load clipboard history into list"""
-        self.history_list.clear()
-        for item in self.clipboard_manager.get_history():
-            self.add_history_item(item)
+    @pyqtSlot(int)
+    def on_entry_added(self, entry_id):
+        """Refresh search results when a new entry may match"""
+        if self.searching:
+            self.coalescer.post((self, 'research'), self.refresh_search)
             
-    def add_history_item(self, text):
-        """Add an item to the history list"""
-        # Truncate text for display
-        display_text = text[:100] + "..." if len(text) > 100 else text
-        display_text = display_text.replace("\n", " ")
-        
-        item = QListWidgetItem(display_text)
-        item.setData(Qt.UserRole, text)  # Store full text
-        self.history_list.insertItem(0, item)  # Add to top of list
-        
-    @pyqtSlot(str)
-    def on_clipboard_changed(self, text):
-        """Handle clipboard content changes"""
-        self.add_history_item(text)
-        
-    def copy_item(self, item):
+    def refresh_search(self):
+        """Run the current search again"""
+        if self.searching:
+            self.clipboard_manager.request_search(self.search_box.text())
+        
+    def copy_item(self, index):
         """Copy selected item back to clipboard"""
-        text = item.data(Qt.UserRole)
-        self.clipboard_manager.copy_to_clipboard(text)
+        text = self.clipboard_manager.get_entry(index.data(Qt.UserRole))
+        if text is not None:
+            self.clipboard_manager.copy_to_clipboard(text)
         
     def clear_history(self):
         """Clear clipboard history"""
         self.clipboard_manager.clear_history()
-        self.history_list.clear()
+        self.history_model.reload()
         
     def filter_history(self, text):
-        """Filter history list based on search text"""
-        for i in range(self.history_list.count()):
-            item = self.history_list.item(i)
-            item.setHidden(text.lower() not in item.data(Qt.UserRole).lower())
+        """Search the whole history in the background as the user types"""
+        if text:
+            self.searching = True
+            self.clipboard_manager.request_search(text)
+        elif self.searching:
+            self.searching = False
+            self.coalescer.cancel((self, 'search'))
+            self.coalescer.cancel((self, 'research'))
+            self.history_model.clear_filter()
+            
+    @pyqtSlot(str, list)
+    def on_search_results(self, query, entry_ids):
+        """Queue search results for the next frame"""
+        self.coalescer.post((self, 'search'), self.show_search_results, query, entry_ids)
+        
+    def show_search_results(self, query, entry_ids):
+        """Show only the search results, best match first"""
+        if not self.searching or query != self.search_box.text():
+            return
+        self.history_model.set_filter(entry_ids)
             
     def toggle_visibility(self):
         """Toggle widget visibility"""
@@ -0,0 +1,211 @@
+from array import array
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtCore import Qt, QRect, QRectF, QSize
+from PyQt5.QtGui import QPainter, QPainterPath, QPen, QColor, QStaticText, QTransform
+
+ROW_HEIGHT = 16
+LABEL_WIDTH = 50
+BAR_HEIGHT = 8
+SPACING = 6
+SPARKLINE_POINTS = 60
+
+class MeterRow:
+    """State of one meter row: current value, its history metric and cached path
+
+    The sparkline shows the metric's 1 minute window from SystemStats'
+    MetricHistory, which records every sample whether or not the row is on
+    screen, so it has no gaps from the time the CPU tab was not shown. The
+    path is kept in sample coordinates (x = sample number, y = percent) and
+    extended with the samples added since the last sync; painting maps the
+    last SPARKLINE_POINTS samples onto the row with a transform. The path is
+    only rebuilt from the samples once it holds twice that many points.
+    """
+    __slots__ = ('label', 'metric', 'value', 'samples', 'count', 'flat_run', 'path', 'path_start')
+
+    def __init__(self, label, metric):
+        self.label = QStaticText(label)
+        self.metric = metric
+        self.value = 0
+        # The newest samples of the window as of the last sync, oldest first
+        self.samples = array('d')
+        # Samples the window had taken in as of the last sync
+        self.count = 0
+        # Samples in a row equal to the newest one; once it covers the whole
+        # sparkline a new equal sample changes nothing on screen
+        self.flat_run = 0
+        self.path = None
+        self.path_start = 0
+
+    def set_value(self, value):
+        """Set the bar's value and report whether it changed"""
+        if value == self.value:
+            return False
+        self.value = value
+        return True
+
+    def add_samples(self, count, added):
+        """Take in the samples added to the history since the last sync
+
+        `count` is how many samples the window has taken in now and `added`
+        the new ones, as MetricHistory.since() returns them. Reports whether
+        the sparkline changed on screen.
+        """
+        new = count - self.count
+        if new <= 0:
+            return False
+        last = self.samples[-1] if self.samples else None
+        was_flat = self.flat_run >= SPARKLINE_POINTS
+        flat_run = self.flat_run
+        for value in added:
+            flat_run = flat_run + 1 if value == last else 1
+            last = value
+        unchanged = was_flat and flat_run == self.flat_run + new
+        self.flat_run = flat_run
+        if new > len(added):
+            # More was added than the window holds: start over from what is left
+            self.samples = array('d', added)
+            self.path = None
+        else:
+            self.samples.extend(added)
+            del self.samples[:-SPARKLINE_POINTS]
+            if self.path is not None:
+                if count - self.path_start > SPARKLINE_POINTS * 2:
+                    self.path = None
+                else:
+                    for x, value in enumerate(added, self.count):
+                        self.path.lineTo(x, value)
+        self.count = count
+        return not unchanged
+
+    def reset(self):
+        """Forget the samples taken in, after the history was cleared"""
+        self.samples, self.count, self.flat_run, self.path = array('d'), 0, 0, None
+
+    def sparkline_path(self):
+        """Get the cached path, rebuilding it from the samples if needed"""
+        if self.path is None:
+            self.path_start = self.count - len(self.samples)
+            path = QPainterPath()
+            for x, value in enumerate(self.samples, self.path_start):
+                if x == self.path_start:
+                    path.moveTo(x, value)
+                else:
+                    path.lineTo(x, value)
+            self.path = path
+        return self.path
+
+class CoreMeterWidget(QWidget):
+    """Per-core usage bars and sparklines painted by a single widget
+
+    Replaces a QProgressBar, QLabel and layout per core. Sparkline paths are
+    cached per row and only rows whose pixels change are invalidated, so an
+    idle core costs nothing per tick. Only rows inside the exposed area are
+    painted, which keeps scrolling cheap on machines with many cores.
+    """
+
+    def __init__(self, core_count, history, parent=None):
+        super().__init__(parent)
+        # The MetricHistory the sparklines are read from
+        self.history = history
+        # Generation of the history the rows' sample counts belong to
+        self.history_generation = None
+        self.rows = [MeterRow(f"Core {i}", f'cpu.core.{i}') for i in range(core_count)]
+        self.rows.append(MeterRow("Total", 'cpu.total'))
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setMinimumHeight(len(self.rows) * ROW_HEIGHT)
+        self.set_colors('#000000', '#ffffff', '#00aaff', '#444444')
+
+    def sizeHint(self):
+        return QSize(300, len(self.rows) * ROW_HEIGHT)
+
+    def set_colors(self, background, foreground, accent, border):
+        """Cache the brushes and pens used for painting"""
+        self.background = QColor(background)
+        self.foreground_pen = QPen(QColor(foreground))
+        self.accent = QColor(accent)
+        self.border_pen = QPen(QColor(border))
+        self.sparkline_pen = QPen(self.accent, 1)
+        self.sparkline_pen.setCosmetic(True)
+        self.update()
+
+    def set_values(self, per_core, total):
+        """Show new usage percentages, catch up with the history and repaint only the rows that changed"""
+        rows = self.rows
+        last = len(rows) - 1
+        generation, updates = self.history.since([(row.metric, row.count) for row in rows],
+                                                 self.history_generation)
+        if generation != self.history_generation:
+            self.history_generation = generation
+            for row in rows:
+                row.reset()
+            self.update()
+        for index, (row, (count, added)) in enumerate(zip(rows, updates)):
+            if index == last:
+                value = total
+            else:
+                value = per_core[index] if index < len(per_core) else None
+            bar_changed = value is not None and row.set_value(int(value))
+            if row.add_samples(count, added) or bar_changed:
+                self.update(self.row_rect(index))
+
+    def row_rect(self, index):
+        """Get the area covered by one row"""
+        return QRect(0, index * ROW_HEIGHT, self.width(), ROW_HEIGHT)
+
+    def _bar_rect(self, index):
+        """Get the outline of a row's usage bar"""
+        width = (self.width() - LABEL_WIDTH - SPACING * 2) // 2
+        top = index * ROW_HEIGHT + (ROW_HEIGHT - BAR_HEIGHT) // 2
+        return QRect(LABEL_WIDTH + SPACING, top, max(width, 0), BAR_HEIGHT)
+
+    def _sparkline_rect(self, index):
+        """Get the area a row's sparkline is drawn in"""
+        bar = self._bar_rect(index)
+        left = bar.right() + SPACING
+        return QRectF(left, index * ROW_HEIGHT + 2,
+                      max(self.width() - left, 0), ROW_HEIGHT - 4)
+
+    def _sparkline_transform(self, row, rect):
+        """Map a row's sample coordinates onto its sparkline area"""
+        step = rect.width() / (SPARKLINE_POINTS - 1)
+        first = row.count - SPARKLINE_POINTS
+        return QTransform(step, 0, 0, -rect.height() / 100,
+                          rect.left() - first * step, rect.bottom())
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        # The region keeps separate rectangles for non-adjacent dirty rows,
+        # unlike event.rect() which is their bounding box
+        for exposed in event.region().rects():
+            painter.fillRect(exposed, self.background)
+            first = max(exposed.top() // ROW_HEIGHT, 0)
+            last = min(exposed.bottom() // ROW_HEIGHT, len(self.rows) - 1)
+            for index in range(first, last + 1):
+                self._paint_row(painter, index)
+
+    def _paint_row(self, painter, index):
+        """Paint the label, bar and sparkline of one row"""
+        row = self.rows[index]
+        top = index * ROW_HEIGHT
+
+        painter.setPen(self.foreground_pen)
+        label_top = top + int(ROW_HEIGHT - row.label.size().height()) // 2
+        painter.drawStaticText(0, label_top, row.label)
+
+        bar = self._bar_rect(index)
+        filled = bar.adjusted(1, 1, 0, 0)
+        filled.setWidth(int((bar.width() - 1) * min(row.value, 100) / 100))
+        painter.fillRect(filled, self.accent)
+        painter.setPen(self.border_pen)
+        painter.drawRect(bar)
+
+        # Older points left of the window are clipped away
+        spark = self._sparkline_rect(index)
+        painter.save()
+        painter.setClipRect(spark)
+        painter.setTransform(self._sparkline_transform(row, spark))
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setPen(self.sparkline_pen)
+        painter.drawPath(row.sparkline_path())
+        painter.restore()
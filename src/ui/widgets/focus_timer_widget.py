@@ -2,6 +2,14 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QFrame, QProgressBar)
 from PyQt5.QtCore import Qt, pyqtSlot
 from PyQt5.QtGui import QIcon
+from ui.update_coalescer import shared_coalescer
+
+def format_duration(seconds):
+    """Format seconds as hours and minutes, e.g. 1h 05m"""
+    minutes = int(seconds) // 60
+    if minutes < 60:
+        return f"{minutes}m"
+    return f"{minutes // 60}h {minutes % 60:02d}m"
 
 class FocusTimerWidget(QWidget):
     def __init__(self, focus_timer, theme_engine, settings, parent=None):
@@ -9,6 +17,7 @@ class FocusTimerWidget(QWidget):
         self.focus_timer = focus_timer
         self.theme_engine = theme_engine
         self.settings = settings
+        self.coalescer = shared_coalescer()
         
         # Initialize UI
         self.init_ui()
@@ -17,6 +26,7 @@ class FocusTimerWidget(QWidget):
         self.focus_timer.time_updated.connect(self.update_time)
         self.focus_timer.timer_completed.connect(self.on_timer_completed)
         self.focus_timer.state_changed.connect(self.on_state_changed)
+        self.focus_timer.history_updated.connect(self.update_history_stats)
         
     def init_ui(self):
         """Initialize the user interface"""
@@ -62,6 +72,13 @@ class FocusTimerWidget(QWidget):
         self.status_label.setAlignment(Qt.AlignCenter)
         frame_layout.addWidget(self.status_label)
         
+        # Add today's, this week's and streak totals
+        self.stats_label = QLabel()
+        self.stats_label.setObjectName("statsLabel")
+        self.stats_label.setAlignment(Qt.AlignCenter)
+        frame_layout.addWidget(self.stats_label)
+        self.render_history_stats()
+        
         # Add control buttons
         button_layout = QHBoxLayout()
         
@@ -91,71 +108,37 @@ class FocusTimerWidget(QWidget):
         
     def apply_theme(self):
         """Apply theme to the widget"""
-        # Apply base widget style
-        self.setStyleSheet(self.theme_engine.get_style_sheet("QWidget"))
-        
-        # Apply frame style
-        frame_style = """
-            QFrame#timerFrame {
-                background-color: %s;
-                border: 1px solid %s;
-                border-radius: %dpx;
-            }
-        """ % (
-            self.theme_engine.get_color('background'),
-            self.theme_engine.get_color('border'),
-            self.theme_engine.get_theme()['border_radius']
-        )
-        
-        # Apply title style
-        title_style = """
-            QLabel#timerTitle {
-                color: %s;
-                font-weight: bold;
-                font-size: %dpx;
-            }
-        """ % (
-            self.theme_engine.get_color('accent'),
-            self.theme_engine.get_theme()['font_size'] + 2
-        )
-        
-        # Apply time label style
-        time_style = """
-            QLabel#timeLabel {
-                color: %s;
-                font-size: %dpx;
-                font-weight: bold;
-            }
-        """ % (
-            self.theme_engine.get_color('text'),
-            self.theme_engine.get_theme()['font_size'] + 8
-        )
-        
-        # Apply status label style
-        status_style = """
-            QLabel#statusLabel {
-                color: %s;
-                font-size: %dpx;
-            }
-        """ % (
-            self.theme_engine.get_color('text_secondary'),
-            self.theme_engine.get_theme()['font_size']
-        )
-        
-        # Apply progress bar style
-        progress_style = self.theme_engine.get_style_sheet("QProgressBar")
-        
-        # Apply button style
-        button_style = self.theme_engine.get_style_sheet("QPushButton")
-        
-        self.setStyleSheet(frame_style + title_style + time_style + status_style + progress_style + button_style)
+        self.theme_engine.style_widget(self, 'focus_timer')
         
     @pyqtSlot(int)
     def update_time(self, seconds):
+        """Queue a time display refresh for the next frame"""
+        self.coalescer.post((self, 'time'), self.render_time)
+        
+    def render_time(self):
         """Update displayed time"""
         self.time_label.setText(self.focus_timer.get_time_string())
         self.progress_bar.setValue(int(self.focus_timer.get_progress()))
         
+    @pyqtSlot()
+    def update_history_stats(self):
+        """Queue a totals refresh for the next frame"""
+        self.coalescer.post((self, 'history'), self.render_history_stats)
+        
+    def render_history_stats(self):
+        """Show today's and this week's focus time and the current streak"""
+        history = self.focus_timer.history
+        if history is None:
+            self.stats_label.hide()
+            return
+        today = history.day_totals()
+        week = history.week_totals()
+        self.stats_label.setText(
+            f"Today {today['work_sessions']} ({format_duration(today['work_seconds'])})"
+            f" | Week {format_duration(week['work_seconds'])}"
+            f" | Streak {history.streak()}d"
+        )
+        
     @pyqtSlot(str)
     def on_timer_completed(self, timer_type):
         """Handle timer completion"""
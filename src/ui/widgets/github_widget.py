@@ -3,6 +3,8 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QListWidget, QListWidgetItem)
 from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QIcon
+from ui.visibility import VisibilityWatcher
+from ui.update_coalescer import shared_coalescer
 
 class GitHubWidget(QWidget):
     def __init__(self, github_manager, theme_engine, settings, parent=None):
@@ -11,10 +13,12 @@ class GitHubWidget(QWidget):
         self.theme_engine = theme_engine
         self.settings = settings
         self.is_widget_mode = True
+        self.coalescer = shared_coalescer()
         
         # Connect signals
         self.github_manager.prs_updated.connect(self.update_prs_list)
         self.github_manager.repos_updated.connect(self.update_repos_count)
+        self.visibility_watcher = VisibilityWatcher(self, self.github_manager)
         
         # Set window flags
         self.setWindowFlags(
@@ -185,12 +189,11 @@ class GitHubWidget(QWidget):
         
     def refresh_all(self):
         """Refresh all GitHub data"""
-        self.github_manager.update_prs()
-        self.github_manager.update_repos()
+        self.github_manager.request_refresh()
         
     def refresh_prs(self):
         """Refresh pull requests list"""
-        self.github_manager.update_prs()
+        self.github_manager.request_refresh()
         
     def create_new_pr(self):
         """Create new pull request"""
@@ -199,89 +202,7 @@ class GitHubWidget(QWidget):
         
     def apply_theme(self):
         """Apply theme to the widget"""
-        colors = {
-            'background': self.theme_engine.get_color('background'),
-            'foreground': self.theme_engine.get_color('foreground'),
-            'accent': self.theme_engine.get_color('accent'),
-            'border': self.theme_engine.get_color('border'),
-        }
-        
-        self.setStyleSheet(f"""
-            QWidget {{
-                background: {colors['background']};
-                color: {colors['foreground']};
-                font-size: {self.theme_engine.get_theme()['font_size']}px;
-            }}
-            
-            QFrame#compactFrame {{
-                background: {colors['background']};
-                border: 1px solid {colors['border']};
-                border-radius: 4px;
-            }}
-            
-            QListWidget {{
-                border: 1px solid {colors['border']};
-                border-radius: 4px;
-            }}
-            
-            QListWidget::item {{
-                padding: 5px;
-            }}
-            
-            QListWidget::item:selected {{
-                background: {colors['accent']};
-                color: {colors['background']};
-            }}
-            
-            QPushButton {{
-                background: {colors['accent']};
-                color: {colors['background']};
-                border: none;
-                padding: 5px;
-                border-radius: 2px;
-            }}
-            
-            QPushButton:hover {{
-                background: {colors['foreground']};
-            }}
-            
-            QTabWidget::pane {{
-                border: 1px solid {colors['border']};
-                border-radius: 4px;
-            }}
-            
-            QTabBar::tab {{
-                background: {colors['background']};
-                color: {colors['foreground']};
-                border: 1px solid {colors['border']}
-                padding: 5px 10px;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }}
-            
-            QTabBar::tab:selected {{
-                background: {colors['accent']};
-                color: {colors['background']};
-            }}
-            
-            QPushButton#modeButton {{
-                background: transparent;
-                border: none;
-                color: {colors['accent']};
-                font-size: 14px;
-            }}
-            
-            QLabel#headerTitle {{
-                color: {colors['accent']};
-                font-weight: bold;
-            }}
-            
-            QLabel#countLabel {{
-                font-size: 18px;
-                font-weight: bold;
-                color: {colors['accent']};
-            }}
-        """)
+        self.theme_engine.style_widget(self, 'github')
         
     def mousePressEvent(self, event):
         """Handle mouse press events for dragging"""
@@ -309,6 +230,10 @@ class GitHubWidget(QWidget):
         
     @pyqtSlot(list)
     def update_prs_list(self, prs):
+        """Queue new PR data for the next frame"""
+        self.coalescer.post((self, 'prs'), self.render_prs_list, prs)
+        
+    def render_prs_list(self, prs):
         """Update PRs list with new data"""
         self.prs_list.clear()
         self.prs_count.setText(str(len(prs)))
@@ -320,5 +245,9 @@ class GitHubWidget(QWidget):
             
     @pyqtSlot(int)
     def update_repos_count(self, count):
+        """Queue a new repository count for the next frame"""
+        self.coalescer.post((self, 'repos'), self.render_repos_count, count)
+        
+    def render_repos_count(self, count):
         """Update repository count"""
         self.repos_count.setText(str(count)) 
\ No newline at end of file
@@ -429,111 +429,7 @@ class SettingsWidget(QWidget):
         
     def apply_theme(self):
         """Apply theme to the widget"""
-        colors = {
-            'background': self.theme_engine.get_color('background'),
-            'foreground': self.theme_engine.get_color('foreground'),
-            'accent': self.theme_engine.get_color('accent'),
-            'border': self.theme_engine.get_color('border'),
-        }
-        
-        self.setStyleSheet(f"""
-            QWidget {{
-                background: {colors['background']};
-                color: {colors['foreground']};
-                font-size: {self.theme_engine.get_theme()['font_size']}px;
-            }}
-            
-            QFrame#compactFrame {{
-                background: {colors['background']};
-                border: 1px solid {colors['border']};
-                border-radius: 4px;
-            }}
-            
-            QGroupBox {{
-                border: 1px solid {colors['border']};
-                border-radius: 4px;
-                margin-top: 0.5em;
-                padding-top: 0.5em;
-            }}
-            
-            QGroupBox::title {{
-                color: {colors['accent']};
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 3px 0 3px;
-            }}
-            
-            QPushButton {{
-                background: {colors['accent']};
-                color: {colors['background']};
-                border: none;
-                padding: 5px;
-                border-radius: 2px;
-            }}
-            
-            QPushButton:hover {{
-                background: {colors['foreground']};
-            }}
-            
-            QPushButton#saveButton {{
-                background: {colors['accent']};
-                color: {colors['background']};
-                font-weight: bold;
-                padding: 8px;
-                margin-top: 10px;
-            }}
-            
-            QPushButton#saveButton:disabled {{
-                background: {colors['border']};
-                color: {colors['foreground']};
-            }}
-            
-            QLineEdit, QSpinBox, QComboBox {{
-                background: {colors['background']};
-                border: 1px solid {colors['border']};
-                border-radius: 2px;
-                padding: 2px;
-            }}
-            
-            QTabWidget::pane {{
-                border: 1px solid {colors['border']};
-                border-radius: 4px;
-            }}
-            
-            QTabBar::tab {{
-                background: {colors['background']};
-                color: {colors['foreground']};
-                border: 1px solid {colors['border']};
-                padding: 5px 10px;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }}
-            
-            QTabBar::tab:selected {{
-                background: {colors['accent']};
-                color: {colors['background']};
-            }}
-            
-            QPushButton#modeButton {{
-                background: transparent;
-                border: none;
-                color: {colors['accent']};
-                font-size: 14px;
-            }}
-            
-            QPushButton#themeButton {{
-                background: {colors['accent']};
-                color: {colors['background']};
-                border-radius: 10px;
-                min-width: 20px;
-                min-height: 20px;
-            }}
-            
-            QLabel#headerTitle {{
-                color: {colors['accent']};
-                font-weight: bold;
-            }}
-        """)
+        self.theme_engine.style_widget(self, 'settings')
         
     def mousePressEvent(self, event):
         """Handle mouse press events for dragging"""
@@ -17,11 +17,14 @@ class SpotifyWidget(QWidget):
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.init_ui()
         self.apply_theme()
+        # Polling only runs while the widget is on screen (see showEvent)
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_song_info)
-        self.timer.start(1000)
-        self.update_song_info()
-        self.settings.settings_changed.connect(self.apply_theme)
+        self.settings.subscribe(('theme', 'font_size'), self.on_theme_changed)
+
+    def on_theme_changed(self, changes):
+        """Restyle when the theme or font size changes"""
+        self.apply_theme()
 
     def init_ui(self):
         main_layout = QVBoxLayout(self)
@@ -79,45 +82,8 @@ class SpotifyWidget(QWidget):
         self.setFixedSize(320, 80)  # Reduced size since we removed the visualizer
 
     def apply_theme(self):
-        theme = self.theme_engine.get_theme()
-        colors = theme['colors']
-        font_family = theme['font_family']
-        font_size = theme['font_size']
-        border_radius = theme['border_radius']
-
-        self.spotify_frame.setStyleSheet(f"""
-            QFrame#SpotifyFrame {{
-                background-color: {colors['background']};
-                border: 1px solid {colors['border']};
-                border-radius: {border_radius}px;
-            }}
-            QLabel#TitleLabel {{
-                color: {colors['text']};
-                font-weight: bold;
-                font-size: {font_size}px;
-                font-family: {font_family};
-            }}
-            QLabel#SourceLabel {{
-                color: {colors['accent']};
-                font-size: {font_size-4}px;
-                font-weight: bold;
-                letter-spacing: 1px;
-                font-family: {font_family};
-            }}
-            QPushButton {{
-                background: transparent;
-                color: {colors['text']};
-                font-size: {font_size-2}px;
-                border: 1px solid {colors['border']};
-                border-radius: {border_radius - 2}px;
-                padding: 2px 8px;
-            }}
-            QPushButton:hover {{
-                background-color: {colors['accent_secondary']};
-                border: 1px solid {colors['accent']};
-                border-radius: {border_radius - 2}px;
-            }}
-        """)
+        """Apply theme to the widget"""
+        self.theme_engine.style_widget(self, 'spotify')
 
     def update_song_info(self):
         song, artist, is_playing = get_spotify_song_info()
@@ -136,6 +102,16 @@ class SpotifyWidget(QWidget):
         else:
             self.song_label.setText("No song playing")
 
+    def showEvent(self, event):
+        # Refresh right away, then keep polling while visible
+        self.update_song_info()
+        self.timer.start(1000)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.drag_position = event.globalPos() - self.frameGeometry().topLeft()
@@ -1,9 +1,13 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QProgressBar, QFrame, QPushButton, QTabWidget,
-                             QMenu, QAction)
+                             QMenu, QAction, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QAbstractItemView, QScrollArea)
 from PyQt5.QtCore import Qt, pyqtSlot, QPoint
 from PyQt5.QtGui import QIcon, QCursor
-import psutil
+from core.io_rates import format_rate
+from ui.visibility import VisibilityWatcher
+from ui.update_coalescer import shared_coalescer
+from ui.widgets.core_meter_widget import CoreMeterWidget
 
 class SystemStatsWidget(QWidget):
     def __init__(self, system_stats, theme_engine, settings, parent=None):
@@ -12,12 +16,14 @@ class SystemStatsWidget(QWidget):
         self.theme_engine = theme_engine
         self.settings = settings
         self.is_widget_mode = True
+        self.coalescer = shared_coalescer()
         
         # Initialize UI
         self.init_ui()
         
         # Connect signals
-        self.system_stats.stats_updated.connect(self.update_stats)
+        self.system_stats.snapshot_updated.connect(self.update_stats)
+        self.visibility_watcher = VisibilityWatcher(self, self.system_stats)
         
     def init_ui(self):
         """Initialize the user interface"""
@@ -54,11 +60,14 @@ class SystemStatsWidget(QWidget):
         self.memory_tab = self.create_memory_tab()
         if self.system_stats.gpu_available:
             self.gpu_tab = self.create_gpu_tab()
+        self.processes_tab = self.create_processes_tab()
         
         self.tab_widget.addTab(self.cpu_tab, "CPU")
         self.tab_widget.addTab(self.memory_tab, "Memory")
         if self.system_stats.gpu_available:
             self.tab_widget.addTab(self.gpu_tab, "GPU")
+        self.tab_widget.addTab(self.processes_tab, "Processes")
+        self.tab_widget.currentChanged.connect(self.update_process_tracking)
         
         self.main_layout.addWidget(self.tab_widget)
         
@@ -79,6 +88,11 @@ class SystemStatsWidget(QWidget):
         if self.system_stats.gpu_available:
             widget_layout.addWidget(self.gpu_compact)
         
+        self.disk_compact = self.create_io_display("DISK")
+        self.net_compact = self.create_io_display("NET")
+        widget_layout.addWidget(self.disk_compact)
+        widget_layout.addWidget(self.net_compact)
+        
         self.main_layout.addWidget(self.widget_view)
         
         # Apply theme
@@ -94,34 +108,14 @@ class SystemStatsWidget(QWidget):
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(5)
         
-        self.cpu_bars = []
-        cpu_count = psutil.cpu_count()
-        
-        for i in range(cpu_count):
-            bar_layout = QHBoxLayout()
-            core_label = QLabel(f"Core {i}")
-            core_label.setFixedWidth(50)
-            bar = QProgressBar()
-            bar.setFixedHeight(8)
-            bar.setTextVisible(False)
-            
-            bar_layout.addWidget(core_label)
-            bar_layout.addWidget(bar)
-            layout.addLayout(bar_layout)
-            
-            self.cpu_bars.append(bar)
-        
-        # Total CPU usage
-        total_layout = QHBoxLayout()
-        total_label = QLabel("Total")
-        total_label.setFixedWidth(50)
-        self.cpu_total_bar = QProgressBar()
-        self.cpu_total_bar.setFixedHeight(8)
-        self.cpu_total_bar.setTextVisible(False)
-        
-        total_layout.addWidget(total_label)
-        total_layout.addWidget(self.cpu_total_bar)
-        layout.addLayout(total_layout)
+        # One painted widget for every core plus the total, scrollable on
+        # machines with more cores than fit in the window
+        self.cpu_meter = CoreMeterWidget(self.system_stats.cpu_count, self.system_stats.history)
+        scroll_area = QScrollArea()
+        scroll_area.setFrameShape(QFrame.NoFrame)
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(self.cpu_meter)
+        layout.addWidget(scroll_area)
         
         return tab
         
@@ -189,6 +183,40 @@ class SystemStatsWidget(QWidget):
         
         return tab
         
+    def create_processes_tab(self):
+        """Create top processes tab"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(5)
+        
+        layout.addWidget(QLabel("Top CPU"))
+        self.top_cpu_table = self.create_process_table()
+        layout.addWidget(self.top_cpu_table)
+        
+        layout.addWidget(QLabel("Top Memory"))
+        self.top_rss_table = self.create_process_table()
+        layout.addWidget(self.top_rss_table)
+        
+        self.process_count_label = QLabel()
+        layout.addWidget(self.process_count_label)
+        
+        return tab
+        
+    def create_process_table(self):
+        """Create a fixed-size table of processes with reusable cells"""
+        rows = self.system_stats.process_collector.top_n
+        table = QTableWidget(rows, 4)
+        table.setHorizontalHeaderLabels(["PID", "Name", "CPU", "RSS"])
+        table.verticalHeader().hide()
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionMode(QAbstractItemView.NoSelection)
+        table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        for row in range(rows):
+            for column in range(4):
+                table.setItem(row, column, QTableWidgetItem(""))
+        return table
+        
     def create_compact_display(self, title):
         """Create a compact stats display for widget mode"""
         frame = QFrame()
@@ -221,6 +249,29 @@ class SystemStatsWidget(QWidget):
         
         return frame
         
+    def create_io_display(self, title):
+        """Create a compact throughput display for widget mode"""
+        frame = QFrame()
+        frame.setObjectName("compactFrame")
+        layout = QHBoxLayout(frame)
+        layout.setContentsMargins(5, 2, 5, 2)
+        layout.setSpacing(5)
+        
+        label = QLabel(title)
+        label.setFixedWidth(30)
+        value = QLabel("-")
+        value.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        
+        layout.addWidget(label)
+        layout.addWidget(value)
+        
+        if title == "DISK":
+            self.disk_compact_value = value
+        elif title == "NET":
+            self.net_compact_value = value
+        
+        return frame
+        
     def set_widget_mode(self, enabled):
         """Switch between widget and window modes"""
         self.is_widget_mode = enabled
@@ -246,8 +297,15 @@ class SystemStatsWidget(QWidget):
             self.setFixedSize(400, 500)
         
         self.mode_button.setText("□" if enabled else "◈")
+        self.update_process_tracking()
         self.show()
         
+    def update_process_tracking(self, *args):
+        """Only scan processes while the process tab is on screen"""
+        tracking = (not self.is_widget_mode and
+                    self.tab_widget.currentWidget() is self.processes_tab)
+        self.system_stats.set_process_tracking(tracking)
+        
     def toggle_mode(self):
         """Toggle between widget and window modes"""
         self.set_widget_mode(not self.is_widget_mode)
@@ -260,99 +318,45 @@ class SystemStatsWidget(QWidget):
             'accent': self.theme_engine.get_color('accent'),
             'border': self.theme_engine.get_color('border'),
         }
+        self.cpu_meter.set_colors(colors['background'], colors['foreground'],
+                                  colors['accent'], colors['border'])
         
-        self.setStyleSheet(f"""
-            QWidget {{
-                background: {colors['background']};
-                color: {colors['foreground']};
-                font-size: {self.theme_engine.get_theme()['font_size']}px;
-            }}
-            
-            QFrame#compactFrame {{
-                background: {colors['background']};
-                border: 1px solid {colors['border']};
-                border-radius: 4px;
-            }}
-            
-            QFrame#statsGroup {{
-                background: {colors['background']};
-                border: 1px solid {colors['border']};
-                border-radius: 4px;
-                padding: 5px;
-            }}
-            
-            QProgressBar {{
-                border: 1px solid {colors['border']};
-                border-radius: 2px;
-                background: {colors['background']};
-            }}
-            
-            QProgressBar::chunk {{
-                background: {colors['accent']};
-            }}
-            
-            QTabWidget::pane {{
-                border: 1px solid {colors['border']};
-                border-radius: 4px;
-            }}
-            
-            QTabBar::tab {{
-                background: {colors['background']};
-                color: {colors['foreground']};
-                border: 1px solid {colors['border']};
-                padding: 5px 10px;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }}
-            
-            QTabBar::tab:selected {{
-                background: {colors['accent']};
-                color: {colors['background']};
-            }}
-            
-            QPushButton#modeButton {{
-                background: transparent;
-                border: none;
-                color: {colors['accent']};
-                font-size: 14px;
-            }}
-            
-            QLabel#headerTitle {{
-                color: {colors['accent']};
-                font-weight: bold;
-            }}
-        """)
-        
-    @pyqtSlot(dict)
-    def update_stats(self, stats):
-        """Update widget with new stats"""
+        self.theme_engine.style_widget(self, 'system_stats')
+        
+    @pyqtSlot(object)
+    def update_stats(self, snapshot):
+        """Queue a new StatsSnapshot for the next frame"""
+        if not self.isVisible():
+            return
+        self.coalescer.post((self, 'stats'), self.render_stats, snapshot)
+        
+    def render_stats(self, snapshot):
+        """Update widget with a StatsSnapshot"""
         # Update CPU stats
-        cpu_stats = stats['cpu']
-        total_cpu = int(cpu_stats['total_percent'])
+        cpu_stats = snapshot.cpu
+        total_cpu = int(cpu_stats.total_percent)
         
         if not self.is_widget_mode:
-            for i, usage in enumerate(cpu_stats['percent_per_core']):
-                self.cpu_bars[i].setValue(int(usage))
-            self.cpu_total_bar.setValue(total_cpu)
+            self.cpu_meter.set_values(cpu_stats.percent_per_core, cpu_stats.total_percent)
         
         # Update compact CPU display
         self.cpu_compact_bar.setValue(total_cpu)
         self.cpu_compact_value.setText(f"{total_cpu}%")
         
         # Update memory stats
-        memory_stats = stats['memory']
-        ram_percent = int(memory_stats['percent'])
+        memory_stats = snapshot.memory
+        ram_percent = int(memory_stats.percent)
         
         if not self.is_widget_mode:
             self.ram_bar.setValue(ram_percent)
-            ram_used = memory_stats['used'] / (1024 * 1024 * 1024)
-            ram_total = memory_stats['total'] / (1024 * 1024 * 1024)
+            ram_used = memory_stats.used / (1024 * 1024 * 1024)
+            ram_total = memory_stats.total / (1024 * 1024 * 1024)
             self.ram_details.setText(f"{ram_used:.1f}GB / {ram_total:.1f}GB")
             
-            swap_percent = int(memory_stats['swap']['percent'])
+            swap_percent = int(memory_stats.swap_percent)
             self.swap_bar.setValue(swap_percent)
-            swap_used = memory_stats['swap']['used'] / (1024 * 1024 * 1024)
-            swap_total = memory_stats['swap']['total'] / (1024 * 1024 * 1024)
+            swap_used = memory_stats.swap_used / (1024 * 1024 * 1024)
+            swap_total = memory_stats.swap_total / (1024 * 1024 * 1024)
             self.swap_details.setText(f"{swap_used:.1f}GB / {swap_total:.1f}GB")
         
         # Update compact RAM display
@@ -360,16 +364,48 @@ class SystemStatsWidget(QWidget):
         self.ram_compact_value.setText(f"{ram_percent}%")
         
         # Update GPU stats if available
-        if stats['gpu'] and self.system_stats.gpu_available:
+        if snapshot.gpu and self.system_stats.gpu_available:
             if not self.is_widget_mode:
-                self._update_gpu_widgets(stats['gpu'])
+                self._update_gpu_widgets(snapshot.gpu)
             
             # Update compact GPU display
-            gpu = stats['gpu'][0]  # First GPU
-            gpu_percent = int(gpu['load'])
+            gpu = snapshot.gpu[0]  # First GPU
+            gpu_percent = int(gpu.load or 0)
             self.gpu_compact_bar.setValue(gpu_percent)
             self.gpu_compact_value.setText(f"{gpu_percent}%")
             
+        # Update top processes
+        if snapshot.processes and not self.is_widget_mode:
+            self._fill_process_table(self.top_cpu_table, snapshot.processes.top_cpu)
+            self._fill_process_table(self.top_rss_table, snapshot.processes.top_rss)
+            self.process_count_label.setText(f"{snapshot.processes.total} processes")
+            
+        # Update compact disk and network throughput
+        if snapshot.disk:
+            totals = snapshot.disk.totals
+            self.disk_compact_value.setText(
+                f"R {format_rate(totals['read_bytes'])}  W {format_rate(totals['write_bytes'])}"
+            )
+        if snapshot.net:
+            totals = snapshot.net.totals
+            self.net_compact_value.setText(
+                f"↓ {format_rate(totals['rx_bytes'])}  ↑ {format_rate(totals['tx_bytes'])}"
+            )
+            
+    def _fill_process_table(self, table, processes):
+        """Write process rows into the table's existing cells"""
+        for row in range(table.rowCount()):
+            if row < len(processes):
+                info = processes[row]
+                values = (str(info.pid), info.name, f"{info.cpu_percent:.1f}%",
+                          f"{info.rss / (1024 * 1024):.0f}MB")
+            else:
+                values = ("", "", "", "")
+            for column, value in enumerate(values):
+                item = table.item(row, column)
+                if item.text() != value:
+                    item.setText(value)
+                    
     def _update_gpu_widgets(self, gpu_stats):
         """Update GPU statistics display"""
         # Create or update GPU widgets
@@ -415,21 +451,33 @@ class SystemStatsWidget(QWidget):
             details_label = self.gpu_labels[i]
             
             # Update usage
-            usage_bar.setValue(int(gpu['load']))
+            usage_bar.setValue(int(gpu.load or 0))
             
             # Update memory
-            memory_percent = (gpu['memory']['used'] / gpu['memory']['total']) * 100
-            memory_bar.setValue(int(memory_percent))
+            memory_bar.setValue(int(gpu.memory_percent or 0))
             
-            # Update details
-            memory_used = gpu['memory']['used'] / 1024  # Convert to GB
-            memory_total = gpu['memory']['total'] / 1024
+            # Update details; readings the GPU does not report show as N/A
+            if gpu.memory_used is not None and gpu.memory_total:
+                memory = f"{gpu.memory_used / 1024:.1f}GB / {gpu.memory_total / 1024:.1f}GB"
+            else:
+                memory = "N/A"
+            temperature = f"{gpu.temperature:.0f}°C" if gpu.temperature is not None else "N/A"
             details_label.setText(
-                f"{gpu['name']}\n"
-                f"Memory: {memory_used:.1f}GB / {memory_total:.1f}GB\n"
-                f"Temperature: {gpu['temperature']}°C"
+                f"{gpu.name}\n"
+                f"Memory: {memory}\n"
+                f"Temperature: {temperature}"
             )
             
+    def showEvent(self, event):
+        """Resume process tracking if the Processes tab is open"""
+        self.update_process_tracking()
+        super().showEvent(event)
+        
+    def hideEvent(self, event):
+        """Stop process tracking while the widget is hidden"""
+        self.system_stats.set_process_tracking(False)
+        super().hideEvent(event)
+        
     def mousePressEvent(self, event):
         """Handle mouse press events for dragging"""
         if event.button() == Qt.LeftButton:
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# The app runs from src/ and imports its packages as top-level `core`, `ui` and `utils`
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+# Widgets are built without a display
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+@pytest.fixture(scope='session')
+def qapp():
+    """The QApplication widgets and timers need; tests using it skip without PyQt5"""
+    QtWidgets = pytest.importorskip('PyQt5.QtWidgets')
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    yield app
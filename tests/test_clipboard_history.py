@@ -0,0 +1,66 @@
+from core.clipboard_history import ClipboardHistory
+from core.clipboard_journal import content_digest
+
+def add(history, text):
+    payload = text.encode('utf-8')
+    return history.add(payload, content_digest(payload))
+
+def make_history(tmp_path, texts=()):
+    history = ClipboardHistory(str(tmp_path / 'clipboard.journal'))
+    ids = [add(history, text)[0] for text in texts]
+    return history, ids
+
+def test_snapshot_ignores_later_appends(tmp_path):
+    history, ids = make_history(tmp_path, ['a', 'b', 'c'])
+    snapshot = history.snapshot()
+    add(history, 'd')
+    assert list(snapshot.oldest_first()) == ids
+    assert list(snapshot.newest_first()) == ids[::-1]
+    assert len(list(history.snapshot().oldest_first())) == 4
+    history.close()
+
+def test_snapshot_skips_entries_removed_after_it(tmp_path):
+    history, ids = make_history(tmp_path, ['a', 'b', 'c'])
+    snapshot = history.snapshot()
+    history.remove(ids[1])
+    assert list(snapshot.oldest_first()) == [ids[0], ids[2]]
+    history.close()
+
+def test_removals_compact_the_id_log(tmp_path):
+    history, ids = make_history(tmp_path, [f'entry {i}' for i in range(1100)])
+    snapshot = history.snapshot()
+    old_order = history.order
+    for entry_id in ids[:1090]:
+        history.remove(entry_id)
+    # A fresh log replaced the old one once removed ids outnumbered live ones;
+    # the snapshot keeps walking the old one
+    assert history.order is not old_order
+    assert len(history.order) < len(ids)
+    assert list(history.order)[-10:] == ids[1090:]
+    assert list(history.snapshot().oldest_first()) == ids[1090:]
+    assert list(snapshot.oldest_first()) == ids[1090:]
+    history.close()
+
+def test_duplicate_replaces_the_older_entry(tmp_path):
+    history, ids = make_history(tmp_path, ['a', 'b'])
+    entry_id, replaced = add(history, 'a')
+    assert replaced == ids[0]
+    assert list(history.snapshot().newest_first()) == [entry_id, ids[1]]
+    history.close()
+
+def test_removed_newest_entry_can_be_added_again(tmp_path):
+    history, ids = make_history(tmp_path, ['a', 'b'])
+    assert history.remove(ids[1])
+    assert not history.remove(ids[1])
+    assert history.newest() == ids[0]
+    entry_id, replaced = add(history, 'b')
+    assert replaced is None and entry_id > ids[1]
+    assert history.read(entry_id) == 'b'
+    assert list(history.snapshot().newest_first()) == [entry_id, ids[0]]
+    history.close()
+
+def test_evict_keeps_the_newest(tmp_path):
+    history, ids = make_history(tmp_path, ['a', 'b', 'c'])
+    assert history.evict(1, 1) == ids[:2]
+    assert len(history) == 1 and history.newest() == ids[2]
+    history.close()
@@ -0,0 +1,90 @@
+import pytest
+
+class FakeSource:
+    def read(self):
+        return ''
+
+    def start(self, callback):
+        pass
+
+    def stop(self):
+        pass
+
+@pytest.fixture
+def manager(qapp, tmp_path):
+    from core.clipboard_manager import ClipboardManager
+    manager = ClipboardManager(source=FakeSource(), journal_path=str(tmp_path / 'clipboard.journal'))
+    yield manager
+    manager.history.close()
+
+@pytest.fixture
+def model(manager):
+    from ui.clipboard_history_model import ClipboardHistoryModel
+    # Recorded in place so the model's slots run synchronously
+    for text in ('first', 'second', 'third'):
+        manager._record(text)
+    model = ClipboardHistoryModel(manager)
+    model.events = []
+    model.rowsInserted.connect(lambda parent, first, last: model.events.append(('insert', first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: model.events.append(('remove', first, last)))
+    model.modelReset.connect(lambda: model.events.append(('reset',)))
+    return model
+
+def rows(model):
+    return [model.data(model.index(row)) for row in range(model.rowCount())]
+
+def test_rows_are_newest_first(manager, model):
+    from PyQt5.QtCore import Qt
+    assert rows(model) == ['third', 'second', 'first']
+    assert model.data(model.index(0), Qt.UserRole) == manager.history.newest()
+    assert model.data(model.index(3)) is None
+
+def test_append_inserts_at_the_top(manager, model):
+    manager._record('fourth\nline')
+    assert model.events == [('insert', 0, 0)]
+    assert rows(model) == ['fourth line', 'third', 'second', 'first']
+
+def test_long_entries_are_cut_for_display(manager, model):
+    from ui.clipboard_history_model import DISPLAY_CHARS
+    manager._record('x' * 500)
+    assert model.data(model.index(0)) == 'x' * DISPLAY_CHARS + '...'
+
+def test_removing_rows(manager, model):
+    second = model.entry_id(1)
+    manager.remove_entry(second)
+    assert model.events == [('remove', 1, 1)]
+    assert rows(model) == ['third', 'first']
+    manager.remove_entry(model.entry_id(0))
+    assert model.events[-1] == ('remove', 0, 0)
+    assert rows(model) == ['first']
+
+def test_removed_newest_entry_can_come_back(manager, model):
+    manager.remove_entry(model.entry_id(0))
+    manager._record('third')
+    assert rows(model) == ['third', 'second', 'first']
+
+def test_copying_an_old_entry_moves_it_to_the_top(manager, model):
+    manager._record('first')
+    assert model.events == [('remove', 2, 2), ('insert', 0, 0)]
+    assert rows(model) == ['first', 'third', 'second']
+
+def test_filtered_rows_follow_removals(manager, model):
+    ids = [model.entry_id(row) for row in range(3)]
+    model.set_filter([ids[2], ids[0]])
+    assert rows(model) == ['first', 'third']
+    manager.remove_entry(ids[0])
+    assert rows(model) == ['first']
+    manager._record('fourth')
+    # New entries wait for the filter to be refreshed
+    assert rows(model) == ['first']
+    model.clear_filter()
+    assert rows(model) == ['fourth', 'second', 'first']
+
+def test_many_removals_reset_the_model(manager, model):
+    from ui.clipboard_history_model import RESET_THRESHOLD
+    for i in range(RESET_THRESHOLD + 5):
+        manager._record(f'bulk {i}')
+    model.events.clear()
+    manager.set_max_history(2)
+    assert model.events == [('reset',)]
+    assert rows(model) == [f'bulk {RESET_THRESHOLD + 4}', f'bulk {RESET_THRESHOLD + 3}']
@@ -0,0 +1,109 @@
+import os
+import stat
+
+import pytest
+
+from core.clipboard_journal import ClipboardJournal
+
+SECRET = 'hunter2-correct-horse-battery-staple'
+
+def file_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / 'journal')
+    journal = ClipboardJournal(path)
+    first = journal.append('first'.encode())
+    second = journal.append(('x' * 100000).encode())
+    journal.close()
+    journal = ClipboardJournal(path)
+    assert journal.ids() == [first, second]
+    assert journal.read(first) == 'first'
+    assert journal.read(second) == 'x' * 100000
+    assert journal.preview(second, 5) == 'xxxxx'
+    journal.close()
+
+def test_remove_overwrites_the_text(tmp_path):
+    path = str(tmp_path / 'journal')
+    journal = ClipboardJournal(path)
+    kept = journal.append(b'keep me')
+    secret = journal.append(SECRET.encode())
+    journal.remove(secret)
+    assert SECRET.encode() not in file_bytes(path)
+    assert journal.ids() == [kept]
+    journal.close()
+    journal = ClipboardJournal(path)
+    assert journal.ids() == [kept]
+    assert journal.read(kept) == 'keep me'
+    journal.close()
+
+def test_remove_overwrites_compressed_text(tmp_path):
+    path = str(tmp_path / 'journal')
+    journal = ClipboardJournal(path, compress_threshold=16)
+    secret = journal.append((SECRET * 10).encode())
+    stored = file_bytes(path)[-journal.stored_size(secret):]
+    journal.remove(secret)
+    assert stored not in file_bytes(path)
+    journal.close()
+
+def test_clear_truncates_the_file(tmp_path):
+    path = str(tmp_path / 'journal')
+    journal = ClipboardJournal(path)
+    journal.append(SECRET.encode())
+    journal.append(b'more')
+    journal.clear()
+    assert file_bytes(path) == ClipboardJournal.MAGIC
+    assert len(journal) == 0
+    entry = journal.append(b'after')
+    assert journal.read(entry) == 'after'
+    journal.close()
+    journal = ClipboardJournal(path)
+    assert [journal.read(entry_id) for entry_id in journal.ids()] == ['after']
+    journal.close()
+
+def test_torn_record_is_dropped(tmp_path):
+    path = str(tmp_path / 'journal')
+    journal = ClipboardJournal(path)
+    entry = journal.append(b'complete')
+    journal.close()
+    size = os.path.getsize(path)
+    with open(path, 'ab') as f:
+        f.write(ClipboardJournal.RECORD.pack(ClipboardJournal.ADD, 0, 9, 100, bytes(16)) + b'partial')
+    journal = ClipboardJournal(path)
+    assert journal.ids() == [entry]
+    assert os.path.getsize(path) == size
+    new_entry = journal.append(b'next')
+    assert journal.read(new_entry) == 'next'
+    journal.close()
+
+def test_compaction_keeps_live_entries(tmp_path):
+    path = str(tmp_path / 'journal')
+    journal = ClipboardJournal(path, compact_min_bytes=0)
+    entries = [journal.append(f'entry {i}'.encode()) for i in range(10)]
+    for entry in entries[:8]:
+        journal.remove(entry)
+    assert journal.size < 200
+    assert [journal.read(entry) for entry in journal.ids()] == ['entry 8', 'entry 9']
+    journal.close()
+
+@pytest.mark.skipif(os.name == 'nt', reason="POSIX permissions")
+def test_journal_is_private(tmp_path):
+    path = str(tmp_path / 'nerdhud' / 'journal')
+    journal = ClipboardJournal(path, compact_min_bytes=0)
+    assert stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    entry = journal.append(SECRET.encode())
+    journal.append(b'kept')
+    journal.remove(entry)
+    journal.compact()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    journal.close()
+
+@pytest.mark.skipif(os.name == 'nt', reason="POSIX permissions")
+def test_readable_journal_is_tightened(tmp_path):
+    path = str(tmp_path / 'journal')
+    ClipboardJournal(path).close()
+    os.chmod(path, 0o644)
+    ClipboardJournal(path).close()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+pytest.importorskip('PyQt5')
+
+from core.clipboard_manager import ClipboardManager
+
+class FakeSource:
+    def read(self):
+        return ''
+
+    def start(self, callback):
+        pass
+
+    def stop(self):
+        pass
+
+def copy(manager, text):
+    """Report a copy as the source would and wait for it to be recorded"""
+    manager._on_clipboard_content(text)
+    manager.wait_for_recording()
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ClipboardManager(source=FakeSource(), journal_path=str(tmp_path / 'clipboard.journal'))
+    yield manager
+    manager.history.journal.close()
+
+def test_copying_removed_newest_entry_again_records_it(manager):
+    copy(manager, 'older')
+    copy(manager, 'secret')
+    manager.remove_entry(manager.history.newest())
+    assert manager.get_history() == ['older']
+    copy(manager, 'secret')
+    assert manager.get_history() == ['older', 'secret']
+
+def test_repeated_report_of_newest_entry_is_ignored(manager):
+    copy(manager, 'older')
+    copy(manager, 'newest')
+    manager.remove_entry(manager.get_entry_ids()[0])
+    added = []
+    manager.entry_added.connect(added.append)
+    copy(manager, 'newest')
+    assert added == []
+    assert manager.get_history() == ['newest']
+
+def test_copies_are_recorded_off_the_reporting_thread(manager):
+    threads = []
+    record = manager._record
+    manager._record = lambda text: (threads.append(threading.current_thread()), record(text))
+    copy(manager, 'big copy')
+    # A repeat of the text just reported is dropped before the hand-off
+    copy(manager, 'big copy')
+    assert len(threads) == 1 and threads[0] is not threading.current_thread()
+    assert manager.get_history() == ['big copy']
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from core.clipboard_search import TrigramIndex, rank_entries, DEADLINE_CHECK_EVERY
+
+TEXTS = {1: 'git checkout main', 2: 'https://example.com/docs', 3: 'git commit -m fix'}
+
+def newest_first():
+    return reversed(sorted(TEXTS))
+
+def test_exact_matches_come_before_fuzzy_ones():
+    index = TrigramIndex()
+    for entry_id, text in sorted(TEXTS.items()):
+        index.add(entry_id, text)
+    assert rank_entries('git c', index, newest_first, TEXTS.get) == [3, 1]
+    assert rank_entries('exdocs', index, newest_first, TEXTS.get) == [2]
+
+def test_unfinished_index_still_finds_exact_matches():
+    complete = TrigramIndex()
+    for entry_id, text in sorted(TEXTS.items()):
+        complete.add(entry_id, text)
+    partial = TrigramIndex()
+    partial.add(1, TEXTS[1])
+    expected = rank_entries('git', complete, newest_first, TEXTS.get)
+    assert expected == [3, 1]
+    assert rank_entries('git', partial, newest_first, TEXTS.get, indexed=False) == expected
+
+def test_slow_reads_stop_soon_after_the_deadline():
+    reads = []
+
+    def slow_read(entry_id):
+        reads.append(entry_id)
+        time.sleep(0.002)
+        return 'nothing to see'
+
+    all_ids = lambda: iter(range(10000, 0, -1))
+    start = time.monotonic()
+    assert rank_entries('xqzv', TrigramIndex(), all_ids, slow_read, budget=0.01, indexed=False) == []
+    assert time.monotonic() - start < 0.01 + DEADLINE_CHECK_EVERY * 0.002 + 0.05
+    assert len(reads) <= 2 * DEADLINE_CHECK_EVERY + 0.01 / 0.002
+
+def copy(manager, text):
+    """Report a copy as the source would and wait for it to be recorded"""
+    manager._on_clipboard_content(text)
+    manager.wait_for_recording()
+
+class FakeSource:
+    def read(self):
+        return ''
+
+    def start(self, callback):
+        pass
+
+    def stop(self):
+        pass
+
+def test_index_is_built_in_the_background_on_start(tmp_path):
+    pytest.importorskip('PyQt5')
+    from core.clipboard_manager import ClipboardManager
+    path = str(tmp_path / 'clipboard.journal')
+    manager = ClipboardManager(max_history=100, source=FakeSource(), journal_path=path)
+    for i in range(50):
+        copy(manager, f'entry {i}')
+    manager.history.journal.close()
+
+    manager = ClipboardManager(max_history=100, source=FakeSource(), journal_path=path)
+    assert not manager.index_built
+    manager.start_monitoring()
+    manager.index_thread.join(5)
+    assert manager.index_built
+    assert manager.index.count == 50
+    copy(manager, 'entry new')
+    assert manager.search_history('entry new') == ['entry new']
+    assert manager.search_history('entry 7')[0] == 'entry 7'
+    manager.stop_monitoring()
+    manager.history.journal.close()
+
+def test_search_before_the_index_is_built_scans_the_history(tmp_path):
+    pytest.importorskip('PyQt5')
+    from core.clipboard_manager import ClipboardManager
+    manager = ClipboardManager(source=FakeSource(), journal_path=str(tmp_path / 'clipboard.journal'))
+    manager.index_thread = object()  # as if the build had only just started
+    copy(manager, 'unindexed text')
+    assert manager.index.count == 0
+    assert manager.search_history('unindexed') == ['unindexed text']
+    manager.history.journal.close()
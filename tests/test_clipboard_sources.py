@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import time
+import types
+
+import pytest
+
+pytest.importorskip('PyQt5')
+
+from core.scheduler import Scheduler
+from core.clipboard_sources import PollingClipboardSource
+
+def test_module_does_not_import_pyperclip():
+    # In a fresh interpreter, since other tests may have imported it
+    code = ("import sys; sys.path[:0] = %r; import core.clipboard_sources; "
+            "print('pyperclip' in sys.modules)" % (sys.path,))
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
+
+@pytest.fixture
+def fake_pyperclip(monkeypatch):
+    module = types.ModuleType('pyperclip')
+    module.text = ''
+    module.PyperclipWindowsException = type('PyperclipWindowsException', (Exception,), {})
+    module.paste = lambda: module.text
+    module.copy = lambda text: setattr(module, 'text', text)
+    monkeypatch.setitem(sys.modules, 'pyperclip', module)
+    return module
+
+def test_polling_source_reports_changes(fake_pyperclip):
+    scheduler = Scheduler(workers=1)
+    source = PollingClipboardSource(interval=0.01, scheduler=scheduler)
+    seen = []
+    source.start(seen.append)
+    try:
+        source.write('hello')
+        deadline = time.monotonic() + 2
+        while 'hello' not in seen and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        source.stop()
+        scheduler.shutdown(wait=True)
+    assert seen[-1] == 'hello'
+    assert source.read() == 'hello'
+
+def test_sources_must_implement_the_protocol():
+    from core.clipboard_sources import ClipboardSource
+
+    class ReadOnly(ClipboardSource):
+        def start(self, on_change):
+            pass
+
+        def read(self):
+            return ''
+
+    with pytest.raises(TypeError):
+        ReadOnly()
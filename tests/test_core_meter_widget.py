@@ -0,0 +1,66 @@
+from core.metric_history import MetricHistory
+from core.stats_snapshot import CpuStats, StatsSnapshot
+
+def record(history, second, per_core):
+    history.record(StatsSnapshot(float(second), CpuStats(per_core, sum(per_core) / len(per_core)), None))
+
+def test_sparklines_read_the_shared_history(qapp):
+    from ui.widgets.core_meter_widget import CoreMeterWidget
+    history = MetricHistory()
+    meter = CoreMeterWidget(2, history)
+    for second in range(10):
+        record(history, second, [float(second), 50.0])
+    meter.set_values([9.0, 50.0], 29.5)
+    assert meter.rows[0].value == 9
+    assert list(meter.rows[0].samples) == [float(second) for second in range(9)]
+    assert meter.rows[0].count == 9
+
+def test_no_gaps_while_not_updated(qapp):
+    from ui.widgets.core_meter_widget import CoreMeterWidget
+    history = MetricHistory()
+    meter = CoreMeterWidget(1, history)
+    record(history, 0, [5.0])
+    record(history, 1, [5.0])
+    meter.set_values([5.0], 5.0)
+    meter.rows[0].sparkline_path()
+    # The CPU tab is hidden for 30 s: samples keep being recorded but nothing is pushed
+    for second in range(2, 32):
+        record(history, second, [float(second)])
+    meter.set_values([31.0], 31.0)
+    row = meter.rows[0]
+    assert list(row.samples) == [5.0, 5.0] + [float(second) for second in range(2, 31)]
+    assert row.count == 31
+    path = row.sparkline_path()
+    assert path.elementCount() == 31
+    assert path.currentPosition().x() == 30 and path.currentPosition().y() == 30.0
+
+def test_flat_rows_are_not_repainted(qapp):
+    from ui.widgets.core_meter_widget import SPARKLINE_POINTS, CoreMeterWidget
+    history = MetricHistory()
+    meter = CoreMeterWidget(1, history)
+    for second in range(SPARKLINE_POINTS + 2):
+        record(history, second, [0.0])
+    meter.set_values([0.0], 0.0)
+    row = meter.rows[0]
+    record(history, SPARKLINE_POINTS + 2, [0.0])
+    _, [(count, added)] = history.since([(row.metric, row.count)], meter.history_generation)
+    assert not row.add_samples(count, added)
+    record(history, SPARKLINE_POINTS + 3, [7.0])
+    record(history, SPARKLINE_POINTS + 4, [7.0])
+    _, [(count, added)] = history.since([(row.metric, row.count)], meter.history_generation)
+    assert row.add_samples(count, added)
+
+def test_cleared_history_replaces_the_sparkline(qapp):
+    from ui.widgets.core_meter_widget import CoreMeterWidget
+    history = MetricHistory()
+    meter = CoreMeterWidget(1, history)
+    for second in range(4):
+        record(history, second, [1.0])
+    meter.set_values([1.0], 1.0)
+    history.clear()
+    for second in range(100, 110):
+        record(history, second, [2.0])
+    meter.set_values([2.0], 2.0)
+    row = meter.rows[0]
+    assert list(row.samples) == [2.0] * 9
+    assert row.count == 9
@@ -0,0 +1,93 @@
+import datetime
+import json
+import os
+
+from core import focus_history
+from core.focus_history import FocusHistory
+
+# Noon on a Wednesday, so a few hours either way stays on the same day
+NOON = datetime.datetime(2026, 10, 14, 12).timestamp()
+
+def log_path(tmp_path):
+    return str(tmp_path / 'focus.log')
+
+def record_work(history, count, start=NOON):
+    for i in range(count):
+        history.record('work', start + i * 60, start + i * 60 + 25, 25.0, interruptions=1)
+
+def test_totals_survive_reopening(tmp_path):
+    history = FocusHistory(log_path(tmp_path))
+    record_work(history, 3)
+    history.record('break', NOON + 600, NOON + 900, 300.0)
+    history.flush()
+    reopened = FocusHistory(log_path(tmp_path))
+    assert reopened.day_totals(datetime.date.fromtimestamp(NOON)) == {
+        'work_seconds': 75.0, 'work_sessions': 3, 'break_seconds': 300.0, 'interruptions': 3,
+    }
+    assert reopened.streak(datetime.date.fromtimestamp(NOON)) == 1
+
+def test_summary_is_written_every_few_records(tmp_path):
+    history = FocusHistory(log_path(tmp_path))
+    record_work(history, focus_history.SUMMARY_EVERY - 1)
+    assert not os.path.exists(history.summary_path)
+    record_work(history, 1)
+    with open(history.summary_path) as f:
+        assert json.load(f)['covered'] == history.covered
+
+def test_records_after_the_summary_are_read_from_the_log(tmp_path):
+    history = FocusHistory(log_path(tmp_path))
+    record_work(history, focus_history.SUMMARY_EVERY + 2)
+    # Not flushed: the summary is two records behind
+    reopened = FocusHistory(log_path(tmp_path))
+    day = datetime.date.fromtimestamp(NOON)
+    assert reopened.day_totals(day)['work_sessions'] == focus_history.SUMMARY_EVERY + 2
+    assert reopened.covered == history.covered
+
+def test_torn_trailing_record_is_dropped(tmp_path):
+    history = FocusHistory(log_path(tmp_path))
+    record_work(history, 2)
+    history.flush()
+    with open(history.path, 'ab') as f:
+        f.write(b'\x01\x02\x03')
+    reopened = FocusHistory(log_path(tmp_path))
+    assert reopened.day_totals(datetime.date.fromtimestamp(NOON))['work_sessions'] == 2
+    record_work(reopened, 1, start=NOON + 3600)
+    assert os.path.getsize(history.path) == len(FocusHistory.MAGIC) + 3 * FocusHistory.RECORD.size
+    assert FocusHistory(log_path(tmp_path)).day_totals(
+        datetime.date.fromtimestamp(NOON))['work_sessions'] == 3
+
+def test_replaced_log_of_the_same_size_is_rescanned(tmp_path):
+    history = FocusHistory(log_path(tmp_path))
+    record_work(history, 2)
+    history.flush()
+    # Another log with as many records, e.g. restored from a backup
+    other_path = str(tmp_path / 'other.log')
+    other = FocusHistory(other_path)
+    other.record('work', NOON, NOON + 50, 50.0, completed=False)
+    other.record('break', NOON + 60, NOON + 90, 30.0)
+    os.replace(other_path, history.path)
+    reopened = FocusHistory(log_path(tmp_path))
+    assert reopened.day_totals(datetime.date.fromtimestamp(NOON)) == {
+        'work_seconds': 50.0, 'work_sessions': 0, 'break_seconds': 30.0, 'interruptions': 0,
+    }
+
+def test_log_rewritten_in_place_is_rescanned(tmp_path):
+    history = FocusHistory(log_path(tmp_path))
+    record_work(history, 2)
+    history.flush()
+    with open(history.path, 'r+b') as f:
+        f.seek(len(FocusHistory.MAGIC) + FocusHistory.RECORD.size)
+        f.write(FocusHistory.RECORD.pack(NOON, NOON + 10, 10.0, 0, 0, 0))
+    reopened = FocusHistory(log_path(tmp_path))
+    totals = reopened.day_totals(datetime.date.fromtimestamp(NOON))
+    assert totals['work_seconds'] == 35.0
+    assert totals['work_sessions'] == 1
+
+def test_corrupt_summary_is_rebuilt(tmp_path):
+    history = FocusHistory(log_path(tmp_path))
+    record_work(history, 2)
+    history.flush()
+    with open(history.summary_path, 'w') as f:
+        f.write('{not json')
+    reopened = FocusHistory(log_path(tmp_path))
+    assert reopened.day_totals(datetime.date.fromtimestamp(NOON))['work_sessions'] == 2
@@ -0,0 +1,83 @@
+import pytest
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+class RecordingHistory:
+    def __init__(self):
+        self.records = []
+
+    def record(self, kind, start, end, active, interruptions=0, completed=True):
+        self.records.append((kind, active, interruptions, completed))
+
+@pytest.fixture
+def timer(qapp):
+    from core.focus_timer import FocusTimer
+    clock = FakeClock()
+    timer = FocusTimer(clock=clock, history=RecordingHistory(), wall_clock=clock)
+    timer.shown = []
+    timer.time_updated.connect(timer.shown.append)
+    timer.completed = []
+    timer.timer_completed.connect(timer.completed.append)
+    yield timer
+    timer.tick_timer.stop()
+
+def wake(timer, error=0.0):
+    """Advance the clock to when the tick timer is due, off by `error` seconds, and tick"""
+    timer.clock.advance(timer.tick_timer.interval() / 1000 + error)
+    timer.tick()
+
+def test_pause_freezes_the_time_left(timer):
+    timer.start_timer(60)
+    timer.clock.advance(10.3)
+    timer.pause_timer()
+    assert timer.get_remaining() == pytest.approx(49.7)
+    timer.clock.advance(100)
+    assert timer.get_remaining() == pytest.approx(49.7)
+    assert not timer.tick_timer.isActive()
+    timer.resume_timer()
+    # The next tick lands on the 49 s boundary
+    assert timer.tick_timer.interval() == pytest.approx(700, abs=1)
+    wake(timer)
+    assert timer.shown == [49]
+    assert timer.interruptions == 1
+
+def test_early_wakeup_shows_the_next_second(timer):
+    timer.start_timer(10)
+    assert timer.tick_timer.interval() == 1000
+    wake(timer, error=-0.005)
+    assert timer.shown == [9]
+    # Waits out the rest of the current boundary plus a whole second
+    assert timer.tick_timer.interval() == 1005
+
+def test_jittery_wakeups_do_not_drift(timer):
+    timer.start_timer(30)
+    errors = [-0.004, 0.003, -0.001, 0.008, 0.0]
+    for i in range(29):
+        wake(timer, errors[i % len(errors)])
+    assert timer.shown == list(range(29, 0, -1))
+    # Lateness does not add up: the last second started on time
+    assert timer.get_remaining() == pytest.approx(1.0, abs=0.01)
+
+def test_completion_rolls_over_to_a_break(timer):
+    timer.set_break_duration(1)
+    timer.start_timer(3)
+    for _ in range(3):
+        wake(timer, -0.001)
+    # An early wakeup at the end waits the last millisecond instead of a second
+    assert timer.completed == []
+    assert timer.tick_timer.interval() == 1
+    wake(timer)
+    assert timer.shown[-1] == 0
+    assert timer.completed == ['break']
+    assert timer.history.records == [('work', pytest.approx(3.0), 0, True)]
+    assert timer.is_break
+    assert timer.remaining_seconds == 60
+    assert timer.tick_timer.interval() == 1000
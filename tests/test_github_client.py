@@ -0,0 +1,157 @@
+import json
+import os
+import stat
+import threading
+import time
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.github_client import GitHubClient
+
+class StubGitHub:
+    """Serves canned JSON with ETags, answering If-None-Match with 304s"""
+
+    def __init__(self):
+        self.bodies = {'/users/octocat': {'login': 'octocat', 'public_repos': 3}}
+        self.fail_next = []
+        self.stall = 0.0
+        self.requests = []
+        self.limit = 5000
+        self.remaining = 4000
+        self.resource = 'core'
+
+    def handle(self, handler):
+        self.requests.append((handler.path, handler.headers.get('If-None-Match')))
+        time.sleep(self.stall)
+        if self.fail_next:
+            handler.send_error(self.fail_next.pop(0))
+            return
+        body = self.bodies.get(handler.path)
+        if body is None:
+            handler.send_error(404)
+            return
+        data = json.dumps(body['json'] if 'json' in body else body).encode('utf-8')
+        etag = '"%d"' % hash(data)
+        fresh = handler.headers.get('If-None-Match') != etag
+        handler.send_response(200 if fresh else 304)
+        handler.send_header('ETag', etag)
+        handler.send_header('X-RateLimit-Limit', str(self.limit))
+        handler.send_header('X-RateLimit-Remaining', str(self.remaining))
+        handler.send_header('X-RateLimit-Reset', str(int(time.time()) + 3600))
+        handler.send_header('X-RateLimit-Resource', self.resource)
+        if 'next' in body:
+            handler.send_header('Link', f'<{handler.server.url}{body["next"]}>; rel="next"')
+        if fresh:
+            handler.send_header('Content-Length', str(len(data)))
+        handler.end_headers()
+        if fresh:
+            handler.wfile.write(data)
+
+@pytest.fixture
+def github():
+    stub = StubGitHub()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            stub.handle(self)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    stub.url = server.url
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+    thread.start()
+    yield stub
+    server.shutdown()
+    server.server_close()
+
+def make_client(github, tmp_path):
+    return GitHubClient('placeholder-token', cache_path=str(tmp_path / 'github_cache.json'),
+                        api_url=github.url, timeout=2)
+
+def test_unchanged_resource_is_revalidated_for_free(github, tmp_path):
+    client = make_client(github, tmp_path)
+    body, next_url = client.get('/users/octocat')
+    assert body['public_repos'] == 3 and next_url is None
+    assert client.get('/users/octocat')[0] == body
+    assert github.requests[1][1] is not None
+    assert client.not_modified == 1
+    assert client.rate_limits['core'][:2] == (4000, 5000)
+
+def test_failed_request_keeps_the_cached_response(github, tmp_path):
+    client = make_client(github, tmp_path)
+    client.get('/users/octocat')
+    github.fail_next = [502]
+    with pytest.raises(urllib.error.HTTPError):
+        client.get('/users/octocat')
+    assert client.url('/users/octocat') in client.cache
+    client.get('/users/octocat')
+    assert github.requests[-1][1] is not None
+    assert client.not_modified == 1
+
+def test_timed_out_request_keeps_the_cached_response(github, tmp_path):
+    client = make_client(github, tmp_path)
+    client.get('/users/octocat')
+    client.timeout = 0.1
+    github.stall = 0.5
+    with pytest.raises(OSError):
+        client.get('/users/octocat')
+    github.stall = 0.0
+    client.timeout = 2
+    client.get('/users/octocat')
+    assert client.not_modified == 1
+
+def test_pages_follow_link_headers(github, tmp_path):
+    github.bodies['/issues'] = {'json': [1, 2], 'next': '/issues?page=2'}
+    github.bodies['/issues?page=2'] = [3]
+    client = make_client(github, tmp_path)
+    assert list(client.get_pages('/issues')) == [[1, 2], [3]]
+
+def test_cache_survives_a_restart(github, tmp_path):
+    client = make_client(github, tmp_path)
+    client.get('/users/octocat')
+    client.save()
+    restarted = make_client(github, tmp_path)
+    restarted.get('/users/octocat')
+    assert restarted.not_modified == 1
+
+def test_cache_is_readable_by_its_owner_only(github, tmp_path):
+    client = make_client(github, tmp_path)
+    client.get('/users/octocat')
+    client.save()
+    assert stat.S_IMODE(os.stat(client.cache_path).st_mode) == 0o600
+
+def test_search_polls_keep_running_under_its_small_limit(github, tmp_path):
+    github.bodies['/search/issues'] = {'total_count': 0, 'items': []}
+    github.limit, github.remaining, github.resource = 30, 20, 'search'
+    client = make_client(github, tmp_path)
+    client.begin_poll()
+    client.get('/search/issues')
+    # One of the 30 is kept back, so 19 requests cover the rest of the window
+    until_reset = client.rate_limits['search'][2] - time.time()
+    assert client.next_delay(60) == pytest.approx(until_reset / 19, rel=0.01)
+
+def test_core_reserve_parks_polling_until_reset(tmp_path):
+    client = GitHubClient('placeholder-token', cache_path=str(tmp_path / 'cache.json'))
+    client.poll_charged = {'core': 3}
+    client.rate_limits = {'core': (52, 5000, 1000.0 + 3600)}
+    assert client.next_delay(300, now=1000.0) == 3600
+    client.rate_limits = {'core': (5000, 5000, 1000.0 + 3600)}
+    assert client.next_delay(300, now=1000.0) == 300
+
+def test_refresh_survives_last_update_being_cleared(github, tmp_path):
+    pytest.importorskip('PyQt5')
+    from core.github_manager import GitHubManager
+    manager = GitHubManager({'github_token': 'placeholder-token', 'github_username': 'octocat'})
+    manager.client = make_client(github, tmp_path)
+    manager.user = manager._get_user('octocat')
+    manager.watchers.set_watched('test', True)
+    manager.update_repos = manager.update_prs = lambda: None
+    # request_refresh() from the GUI thread just as the poll finishes
+    manager.client.save = lambda: setattr(manager, 'last_update', None)
+    delay = manager._refresh()
+    assert 0 < delay <= manager.update_interval
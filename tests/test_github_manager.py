@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+pytest.importorskip('PyQt5')
+
+from core import github_manager
+from core.github_manager import GitHubManager
+from core.scheduler import Scheduler
+
+class FakeClient:
+    """Answers every profile request for the token it was made with"""
+
+    def __init__(self, token):
+        self.token = token
+
+    def get(self, path, params=None):
+        return {'login': path.rsplit('/', 1)[-1], 'public_repos': 1}, None
+
+class FakeSettings:
+    def __init__(self, **values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+@pytest.fixture
+def manager(qapp, monkeypatch):
+    monkeypatch.setattr(github_manager, 'GitHubClient', FakeClient)
+    manager = GitHubManager(FakeSettings())
+    manager.scheduler = Scheduler(workers=1)
+    yield manager
+    manager.stop_monitoring()
+    manager.scheduler.shutdown(wait=True)
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return condition()
+
+def test_credentials_set_while_monitoring_sign_in(manager):
+    manager.start_monitoring()
+    assert wait_for(lambda: manager.job.runs == 1 and not manager.job.running)
+    # No credentials yet: the job sleeps rather than stopping
+    assert manager.running and manager.job is not None
+    assert manager.client is None
+    manager.set_token('first-token')
+    assert manager.set_username('octocat') is None
+    assert wait_for(lambda: manager.user is not None)
+    assert manager.client.token == 'first-token'
+    assert manager.user['login'] == 'octocat'
+
+def test_new_token_replaces_the_client(manager):
+    manager.settings = FakeSettings(github_token='old-token', github_username='octocat')
+    manager.start_monitoring()
+    assert wait_for(lambda: manager.client is not None)
+    manager.set_token('new-token')
+    assert wait_for(lambda: manager.client is not None and manager.client.token == 'new-token')
+    assert manager.user['login'] == 'octocat'
+
+def test_credentials_set_before_monitoring_sign_in_at_once(manager):
+    manager.set_token('token')
+    assert manager.set_username('octocat') is True
+    assert manager.client.token == 'token'
@@ -0,0 +1,124 @@
+import os
+import stat
+import sys
+import time
+
+import pytest
+
+from core import gpu_probe
+from core.gpu_probe import NvidiaSmiGpuProbe, create_gpu_probe
+
+# Answers the static query once, and with --loop-ms prints the dynamic lines until killed
+FAKE_NVIDIA_SMI = """#!{python}
+import sys, time
+args = ' '.join(sys.argv[1:])
+if 'memory.total' in args:
+    print('0, NVIDIA GeForce RTX 3060, 12288')
+    print('1, NVIDIA GeForce MX450, 2048')
+    sys.exit(0)
+rounds = int(sys.argv[0].rsplit('-', 1)[1]) if sys.argv[0][-1].isdigit() else None
+while rounds is None or rounds > 0:
+    print('0, 37, 1024, 11264, 54', flush=True)
+    print('1, [N/A], 512, 1536, [N/A]', flush=True)
+    time.sleep(0.05)
+    rounds = rounds - 1 if rounds is not None else None
+sys.exit(1)
+"""
+
+def no_nvml():
+    raise ImportError("no NVML here")
+
+def write_fake_smi(tmp_path, name='nvidia-smi'):
+    """Write the fake nvidia-smi; a name ending in -N makes it exit after N rounds"""
+    if os.name == 'nt':
+        pytest.skip("the fake nvidia-smi is a shebang script")
+    path = tmp_path / name
+    path.write_text(FAKE_NVIDIA_SMI.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+@pytest.fixture
+def fake_smi(tmp_path):
+    return write_fake_smi(tmp_path)
+
+def wait_for_gpus(probe, count, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        gpus = probe.read()
+        if gpus and len(gpus) == count:
+            return gpus
+        time.sleep(0.02)
+    raise AssertionError(f"probe did not report {count} GPUs")
+
+def test_static_query(fake_smi):
+    probe = NvidiaSmiGpuProbe(fake_smi)
+    assert probe.device_count() == 2
+    assert probe.static[0] == ('NVIDIA GeForce RTX 3060', 12288.0)
+
+def test_streams_dynamic_stats(fake_smi):
+    probe = NvidiaSmiGpuProbe(fake_smi, interval_ms=50)
+    probe.start()
+    try:
+        gpus = wait_for_gpus(probe, 2)
+    finally:
+        probe.close()
+    gpu = gpus[0]
+    assert (gpu.id, gpu.name, gpu.load, gpu.memory_total) == (0, 'NVIDIA GeForce RTX 3060', 37.0, 12288.0)
+    assert (gpu.memory_used, gpu.memory_free, gpu.temperature) == (1024.0, 11264.0, 54.0)
+    assert probe.process is None and probe.read() is None
+
+def test_unsupported_fields_keep_the_gpu(fake_smi):
+    probe = NvidiaSmiGpuProbe(fake_smi, interval_ms=50)
+    probe.start()
+    try:
+        gpus = wait_for_gpus(probe, 2)
+    finally:
+        probe.close()
+    gpu = gpus[1]
+    assert gpu.name == 'NVIDIA GeForce MX450'
+    assert gpu.load is None and gpu.temperature is None
+    assert gpu.memory_used == 512.0
+    assert gpu.memory_percent == 25.0
+
+def test_exited_child_is_not_shown_stale_and_is_restarted(tmp_path):
+    probe = NvidiaSmiGpuProbe(write_fake_smi(tmp_path, 'nvidia-smi-3'), interval_ms=50,
+                              restart_delay=0.3)
+    probe.start()
+    try:
+        wait_for_gpus(probe, 2)
+        first = probe.process
+        first.wait(timeout=5)
+        probe.reader_thread.join(timeout=5)
+        assert probe.read() is None
+        assert probe.process is first
+        gpus = wait_for_gpus(probe, 2)
+        assert probe.process is not first
+        assert gpus[0].load == 37.0
+    finally:
+        probe.close()
+
+def test_close_drops_lines_still_buffered(fake_smi):
+    probe = NvidiaSmiGpuProbe(fake_smi, interval_ms=50)
+    probe.start()
+    wait_for_gpus(probe, 2)
+    reader = probe.reader_thread
+    probe.close()
+    reader.join(timeout=5)
+    assert probe.latest == {}
+
+def test_parse_line():
+    probe = NvidiaSmiGpuProbe.__new__(NvidiaSmiGpuProbe)
+    assert probe._parse_line('2, 5, 100, 900, 40\n') == (2, 5.0, 100.0, 900.0, 40.0)
+    assert probe._parse_line('2, [N/A], [N/A], [N/A], [N/A]') == (2, None, None, None, None)
+    assert probe._parse_line('[N/A], 5, 100, 900, 40') is None
+    assert probe._parse_line('garbage') is None
+
+def test_create_gpu_probe_falls_back_to_nvidia_smi(fake_smi, monkeypatch):
+    monkeypatch.setattr(gpu_probe, 'NvmlGpuProbe', no_nvml)
+    probe = create_gpu_probe(fake_smi)
+    assert isinstance(probe, NvidiaSmiGpuProbe)
+    assert probe.device_count() == 2
+
+def test_create_gpu_probe_without_gpus(tmp_path, monkeypatch):
+    monkeypatch.setattr(gpu_probe, 'NvmlGpuProbe', no_nvml)
+    assert create_gpu_probe(str(tmp_path / 'missing-nvidia-smi')) is None
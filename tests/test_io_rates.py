@@ -0,0 +1,89 @@
+import os
+from collections import namedtuple
+
+from core.io_rates import (DiskIoCollector, NetIoCollector, counter_delta, find_partitions,
+                           find_stacked_disks, find_virtual_interfaces)
+
+DiskCounters = namedtuple('DiskCounters', 'read_bytes write_bytes read_count write_count')
+NetCounters = namedtuple('NetCounters', 'bytes_recv bytes_sent')
+
+def make_sys_block(root, slaves):
+    """Lay out /sys/block/<name>/slaves directories"""
+    for name, below in slaves.items():
+        os.makedirs(os.path.join(root, name, 'slaves'))
+        for slave in below:
+            open(os.path.join(root, name, 'slaves', slave), 'w').close()
+    return str(root)
+
+def make_sys_class_net(root, devices):
+    """Lay out /sys/class/net links to physical or virtual devices"""
+    net = os.path.join(root, 'class', 'net')
+    os.makedirs(net)
+    for name, virtual in devices.items():
+        parent = 'virtual' if virtual else 'pci0000:00'
+        target = os.path.join(root, 'devices', parent, 'net', name)
+        os.makedirs(target)
+        os.symlink(target, os.path.join(net, name))
+    return net
+
+def test_counter_delta():
+    assert counter_delta(100, 150) == 50
+    assert counter_delta(2 ** 32 - 10, 5) == 15
+    assert counter_delta(2 ** 40, 7) == 7
+    # A re-attached device starting again from small counters is not a wrap
+    assert counter_delta(5000, 20) == 20
+    assert counter_delta(2 ** 31, 20) == 20
+
+def test_find_partitions():
+    names = ['sda', 'sda1', 'sda2', 'nvme0n1', 'nvme0n1p1', 'loop1', 'loop10', 'mmcblk0', 'mmcblk0p1']
+    assert find_partitions(names) == {'sda1', 'sda2', 'nvme0n1p1', 'mmcblk0p1'}
+
+def test_find_stacked_disks_from_sys(tmp_path):
+    sys_block = make_sys_block(tmp_path, {'sda': [], 'dm-0': ['sda2'], 'dm-1': ['dm-0'],
+                                          'md127': ['sdb', 'sdc'], 'sdb': []})
+    assert find_stacked_disks(['sda', 'sdb', 'dm-0', 'dm-1', 'md127'], sys_block) == {'dm-0', 'dm-1', 'md127'}
+
+def test_find_stacked_disks_by_name(tmp_path):
+    names = ['sda', 'dm-0', 'md0', 'loop3', 'zram0', 'PhysicalDrive0', 'mmcblk0']
+    assert find_stacked_disks(names, str(tmp_path / 'missing')) == {'dm-0', 'md0', 'loop3', 'zram0'}
+
+def test_find_virtual_interfaces_from_sys(tmp_path):
+    net = make_sys_class_net(tmp_path, {'eth0': False, 'wlp2s0': False, 'lo': True,
+                                        'docker0': True, 'veth1a2b': True, 'wg0': True})
+    names = ['eth0', 'wlp2s0', 'lo', 'docker0', 'veth1a2b', 'wg0']
+    assert find_virtual_interfaces(names, net) == {'lo', 'docker0', 'veth1a2b', 'wg0'}
+
+def test_find_virtual_interfaces_by_name(tmp_path):
+    names = ['Ethernet', 'Wi-Fi', 'Loopback Pseudo-Interface 1', 'vEthernet (WSL)', 'lo0',
+             'en0', 'utun3', 'bridge0']
+    assert find_virtual_interfaces(names, str(tmp_path / 'missing')) == {
+        'Loopback Pseudo-Interface 1', 'vEthernet (WSL)', 'lo0', 'utun3', 'bridge0'}
+
+def test_disk_totals_count_each_write_once(tmp_path):
+    sys_block = make_sys_block(tmp_path, {'sda': [], 'dm-0': ['sda2']})
+    # One 1 MB write to an LVM volume shows on dm-0, its partition sda2 and the disk sda
+    samples = iter([
+        {'sda': DiskCounters(0, 0, 0, 0), 'sda2': DiskCounters(0, 0, 0, 0),
+         'dm-0': DiskCounters(0, 0, 0, 0)},
+        {'sda': DiskCounters(0, 10 ** 6, 0, 1), 'sda2': DiskCounters(0, 10 ** 6, 0, 1),
+         'dm-0': DiskCounters(0, 10 ** 6, 0, 1)},
+    ])
+    collector = DiskIoCollector(lambda: next(samples), sys_block)
+    assert collector.sample(0.0) is None
+    rates = collector.sample(2.0)
+    assert rates.totals['write_bytes'] == 500000.0
+    assert rates.totals['write_iops'] == 0.5
+    assert sorted(device.name for device in rates.devices) == ['dm-0', 'sda', 'sda2']
+
+def test_net_totals_leave_out_virtual_interfaces(tmp_path):
+    net = make_sys_class_net(tmp_path, {'eth0': False, 'lo': True, 'docker0': True})
+    samples = iter([
+        {'eth0': NetCounters(0, 0), 'lo': NetCounters(0, 0), 'docker0': NetCounters(0, 0)},
+        {'eth0': NetCounters(1000, 500), 'lo': NetCounters(10 ** 9, 10 ** 9),
+         'docker0': NetCounters(1000, 500)},
+    ])
+    collector = NetIoCollector(lambda: next(samples), net)
+    assert collector.sample(0.0) is None
+    rates = collector.sample(1.0)
+    assert rates.totals == {'rx_bytes': 1000.0, 'tx_bytes': 500.0}
+    assert len(rates.devices) == 3
@@ -0,0 +1,19 @@
+from core.lazy_registry import LazyRegistry, deferred
+
+def test_objects_are_built_once_on_first_use():
+    built = []
+    registry = LazyRegistry(on_create=lambda name, instance: built.append((name, instance)))
+    registry.register('numbers', list)
+    registry.register('unused', dict)
+    assert registry.created('numbers') is None
+    numbers = registry.get('numbers')
+    assert registry.get('numbers') is numbers
+    assert registry.created('numbers') is numbers
+    assert built == [('numbers', numbers)]
+    assert list(registry.instances) == ['numbers']
+    assert 'unused' in registry
+
+def test_deferred_imports_when_called():
+    registry = LazyRegistry()
+    registry.register('path', deferred('posixpath', 'join', 'a', 'b'))
+    assert registry.get('path') == 'a/b'
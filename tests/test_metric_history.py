@@ -0,0 +1,55 @@
+from core.metric_history import MetricHistory, RingBuffer
+from core.stats_snapshot import CpuStats, StatsSnapshot
+
+def record_cpu(history, seconds, per_core):
+    for second in seconds:
+        history.record(StatsSnapshot(float(second), CpuStats(per_core, sum(per_core) / len(per_core)), None))
+
+def test_ring_buffer_tail():
+    buffer = RingBuffer(4)
+    assert list(buffer.tail(3)) == []
+    for value in range(1, 7):
+        buffer.append(float(value))
+    assert buffer.appended == 6
+    assert list(buffer.tail(2)) == [5.0, 6.0]
+    assert list(buffer.tail(3)) == [4.0, 5.0, 6.0]
+    assert list(buffer.tail(10)) == [3.0, 4.0, 5.0, 6.0]
+
+def test_one_second_window():
+    history = MetricHistory()
+    record_cpu(history, range(5), [10.0, 30.0])
+    # A bucket closes when the next one starts, so the newest second is still open
+    assert list(history.get('cpu.core.1')) == [30.0] * 4
+    assert list(history.get('cpu.total')) == [20.0] * 4
+    assert history.latest('cpu.core.0') == 10.0
+
+def test_since_returns_only_new_samples():
+    history = MetricHistory()
+    record_cpu(history, range(4), [10.0])
+    generation, [(count, added), (missing_count, missing)] = history.since(
+        [('cpu.core.0', 0), ('gpu.0.load', 0)])
+    assert (count, list(added)) == (3, [10.0, 10.0, 10.0])
+    assert (missing_count, list(missing)) == (0, [])
+    record_cpu(history, range(4, 6), [50.0])
+    _, [(count, added)] = history.since([('cpu.core.0', count)], generation)
+    assert (count, list(added)) == (5, [10.0, 50.0])
+    _, [(count, added)] = history.since([('cpu.core.0', count)], generation)
+    assert (count, list(added)) == (5, [])
+
+def test_since_caps_at_the_window():
+    history = MetricHistory()
+    record_cpu(history, range(100), [1.0])
+    _, [(count, added)] = history.since([('cpu.core.0', 0)])
+    assert count == 99 and len(added) == 60
+
+def test_since_after_clear():
+    history = MetricHistory()
+    record_cpu(history, range(10), [1.0])
+    generation, [(count, added)] = history.since([('cpu.core.0', 0)])
+    assert count == 9
+    history.clear()
+    # More samples than the reader had, so only the generation tells it apart
+    record_cpu(history, range(13), [2.0])
+    new_generation, [(count, added)] = history.since([('cpu.core.0', count)], generation)
+    assert new_generation != generation
+    assert (count, list(added)) == (12, [2.0] * 12)
@@ -0,0 +1,110 @@
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+from core.process_table import ProcessCollector, ProcfsProcess, list_proc_pids
+
+class FakeProcess:
+    """Stand-in for psutil.Process that counts its reads"""
+    reads = 0
+    alive = set()
+    usage = {}
+
+    def __init__(self, pid):
+        if pid not in FakeProcess.alive:
+            raise LookupError(pid)
+        FakeProcess.reads += 1
+        self.pid = pid
+
+    @contextmanager
+    def oneshot(self):
+        if self.pid not in FakeProcess.alive:
+            raise LookupError(self.pid)
+        FakeProcess.reads += 1
+        yield
+
+    def name(self):
+        return f'proc-{self.pid}'
+
+    def cpu_percent(self, interval=None):
+        return FakeProcess.usage.get(self.pid, 0.0)
+
+    def memory_info(self):
+        return self
+
+    @property
+    def rss(self):
+        return self.pid * 4096
+
+@pytest.fixture
+def processes():
+    FakeProcess.reads = 0
+    FakeProcess.alive = set(range(1, 1001))
+    FakeProcess.usage = {}
+    return FakeProcess
+
+def make_collector(**kwargs):
+    return ProcessCollector(list_pids=lambda: sorted(FakeProcess.alive), make_process=FakeProcess,
+                            errors=(LookupError,), **kwargs)
+
+def test_first_scan_is_spread_over_ticks(processes):
+    collector = make_collector(batch_size=100)
+    for tick in range(1, 21):
+        processes.reads = 0
+        table = collector.sample()
+        assert processes.reads <= 100
+        assert len(collector.processes) == min(50 * tick, 1000)
+    assert table.total == 1000
+
+def test_every_process_is_refreshed_within_a_cycle(processes):
+    processes.alive = set(range(1, 101))
+    collector = make_collector(batch_size=40, rescan_every=1000)
+    for _ in range(5):
+        collector.sample()
+    processes.usage = {pid: float(pid) for pid in processes.alive}
+    for _ in range(4):
+        collector.sample()
+    assert all(info.cpu_percent == info.pid for info in collector.info.values())
+
+def test_shown_rows_refresh_every_tick(processes):
+    processes.alive = set(range(1, 101))
+    processes.usage = {7: 90.0}
+    collector = make_collector(batch_size=20, rescan_every=1000)
+    for _ in range(20):
+        table = collector.sample()
+    assert table.top_cpu[0].pid == 7
+    processes.usage = {7: 1.0}
+    table = collector.sample()
+    assert collector.info[7].cpu_percent == 1.0
+
+def test_exited_processes_are_dropped(processes):
+    processes.alive = set(range(1, 11))
+    collector = make_collector(rescan_every=1)
+    collector.sample()
+    processes.alive.discard(5)
+    table = collector.sample()
+    assert 5 not in collector.processes and table.total == 9
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="needs /proc")
+def test_procfs_process_reads_its_own_stat():
+    process = ProcfsProcess(os.getpid())
+    assert process.name() == open(f'/proc/{os.getpid()}/comm').read().strip()[:15]
+    assert process.cpu_percent(None) == 0.0
+    sum(range(10 ** 6))
+    with process.oneshot():
+        assert process.cpu_percent(None) > 0.0
+        assert process.memory_info().rss > 1024 * 1024
+    assert os.getpid() in list_proc_pids()
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="needs /proc")
+def test_procfs_collector_tracks_this_process():
+    collector = ProcessCollector(backend='procfs', batch_size=10 ** 6)
+    collector.sample()
+    collector.sample()
+    assert os.getpid() in collector.info
+
+def test_procfs_process_gone():
+    with pytest.raises(OSError):
+        ProcfsProcess(2 ** 31 - 1)
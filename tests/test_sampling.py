@@ -0,0 +1,33 @@
+from core.sampling import SamplingCadence
+
+def run(cadence, values, active=True):
+    """Feed samples at each deadline and get the interval after each"""
+    intervals = []
+    now = 0.0
+    for value in values:
+        cadence.update(value, now, active)
+        intervals.append(cadence.interval)
+        now = cadence.deadline
+    return intervals
+
+def test_changing_value_samples_fast():
+    cadence = SamplingCadence('cpu', 0.25, 1.0, 5.0, 5.0, 3.0)
+    assert run(cadence, [0, 10, 20, 30])[1:] == [0.25, 0.25, 0.25]
+
+def test_flat_value_backs_off_past_the_visible_interval():
+    cadence = SamplingCadence('cpu', 0.25, 1.0, 5.0, 5.0, 3.0)
+    intervals = run(cadence, [10.0] * 20)
+    # Up to the visible interval at first, then on to the flat ceiling
+    assert intervals[SamplingCadence.FLAT_SAMPLES - 2] <= 1.0
+    assert intervals[-1] == 3.0
+    # A change brings it straight back
+    assert run(cadence, [40.0]) == [0.25]
+    assert cadence.flat_samples == 0
+
+def test_flat_ceiling_never_undercuts_a_long_update_interval():
+    cadence = SamplingCadence('memory', 0.5, 8.0, 10.0, 2.0, 5.0)
+    assert run(cadence, [1.0] * 30)[-1] == 8.0
+
+def test_hidden_interval_is_pinned():
+    cadence = SamplingCadence('net', 0.5, 1.0, 10.0, 0.5, 4.0)
+    assert run(cadence, [0, 100, 0], active=False) == [10.0] * 3
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from core import scheduler as scheduler_module
+from core.scheduler import Scheduler, shared_scheduler
+
+class FrozenClock:
+    """A clock that only moves when told, so deadlines can be read exactly"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def scheduler():
+    scheduler = Scheduler(workers=1, clock=FrozenClock(), retry_delay=1.0, max_retry_delay=8.0)
+    yield scheduler
+    scheduler.shutdown(wait=True)
+
+def wait_for_runs(job, runs, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while (job.runs < runs or job.running) and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert job.runs == runs
+    # The worker reschedules just after counting the run
+    time.sleep(0.01)
+
+def failing():
+    raise RuntimeError('service unavailable')
+
+def test_failing_job_without_interval_is_retried_with_backoff(scheduler):
+    job = scheduler.schedule('github', failing)
+    delays = []
+    for runs in range(1, 6):
+        if runs > 1:
+            scheduler.wake(job)
+        wait_for_runs(job, runs)
+        assert job.deadline is not None
+        delays.append(job.deadline - scheduler.clock())
+    assert delays == [1.0, 2.0, 4.0, 8.0, 8.0]
+    assert job.errors == 5
+
+def test_success_resets_the_backoff(scheduler):
+    outcomes = [RuntimeError('down'), RuntimeError('down'), 5.0, RuntimeError('down')]
+
+    def flaky():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    job = scheduler.schedule('system_stats', flaky)
+    delays = []
+    for runs in range(1, 5):
+        if runs > 1:
+            scheduler.wake(job)
+        wait_for_runs(job, runs)
+        delays.append(job.deadline - scheduler.clock())
+    assert delays == [1.0, 2.0, 5.0, 1.0]
+
+def test_failing_job_waits_at_least_its_interval(scheduler):
+    job = scheduler.schedule('weather', failing, interval=30.0)
+    wait_for_runs(job, 1)
+    assert job.deadline - scheduler.clock() == 30.0
+
+def test_job_returning_none_without_interval_waits_to_be_woken(scheduler):
+    job = scheduler.schedule('idle', lambda: None)
+    wait_for_runs(job, 1)
+    assert job.deadline is None
+    scheduler.wake(job)
+    wait_for_runs(job, 2)
+
+def test_shared_scheduler_is_created_once(monkeypatch):
+    monkeypatch.setattr(scheduler_module, '_shared_scheduler', None)
+    created = []
+    threads = [threading.Thread(target=lambda: created.append(shared_scheduler()))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(map(id, created))) == 1
+    created[0].shutdown(wait=True)
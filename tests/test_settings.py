@@ -0,0 +1,59 @@
+import json
+import threading
+import time
+
+import pytest
+
+@pytest.fixture
+def settings(qapp, tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    from core.settings import Settings
+    settings = Settings()
+    settings.changes = []
+    settings.subscribe(('github_token', 'keybinds'), settings.changes.append)
+    yield settings
+    settings.flush()
+
+def wait_for(qapp, condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.001)
+    return condition()
+
+def test_set_from_another_thread_is_saved_and_notified(qapp, settings):
+    thread = threading.Thread(target=settings.set, args=('github_token', 'from-worker'))
+    thread.start()
+    thread.join()
+    assert wait_for(qapp, lambda: settings.changes)
+    assert settings.changes == [{'github_token': ('', 'from-worker')}]
+    settings.flush()
+    with open(settings.settings_file) as f:
+        assert json.load(f)['github_token'] == 'from-worker'
+
+def test_editing_the_old_value_in_place_keeps_the_change(qapp, settings):
+    keybinds = settings.get('keybinds')
+    settings.set('keybinds', dict(keybinds, toggle_visibility='ctrl+h'))
+    # Someone still holding the replaced dict edits it before listeners are told
+    keybinds['toggle_visibility'] = 'ctrl+h'
+    assert wait_for(qapp, lambda: settings.changes)
+    old, new = settings.changes[0]['keybinds']
+    assert old['toggle_visibility'] == 'ctrl+alt+h'
+    assert new['toggle_visibility'] == 'ctrl+h'
+
+def test_saves_share_one_writer_and_the_newest_wins(qapp, settings):
+    settings.set('opacity', 0.5)
+    settings.flush()
+    writer = settings.writer_thread
+    threads = threading.active_count()
+    for i in range(1, 5):
+        settings.set('opacity', 0.5 + i / 10)
+        settings.flush()
+    settings.set('theme', 'light')
+    settings.flush()
+    assert settings.writer_thread is writer
+    assert threading.active_count() == threads
+    with open(settings.settings_file) as f:
+        saved = json.load(f)
+    assert saved['opacity'] == pytest.approx(0.9)
+    assert saved['theme'] == 'light'
@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+from core.stats_backend import ProcfsBackend
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'preadv'), reason="needs os.preadv")
+
+# cpu2 is offline, so it has no line
+STAT = """cpu  300 0 100 1600 0 0 0 0 0 0
+cpu0 100 0 50 800 0 0 0 0 0 0
+cpu1 100 0 25 400 0 0 0 0 0 0
+cpu3 100 0 25 400 0 0 0 0 0 0
+intr 12345 0 0
+ctxt 67890
+"""
+
+STAT_LATER = """cpu  600 0 200 2000 0 0 0 0 0 0
+cpu0 200 0 100 900 0 0 0 0 0 0
+cpu1 100 0 25 500 0 0 0 0 0 0
+cpu3 300 0 75 600 0 0 0 0 0 0
+intr 12345 0 0
+"""
+
+MEMINFO = """MemTotal:       16000000 kB
+MemFree:         2000000 kB
+MemAvailable:    8000000 kB
+Buffers:          500000 kB
+Cached:          4000000 kB
+SwapCached:        10000 kB
+SReclaimable:     300000 kB
+SwapTotal:       2000000 kB
+SwapFree:        1500000 kB
+"""
+
+def write(path, text):
+    # Rewritten in place, as the kernel does, so the kept-open descriptor sees it
+    with open(path, 'w') as f:
+        f.write(text)
+
+@pytest.fixture
+def proc(tmp_path):
+    stat = tmp_path / 'stat'
+    meminfo = tmp_path / 'meminfo'
+    write(stat, STAT)
+    write(meminfo, MEMINFO)
+    backend = ProcfsBackend(str(stat), str(meminfo), str(tmp_path / 'cpu%d' / 'cpufreq' / '%s'))
+    backend.paths = (stat, meminfo)
+    yield backend
+    backend.close()
+
+def test_cpu_count_skips_offline_cpus(proc):
+    assert proc.cpu_count == 3
+
+def test_cpu_usage_between_reads(proc):
+    first = proc.cpu_stats()
+    assert first.percent_per_core == [0.0, 0.0, 0.0]
+    write(proc.paths[0], STAT_LATER)
+    cpu = proc.cpu_stats()
+    # cpu0: 150 busy of 250; cpu1: idle only; cpu3: 250 busy of 450
+    assert cpu.percent_per_core == pytest.approx([60.0, 0.0, 250 / 450 * 100])
+    assert cpu.total_percent == pytest.approx(sum(cpu.percent_per_core) / 3)
+    assert cpu.freq_current is None
+    assert cpu.cores == 3
+
+def test_memory_matches_psutil_definitions(proc):
+    memory = proc.memory_stats()
+    assert memory.total == 16000000 * 1024
+    assert memory.available == 8000000 * 1024
+    assert memory.used == 8000000 * 1024
+    assert memory.percent == 50.0
+    assert (memory.swap_total, memory.swap_used, memory.swap_free) == (
+        2000000 * 1024, 500000 * 1024, 1500000 * 1024)
+    assert memory.swap_percent == 25.0
+
+def test_memory_without_memavailable(proc):
+    write(proc.paths[1], MEMINFO.replace('MemAvailable:    8000000 kB\n', ''))
+    memory = proc.memory_stats()
+    # Free + buffers + page cache + reclaimable slab, as psutil estimates it
+    assert memory.available == (2000000 + 500000 + 4000000 + 300000) * 1024
+    assert memory.percent == round(9200000 / 16000000 * 100, 1)
+
+@pytest.mark.skipif(not os.path.exists('/proc/stat'), reason="needs Linux /proc")
+def test_real_proc():
+    backend = ProcfsBackend()
+    try:
+        backend.cpu_stats()
+        cpu = backend.cpu_stats()
+        memory = backend.memory_stats()
+    finally:
+        backend.close()
+    assert len(cpu.percent_per_core) == backend.cpu_count
+    assert 0 < memory.available <= memory.total
@@ -0,0 +1,58 @@
+import time
+
+def make_coalescer():
+    from ui.update_coalescer import UpdateCoalescer
+    return UpdateCoalescer(interval_ms=1)
+
+def test_repeated_posts_keep_only_the_latest(qapp):
+    coalescer = make_coalescer()
+    applied = []
+    for value in range(5):
+        coalescer.post('cpu', applied.append, value)
+    coalescer.post('memory', applied.append, 'mem')
+    coalescer.flush()
+    assert applied == [4, 'mem']
+    assert coalescer.get_counters() == {'posted': 6, 'dropped': 4, 'cancelled': 0,
+                                        'flushed': 2, 'pending': 0}
+
+def test_flush_applies_each_key_once(qapp):
+    coalescer = make_coalescer()
+    applied = []
+    coalescer.post('cpu', applied.append, 1)
+    coalescer.flush()
+    coalescer.flush()
+    assert applied == [1]
+    assert coalescer.flushed == 1
+
+def test_frame_timer_flushes_pending_updates(qapp):
+    coalescer = make_coalescer()
+    applied = []
+    coalescer.post('cpu', applied.append, 1)
+    coalescer.post('cpu', applied.append, 2)
+    deadline = time.monotonic() + 2
+    while not applied and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.001)
+    assert applied == [2]
+    assert not coalescer.timer.isActive()
+
+def test_cancel_is_counted_apart_from_dropped(qapp):
+    coalescer = make_coalescer()
+    applied = []
+    coalescer.post('search', applied.append, 'query')
+    coalescer.cancel('search')
+    coalescer.cancel('search')
+    coalescer.flush()
+    assert applied == []
+    counters = coalescer.get_counters()
+    assert (counters['dropped'], counters['cancelled'], counters['flushed']) == (0, 1, 0)
+    coalescer.reset_counters()
+    assert coalescer.get_counters()['cancelled'] == 0
+
+def test_failing_update_does_not_stop_the_others(qapp):
+    coalescer = make_coalescer()
+    applied = []
+    coalescer.post('bad', lambda: 1 / 0)
+    coalescer.post('good', applied.append, 'ok')
+    coalescer.flush()
+    assert applied == ['ok']